@@ -0,0 +1,263 @@
+import argparse
+import os
+import sys
+from collections import Counter, defaultdict
+
+from sbom_to_md import escape
+
+# Shared helpers live in examples/common; a copy placed next to this script is found first
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'common'))
+
+from json_stream import JsonStream
+
+DEFAULT_MAX_ROWS = 1000
+SPDX, CYCLONEDX = 'SPDX', 'CycloneDX'
+# Large arrays the diff does not use; streamed and dropped element by element instead of decoded whole
+IGNORED_ARRAYS = ('files', 'relationships', 'snippets', 'vulnerabilities')
+
+
+def purl_base(purl):
+    """Package URL without version, qualifiers and subpath: pkg:deb/debian/openssl@3.0.11?arch=amd64 -> pkg:deb/debian/openssl"""
+    return purl.split('#', 1)[0].split('?', 1)[0].rsplit('@', 1)[0] if purl else ''
+
+
+def identity(key):
+    """Version-independent part of a (name, version, purl) component key."""
+    name, _, purl = key
+    return name, purl_base(purl)
+
+
+def spdx_key(package):
+    purl = ''
+    for ref in package.get('externalRefs') or []:
+        if ref.get('referenceType') == 'purl':
+            purl = ref.get('referenceLocator', '')
+            break
+    return (sys.intern(package.get('name') or 'N/A'), package.get('versionInfo') or '', purl)
+
+
+def cyclonedx_key(component):
+    name = component.get('name') or 'N/A'
+    if component.get('group'):
+        name = f"{component['group']}/{name}"
+    return (sys.intern(name), component.get('version') or '', component.get('purl') or '')
+
+
+class SbomReader:
+    """Streams one SPDX or CycloneDX document, passing component keys and dependency edges to callbacks.
+
+    Dependency edges are reported as pairs of component identities. CycloneDX refers to components
+    by bom-ref, so an edge whose refs have not been seen yet is held back until the document ends.
+    """
+
+    def __init__(self, on_component, on_edge):
+        self.on_component = on_component
+        self.on_edge = on_edge
+        self.format = None
+        self.component_count = 0
+        self.edge_count = 0
+        self.ref_identities = {}
+        self.pending_edges = []
+
+    def _add_spdx_package(self, package):
+        self.format = SPDX
+        self.component_count += 1
+        self.on_component(spdx_key(package))
+
+    def _add_cyclonedx_component(self, component):
+        self.format = CYCLONEDX
+        self.component_count += 1
+        key = cyclonedx_key(component)
+        if component.get('bom-ref'):
+            self.ref_identities[component['bom-ref']] = identity(key)
+        self.on_component(key)
+        for child in component.get('components') or []:
+            self._add_cyclonedx_component(child)
+
+    def _add_dependency(self, dependency):
+        ref = dependency.get('ref')
+        parent = self.ref_identities.get(ref)
+        for child_ref in dependency.get('dependsOn') or []:
+            child = self.ref_identities.get(child_ref)
+            if parent is None or child is None:
+                self.pending_edges.append((ref, child_ref))
+            else:
+                self.edge_count += 1
+                self.on_edge((parent, child))
+
+    def read(self, path):
+        handlers = dict.fromkeys(IGNORED_ARRAYS, lambda item: None)
+        handlers.update({
+            'packages': self._add_spdx_package,
+            'components': self._add_cyclonedx_component,
+            'dependencies': self._add_dependency,
+        })
+        with open(path, 'r') as f:
+            members = JsonStream(f).read(handlers)
+        if 'bomFormat' in members:
+            self.format = CYCLONEDX
+        elif 'spdxVersion' in members:
+            self.format = SPDX
+        if self.format is None:
+            raise ValueError(f"{path} is neither an SPDX nor a CycloneDX JSON document")
+
+        root = (members.get('metadata') or {}).get('component')
+        if root and root.get('bom-ref'):
+            self.ref_identities.setdefault(root['bom-ref'], identity(cyclonedx_key(root)))
+        for ref, child_ref in self.pending_edges:
+            # Refs that never resolve to a component are compared by the ref itself
+            parent = self.ref_identities.get(ref, (ref, ''))
+            child = self.ref_identities.get(child_ref, (child_ref, ''))
+            self.edge_count += 1
+            self.on_edge((parent, child))
+        self.pending_edges = []
+        return members
+
+
+def take(counter, key):
+    """Remove one occurrence of key from counter; False if there was none."""
+    count = counter.get(key)
+    if not count:
+        return False
+    if count == 1:
+        del counter[key]
+    else:
+        counter[key] = count - 1
+    return True
+
+
+def diff_sboms(old_path, new_path):
+    """Compare two SBOMs by (name, version, purl).
+
+    The smaller document is loaded into hash maps and the larger one is streamed against them, so
+    memory grows with the smaller document plus whatever exists only in the larger one.
+    """
+    swapped = os.path.getsize(old_path) > os.path.getsize(new_path)
+    small_path, large_path = (new_path, old_path) if swapped else (old_path, new_path)
+
+    small_components = Counter()
+    small_edges = Counter()
+    small_reader = SbomReader(lambda key: small_components.update((key,)),
+                              lambda edge: small_edges.update((edge,)))
+    small_reader.read(small_path)
+
+    large_components = []
+    large_edges = []
+    large_reader = SbomReader(
+        lambda key: take(small_components, key) or large_components.append(key),
+        lambda edge: take(small_edges, edge) or large_edges.append(edge))
+    large_reader.read(large_path)
+
+    if small_reader.format != large_reader.format:
+        raise ValueError(f"Cannot compare a {small_reader.format} document with a {large_reader.format} document")
+
+    small_components = list(small_components.elements())
+    small_edges = list(small_edges.elements())
+    if swapped:
+        removed, added = large_components, small_components
+        removed_edges, added_edges = large_edges, small_edges
+        old_reader, new_reader = large_reader, small_reader
+    else:
+        removed, added = small_components, large_components
+        removed_edges, added_edges = small_edges, large_edges
+        old_reader, new_reader = small_reader, large_reader
+
+    # A component present on both sides under different versions is a version change
+    removed_versions = defaultdict(list)
+    for key in removed:
+        removed_versions[identity(key)].append(key)
+    added_versions = defaultdict(list)
+    for key in added:
+        added_versions[identity(key)].append(key)
+    changed = []
+    for ident in removed_versions.keys() & added_versions.keys():
+        changed.append((ident, sorted(removed_versions.pop(ident)), sorted(added_versions.pop(ident))))
+
+    return {
+        'format': old_reader.format,
+        'old_components': old_reader.component_count,
+        'new_components': new_reader.component_count,
+        'old_edges': old_reader.edge_count,
+        'new_edges': new_reader.edge_count,
+        'added': sorted(key for keys in added_versions.values() for key in keys),
+        'removed': sorted(key for keys in removed_versions.values() for key in keys),
+        'changed': sorted(changed),
+        'added_edges': sorted(added_edges),
+        'removed_edges': sorted(removed_edges),
+    }
+
+
+def write_component_table(f, title, keys, max_rows):
+    f.write(f"\n## {title} ({len(keys)})\n")
+    if not keys:
+        f.write("None.\n")
+        return
+    f.write("| Name | Version | purl |\n")
+    f.write("|---|---|---|\n")
+    for name, version, purl in keys[:max_rows]:
+        f.write(f"| {escape(name)} | {escape(version or 'N/A')} | {escape(purl or 'N/A')} |\n")
+    if len(keys) > max_rows:
+        f.write(f"\n_{len(keys) - max_rows} more not shown._\n")
+
+
+def write_edge_table(f, title, edges, max_rows):
+    f.write(f"\n## {title} ({len(edges)})\n")
+    if not edges:
+        f.write("None.\n")
+        return
+    f.write("| Component | Depends On |\n")
+    f.write("|---|---|\n")
+    for (parent, _), (child, _) in edges[:max_rows]:
+        f.write(f"| {escape(parent)} | {escape(child)} |\n")
+    if len(edges) > max_rows:
+        f.write(f"\n_{len(edges) - max_rows} more not shown._\n")
+
+
+def diff_to_md(old_path, new_path, md_path, max_rows=DEFAULT_MAX_ROWS):
+    diff = diff_sboms(old_path, new_path)
+
+    with open(md_path, 'w') as f:
+        f.write(f"# SBOM Diff\n\n")
+        f.write(f"**Format:** {diff['format']}\n\n")
+        f.write(f"**Old SBOM:** {old_path} ({diff['old_components']} components)\n\n")
+        f.write(f"**New SBOM:** {new_path} ({diff['new_components']} components)\n\n")
+        f.write(f"**Added:** {len(diff['added'])} | **Removed:** {len(diff['removed'])} | "
+                f"**Version Changed:** {len(diff['changed'])}\n")
+
+        write_component_table(f, "Added Components", diff['added'], max_rows)
+        write_component_table(f, "Removed Components", diff['removed'], max_rows)
+
+        f.write(f"\n## Version Changes ({len(diff['changed'])})\n")
+        if diff['changed']:
+            f.write("| Name | Old Version | New Version |\n")
+            f.write("|---|---|---|\n")
+            for (name, _), old_keys, new_keys in diff['changed'][:max_rows]:
+                old_versions = ', '.join(version or 'N/A' for _, version, _ in old_keys)
+                new_versions = ', '.join(version or 'N/A' for _, version, _ in new_keys)
+                f.write(f"| {escape(name)} | {escape(old_versions)} | {escape(new_versions)} |\n")
+            if len(diff['changed']) > max_rows:
+                f.write(f"\n_{len(diff['changed']) - max_rows} more not shown._\n")
+        else:
+            f.write("None.\n")
+
+        if diff['format'] == CYCLONEDX:
+            f.write(f"\n**Dependency Edges:** {diff['old_edges']} -> {diff['new_edges']}\n")
+            write_edge_table(f, "Added Dependency Edges", diff['added_edges'], max_rows)
+            write_edge_table(f, "Removed Dependency Edges", diff['removed_edges'], max_rows)
+
+        print(f"Markdown file generated at: {md_path}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Render the differences between two SPDX or CycloneDX JSON SBOMs as markdown.")
+    parser.add_argument('old_json', help="SBOM of the previous build")
+    parser.add_argument('new_json', help="SBOM of the current build")
+    parser.add_argument('-o', '--output', default='sbom-diff.md', help="Markdown file to write")
+    parser.add_argument('--max-rows', type=int, default=DEFAULT_MAX_ROWS, help="Rows per table")
+    args = parser.parse_args()
+
+    try:
+        diff_to_md(args.old_json, args.new_json, args.output, args.max_rows)
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}")
+        sys.exit(1)
@@ -1,22 +1,140 @@
+import argparse
+import os
 import sys
-import json
+from collections import Counter
 
-def json_to_md(json_path, md_path):
+# Shared helpers live in examples/common; a copy placed next to this script is found first
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'common'))
+
+from json_stream import JsonStream
+
+# Rows per rollup table
+DEFAULT_TOP_N = 20
+# Above this many packages the flat package table is replaced by the rollups
+DEFAULT_MAX_PACKAGE_ROWS = 500
+NO_VALUE = ('', 'NOASSERTION', 'NONE')
+
+
+def supplier_name(supplier):
+    if isinstance(supplier, dict):
+        supplier = supplier.get('name', 'N/A')
+    return supplier if isinstance(supplier, str) else 'N/A'
+
+
+def license_name(value):
+    return value if isinstance(value, str) and value not in NO_VALUE else 'NOASSERTION'
+
+
+class SbomRollup:
+    """One-pass tallies over packages[], files[] and relationships[] of an SPDX document."""
+
+    def __init__(self, max_package_rows=DEFAULT_MAX_PACKAGE_ROWS):
+        self.max_package_rows = max_package_rows
+        self.package_count = 0
+        self.file_count = 0
+        self.concluded_licenses = Counter()
+        self.declared_licenses = Counter()
+        self.suppliers = Counter()
+        self.file_licenses = Counter()
+        self.package_names = {}
+        # File ids per package; hasFiles and CONTAINS often list the same files, so they are united
+        self.package_files = {}
+        # CONTAINS edges read before their source package
+        self.pending_contains = []
+        self.package_rows = []
+
+    def add_package(self, package):
+        self.package_count += 1
+        # Licenses and suppliers repeat across packages, so each distinct value is stored once
+        supplier = sys.intern(supplier_name(package.get('supplier', 'N/A')))
+        self.suppliers[supplier] += 1
+        self.concluded_licenses[sys.intern(license_name(package.get('licenseConcluded')))] += 1
+        self.declared_licenses[sys.intern(license_name(package.get('licenseDeclared')))] += 1
+
+        name = package.get('name', 'N/A')
+        version = package.get('versionInfo', 'N/A')
+        spdx_id = package.get('SPDXID')
+        if spdx_id:
+            self.package_names[spdx_id] = f"{name}@{version}" if version not in NO_VALUE else name
+            has_files = package.get('hasFiles')
+            if has_files:
+                self.package_files.setdefault(spdx_id, set()).update(has_files)
+
+        # Rows are only kept while the flat table can still be rendered
+        if self.package_rows is not None:
+            if len(self.package_rows) < self.max_package_rows:
+                self.package_rows.append((name, version, supplier))
+            else:
+                self.package_rows = None
+
+    def add_file(self, file):
+        self.file_count += 1
+        self.file_licenses[sys.intern(license_name(file.get('licenseConcluded')))] += 1
+
+    def add_relationship(self, relationship):
+        if relationship.get('relationshipType') != 'CONTAINS':
+            return
+        source = relationship.get('spdxElementId')
+        target = relationship.get('relatedSpdxElement')
+        # A known source means packages[] has been read, so package-to-package CONTAINS can be told apart;
+        # otherwise packages[] may still follow and the edge is resolved in finish()
+        if source in self.package_names:
+            self._add_contains(source, target)
+        else:
+            self.pending_contains.append((source, target))
+
+    def _add_contains(self, source, target):
+        if source in self.package_names and target not in self.package_names:
+            self.package_files.setdefault(source, set()).add(target)
+
+    def finish(self):
+        """Resolve CONTAINS edges that were read before the packages they refer to."""
+        for source, target in self.pending_contains:
+            self._add_contains(source, target)
+        self.pending_contains = []
+
+    def file_counts(self):
+        return Counter({spdx_id: len(files) for spdx_id, files in self.package_files.items()})
+
+    def handlers(self):
+        return {'packages': self.add_package, 'files': self.add_file, 'relationships': self.add_relationship}
+
+
+def escape(value):
+    return str(value).replace('|', '\\|')
+
+
+def write_rollup_table(f, title, heading, counts, total, top_n):
+    f.write(f"\n## {title}\n")
+    if not counts:
+        f.write("None found.\n")
+        return
+    f.write(f"| {heading} | Count | Share |\n")
+    f.write("|---|---|---|\n")
+    for value, count in counts.most_common(top_n):
+        f.write(f"| {escape(value)} | {count} | {count * 100 / total:.1f}% |\n")
+    if len(counts) > top_n:
+        f.write(f"\n_{len(counts) - top_n} more not shown._\n")
+
+
+def json_to_md(json_path, md_path, top_n=DEFAULT_TOP_N, max_package_rows=DEFAULT_MAX_PACKAGE_ROWS):
+    rollup = SbomRollup(max_package_rows)
     with open(json_path, 'r') as f:
-        data = json.load(f)
+        data = JsonStream(f).read(rollup.handlers())
+    rollup.finish()
 
     spdx_version = data.get('spdxVersion', 'N/A')
     data_license = data.get('dataLicense', 'N/A')
     document_namespace = data.get('documentNamespace', 'N/A')
     creation_info = data.get('creationInfo', {})
-    packages = data.get('packages', [])
-    files = data.get('files', [])
 
     with open(md_path, 'w') as f:
         f.write(f"# SBOM Summary\n\n")
         f.write(f"**SPDX Version:** {spdx_version}\n\n")
         f.write(f"**Data License:** {data_license}\n\n")
         f.write(f"**Document Namespace:** {document_namespace}\n\n")
+        f.write(f"**Packages:** {rollup.package_count}\n\n")
+        f.write(f"**Files:** {rollup.file_count}\n\n")
 
         f.write(f"## Creation Info\n")
         f.write(f"- License List Version: {creation_info.get('licenseListVersion', 'N/A')}\n")
@@ -29,24 +147,48 @@ def json_to_md(json_path, md_path):
         else:
             f.write("- No creators found.\n")
 
+        write_rollup_table(f, "Concluded Licenses", "License", rollup.concluded_licenses, rollup.package_count, top_n)
+        write_rollup_table(f, "Declared Licenses", "License", rollup.declared_licenses, rollup.package_count, top_n)
+        write_rollup_table(f, "Suppliers", "Supplier", rollup.suppliers, rollup.package_count, top_n)
+
+        f.write(f"\n## Packages by File Count\n")
+        file_counts = rollup.file_counts()
+        if file_counts:
+            f.write(f"| Package | Files |\n")
+            f.write(f"|---|---|\n")
+            for spdx_id, count in file_counts.most_common(top_n):
+                f.write(f"| {escape(rollup.package_names.get(spdx_id, spdx_id))} | {count} |\n")
+        else:
+            f.write("No package-to-file relationships found.\n")
+
+        write_rollup_table(f, "File Licenses", "License", rollup.file_licenses, rollup.file_count, top_n)
+
         f.write(f"\n## Packages\n")
-        if packages:
+        if rollup.package_rows:
             f.write(f"| Index | Name | Version | Supplier |\n")
             f.write(f"|---|---|---|---|\n")
-            for idx, package in enumerate(packages, start=1):
-                name = package.get('name', 'N/A').replace('|', '\\|')
-                version = package.get('versionInfo', 'N/A').replace('|', '\\|')
-                supplier = package.get('supplier', 'N/A')
-                if isinstance(supplier, dict):
-                    supplier = supplier.get('name', 'N/A')
-                supplier = supplier.replace('|', '\\|')
-                f.write(f"| {idx} | {name} | {version} | {supplier} |\n")
+            for idx, (name, version, supplier) in enumerate(rollup.package_rows, start=1):
+                f.write(f"| {idx} | {escape(name)} | {escape(version)} | {escape(supplier)} |\n")
+        elif rollup.package_count:
+            f.write(f"{rollup.package_count} packages exceed the table limit of {max_package_rows}; "
+                    f"see the rollups above.\n")
         else:
             f.write("No packages found.\n")
 
         print(f"Markdown file generated at: {md_path}")
 
+
 if __name__ == "__main__":
-    input_json = sys.argv[1]
-    output_md = sys.argv[2]
-    json_to_md(input_json, output_md)
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Convert an SPDX JSON SBOM to a markdown summary.")
+    parser.add_argument('input_json', help="SPDX JSON document")
+    parser.add_argument('output_md', help="Markdown file to write")
+    parser.add_argument('--top', type=int, default=DEFAULT_TOP_N, help="Rows per rollup table")
+    parser.add_argument('--max-package-rows', type=int, default=DEFAULT_MAX_PACKAGE_ROWS,
+                        help="Largest package count rendered as a flat table")
+    args = parser.parse_args()
+
+    try:
+        json_to_md(args.input_json, args.output_md, args.top, args.max_package_rows)
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}")
+        sys.exit(1)
@@ -1,60 +1,260 @@
+import argparse
 import json
 import os
 import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 
-def generate_readme(json_file_path, output_file_path):
-    try:
-        # Read the JSON file
-        with open(json_file_path, 'r') as json_file:
-            data = json.load(json_file)
+SEVERITY_ORDER = {'CRITICAL': 0, 'HIGH': 1, 'MEDIUM': 2, 'LOW': 3}
+# Module reports are small and reading them is I/O-bound, so threads are enough
+DEFAULT_WORKERS = 16
 
-        # Extract results
-        results = data.get("results", [])
-        # Generate markdown content
-        markdown_content = f"""
+
+def modules_root(json_file_paths):
+    """Deepest directory containing every report, against which module names are taken."""
+    return os.path.commonpath([os.path.dirname(os.path.abspath(path)) for path in json_file_paths])
+
+
+def module_name(json_file_path, root=None):
+    """Derive a module name from a report path such as modules/vpc/tfsec.json.
+
+    Names are the report's path relative to root, so envs/dev/vpc/tfsec.json and
+    envs/prod/vpc/tfsec.json become dev/vpc and prod/vpc rather than both vpc.
+    """
+    path = os.path.abspath(json_file_path)
+    relative = os.path.relpath(path, root) if root else os.path.basename(path)
+    stem = os.path.splitext(relative)[0]
+    if os.path.basename(stem) in ('tfsec', 'results'):
+        stem = os.path.dirname(stem) or os.path.basename(os.path.dirname(path)) or os.path.basename(stem)
+    return stem.replace(os.sep, '/')
+
+
+def expand_report_paths(paths):
+    """Expand directories into the tfsec JSON reports found beneath them.
+
+    Terraform's own JSON (.terraform/ metadata and *.tf.json configurations)
+    is left out; other JSON files are checked for a results key when loaded.
+    """
+    report_paths = []
+    for path in paths:
+        if os.path.isdir(path):
+            for root, dirs, files in os.walk(path):
+                dirs[:] = sorted(name for name in dirs if name != '.terraform')
+                report_paths.extend(os.path.join(root, name) for name in sorted(files)
+                                    if name.endswith('.json') and not name.endswith('.tf.json'))
+        else:
+            report_paths.append(path)
+    return report_paths
+
+
+def load_module_results(json_file_path, root=None):
+    """Read one module report and return copies of its results tagged with the module they came from.
+
+    Returns results of None for JSON that is not a tfsec report.
+    """
+    with open(json_file_path, 'r') as json_file:
+        data = json.load(json_file)
+    module = module_name(json_file_path, root)
+    if not isinstance(data, dict) or "results" not in data:
+        return module, None
+    return module, [dict(result, module=module) for result in data["results"] or []]
+
+
+def generate_module_summary(module_results):
+    """Render a per-module table of result counts by severity."""
+    parts = ["""
+## Module Summary
+
+| Module | Total | Critical | High | Medium | Low |
+| :----- | :---- | :------- | :--- | :----- | :-- |
+"""]
+    for module, results in module_results:
+        counts = dict.fromkeys(SEVERITY_ORDER, 0)
+        for result in results:
+            severity = str(result.get('severity', '')).upper()
+            if severity in counts:
+                counts[severity] += 1
+        parts.append(f"| {module} | {len(results)} | {counts['CRITICAL']} | {counts['HIGH']} "
+                     f"| {counts['MEDIUM']} | {counts['LOW']} |\n")
+    return "".join(parts)
+
+
+def group_results_by_rule(results):
+    """Aggregate results by rule_id in one pass, keeping rule metadata from the first occurrence."""
+    groups = {}
+    for result in results:
+        rule_id = result.get('rule_id', 'Unknown rule ID')
+        group = groups.get(rule_id)
+        if group is None:
+            group = groups[rule_id] = {'rule': result, 'locations': []}
+        location = result.get('location', {})
+        group['locations'].append((
+            location.get('filename', 'Unknown file'),
+            location.get('start_line', '?'),
+            location.get('end_line', '?'),
+            result.get('resource', 'Unknown resource'),
+            result.get('module'),
+        ))
+    return groups
+
+
+def generate_grouped_markdown(results, with_modules=False, module_summary=""):
+    """Render each rule's metadata once, followed by a compact table of its locations.
+
+    module_summary is placed right after the report title.
+    """
+    groups = group_results_by_rule(results)
+    ordered = sorted(
+        groups.items(),
+        key=lambda item: (SEVERITY_ORDER.get(str(item[1]['rule'].get('severity', '')).upper(), len(SEVERITY_ORDER)),
+                          -len(item[1]['locations']), item[0]),
+    )
+
+    parts = [f"""
 # Detected Vulnerabilities by tfsec
+{module_summary}
+**Total Issues:** {len(results)} across {len(groups)} rules
+
+| Rule ID | Severity | Occurrences |
+| :------ | :------- | :---------- |
+"""]
+    for rule_id, group in ordered:
+        parts.append(f"| `{rule_id}` | {group['rule'].get('severity', 'Unknown severity')} | {len(group['locations'])} |\n")
+    parts.append("\n")
+
+    for rule_id, group in ordered:
+        rule = group['rule']
+        parts.append(f"## Rule: `{rule_id}` ({rule.get('severity', 'Unknown severity')})\n\n")
+        parts.append(f"**Description:** {rule.get('rule_description', 'No rule description')}\n\n")
+        parts.append(f"**Impact:** {rule.get('impact', 'No impact information')}\n\n")
+        parts.append(f"**Resolution:** {rule.get('resolution', 'No resolution provided')}\n\n")
+        parts.append(f"**Provider / Service:** `{rule.get('rule_provider', 'Unknown rule provider')}` / "
+                     f"`{rule.get('rule_service', 'Unknown rule service')}`\n\n")
+        links = rule.get('links', [])
+        if links:
+            parts.append("**Links:**\n")
+            parts.extend(f"- [{link}]({link})\n" for link in links)
+            parts.append("\n")
+        if with_modules:
+            parts.append("| Module | Location | Resource |\n")
+            parts.append("| :----- | :------- | :------- |\n")
+            parts.extend(f"| {module} | {filename}:{start_line}–{end_line} | `{resource}` |\n"
+                         for filename, start_line, end_line, resource, module in group['locations'])
+        else:
+            parts.append("| Location | Resource |\n")
+            parts.append("| :------- | :------- |\n")
+            parts.extend(f"| {filename}:{start_line}–{end_line} | `{resource}` |\n"
+                         for filename, start_line, end_line, resource, _ in group['locations'])
+        parts.append("\n")
 
+    return "".join(parts)
+
+
+def generate_markdown(results, module_summary=""):
+    """Render every result as its own block; module_summary is placed right after the report title."""
+    markdown_content = f"""
+# Detected Vulnerabilities by tfsec
+{module_summary}
 """
-        for result in results:
-            markdown_content += f"## Issue: {result.get('description', 'No description')}\n\n"
-            markdown_content += f"### Impact\n{result.get('impact', 'No impact information')}\n\n"
-            markdown_content += "### Links\n"
-            for link in result.get('links', []):
-                markdown_content += f"- [{link}]({link})\n"
-            markdown_content += "\n"
-            markdown_content += "### Location\n"
-            location = result.get('location', {})
-            markdown_content += f"- **File:** {location.get('filename', 'Unknown file')}\n"
-            markdown_content += f"- **Start Line:** {location.get('start_line', 'Unknown start line')}\n"
-            markdown_content += f"- **End Line:** {location.get('end_line', 'Unknown end line')}\n\n"
-            markdown_content += "### Details\n"
-            markdown_content += f"- **Long ID:** `{result.get('long_id', 'Unknown long ID')}`\n"
-            markdown_content += f"- **Resolution:** {result.get('resolution', 'No resolution provided')}\n"
-            markdown_content += f"- **Resource:** `{result.get('resource', 'Unknown resource')}`\n"
-            markdown_content += f"- **Rule Description:** {result.get('rule_description', 'No rule description')}\n"
-            markdown_content += f"- **Rule ID:** `{result.get('rule_id', 'Unknown rule ID')}`\n"
-            markdown_content += f"- **Rule Provider:** `{result.get('rule_provider', 'Unknown rule provider')}`\n"
-            markdown_content += f"- **Rule Service:** `{result.get('rule_service', 'Unknown rule service')}`\n"
-            markdown_content += f"- **Severity:** `{result.get('severity', 'Unknown severity')}`\n"
-            markdown_content += f"- **Status:** `{result.get('status', 'Unknown status')}`\n"
-            markdown_content += f"- **Warning:** `{result.get('warning', 'Unknown warning')}`\n\n"
+    for result in results:
+        markdown_content += f"## Issue: {result.get('description', 'No description')}\n\n"
+        markdown_content += f"### Impact\n{result.get('impact', 'No impact information')}\n\n"
+        markdown_content += "### Links\n"
+        for link in result.get('links', []):
+            markdown_content += f"- [{link}]({link})\n"
+        markdown_content += "\n"
+        markdown_content += "### Location\n"
+        if 'module' in result:
+            markdown_content += f"- **Module:** {result['module']}\n"
+        location = result.get('location', {})
+        markdown_content += f"- **File:** {location.get('filename', 'Unknown file')}\n"
+        markdown_content += f"- **Start Line:** {location.get('start_line', 'Unknown start line')}\n"
+        markdown_content += f"- **End Line:** {location.get('end_line', 'Unknown end line')}\n\n"
+        markdown_content += "### Details\n"
+        markdown_content += f"- **Long ID:** `{result.get('long_id', 'Unknown long ID')}`\n"
+        markdown_content += f"- **Resolution:** {result.get('resolution', 'No resolution provided')}\n"
+        markdown_content += f"- **Resource:** `{result.get('resource', 'Unknown resource')}`\n"
+        markdown_content += f"- **Rule Description:** {result.get('rule_description', 'No rule description')}\n"
+        markdown_content += f"- **Rule ID:** `{result.get('rule_id', 'Unknown rule ID')}`\n"
+        markdown_content += f"- **Rule Provider:** `{result.get('rule_provider', 'Unknown rule provider')}`\n"
+        markdown_content += f"- **Rule Service:** `{result.get('rule_service', 'Unknown rule service')}`\n"
+        markdown_content += f"- **Severity:** `{result.get('severity', 'Unknown severity')}`\n"
+        markdown_content += f"- **Status:** `{result.get('status', 'Unknown status')}`\n"
+        markdown_content += f"- **Warning:** `{result.get('warning', 'Unknown warning')}`\n\n"
+
+    return markdown_content
+
+
+def generate_readme(json_file_paths, output_file_path, grouped=False, workers=DEFAULT_WORKERS):
+    if isinstance(json_file_paths, str):
+        json_file_paths = [json_file_paths]
+    try:
+        started = time.perf_counter()
+        multi_module = len(json_file_paths) > 1
+        if multi_module:
+            # Read module reports concurrently; map() keeps them in input order
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                loaded_reports = list(pool.map(partial(load_module_results, root=modules_root(json_file_paths)),
+                                               json_file_paths))
+            module_results = []
+            for path, (module, module_result) in zip(json_file_paths, loaded_reports):
+                if module_result is None:
+                    print(f"Skipping {path}: not a tfsec JSON report (no results key)")
+                else:
+                    module_results.append((module, module_result))
+            results = [result for _, module in module_results for result in module]
+        else:
+            # Read the JSON file
+            with open(json_file_paths[0], 'r') as json_file:
+                data = json.load(json_file)
+            if not isinstance(data, dict) or "results" not in data:
+                raise ValueError(f"{json_file_paths[0]} is not a tfsec JSON report (no results key)")
+
+            # Extract results; tfsec writes "results": null when nothing was found
+            results = data.get("results") or []
+        loaded = time.perf_counter()
+
+        # Generate markdown content
+        module_summary = generate_module_summary(module_results) if multi_module else ""
+        if grouped:
+            markdown_content = generate_grouped_markdown(results, with_modules=multi_module,
+                                                         module_summary=module_summary)
+        else:
+            markdown_content = generate_markdown(results, module_summary)
+        elapsed = time.perf_counter() - loaded
 
         # Write to the README file
         with open(output_file_path, 'w') as output_file:
             output_file.write(markdown_content)
 
         print(f"README file generated successfully at {output_file_path}")
+        if multi_module:
+            print(f"Loaded {len(module_results)} module reports in {loaded - started:.3f}s")
+        print(f"Rendered {len(results)} results ({len(markdown_content)} characters) in {elapsed:.3f}s")
+        return True
 
     except Exception as e:
         print(f"An error occurred: {e}")
+        return False
 
 if __name__ == "__main__":
-    if len(sys.argv) != 2:
-        print("Usage: python tfsec_json_to_markdown_helper.py <input_file>")
-        sys.exit(1)
+    parser = argparse.ArgumentParser(description="Convert tfsec JSON results to a markdown report.")
+    parser.add_argument('inputs', nargs='+',
+                        help="tfsec JSON results; several files or directories produce one consolidated report")
+    parser.add_argument('-o', '--output', default="tfsec.md", help="Output markdown file (default: tfsec.md)")
+    parser.add_argument('--grouped', action='store_true',
+                        help="Render each rule once with a table of its locations instead of one block per result")
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS,
+                        help="Threads used to read module reports concurrently")
+    args = parser.parse_args()
     # Define paths
-    json_file_path = sys.argv[1]
-    output_file_path = "tfsec.md"  # Adjust path as needed
+    json_file_paths = expand_report_paths(args.inputs)
+    if not json_file_paths:
+        print("No tfsec JSON reports found")
+        sys.exit(1)
+    output_file_path = args.output
 
-    # Generate README
-    generate_readme(json_file_path, output_file_path)
+    # Generate README; an unreadable report fails the run
+    if not generate_readme(json_file_paths, output_file_path, args.grouped, args.workers):
+        sys.exit(1)
@@ -1,11 +1,72 @@
-import json
-import sys
+import argparse
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from trivy_report_parser import PACKAGES_CLASS, load_trivy_report
+
+SEVERITIES = ('CRITICAL', 'HIGH', 'MEDIUM', 'LOW', 'UNKNOWN')
+
+VULNERABILITY_COLUMNS = [
+    ('Vulnerability ID', 'VulnerabilityID'),
+    ('Package', 'PkgName'),
+    ('Installed Version', 'InstalledVersion'),
+    ('Fixed Version', 'FixedVersion'),
+    ('Severity', 'Severity'),
+    ('Description', 'Description'),
+    ('Status', 'Status'),
+]
+LICENSE_COLUMNS = [
+    ('License', 'Name'),
+    ('Package', 'PkgName'),
+    ('Category', 'Category'),
+    ('Severity', 'Severity'),
+    ('File Path', 'FilePath'),
+    ('Confidence', 'Confidence'),
+]
+
+# Per result class: (section title, key holding the findings, [(column header, finding field), ...])
+CLASS_SPECS = {
+    'os-pkgs': ("OS Packages", 'Vulnerabilities',
+                [column for column in VULNERABILITY_COLUMNS if column[1] != 'FixedVersion']),
+    'lang-pkgs': ("Language-specific Packages", 'Vulnerabilities', VULNERABILITY_COLUMNS),
+    # SARIF and standalone VEX input do not say whether a vulnerable package is an OS or a language package
+    PACKAGES_CLASS: ("Packages", 'Vulnerabilities', VULNERABILITY_COLUMNS),
+    'secret': ("Secrets", 'Secrets', [
+        ('Rule ID', 'RuleID'),
+        ('Category', 'Category'),
+        ('Severity', 'Severity'),
+        ('Title', 'Title'),
+        ('Start Line', 'StartLine'),
+        ('End Line', 'EndLine'),
+    ]),
+    'config': ("Misconfigurations", 'Misconfigurations', [
+        ('ID', 'ID'),
+        ('Type', 'Type'),
+        ('Title', 'Title'),
+        ('Severity', 'Severity'),
+        ('Status', 'Status'),
+        ('Message', 'Message'),
+        ('Resolution', 'Resolution'),
+    ]),
+    'license': ("Licenses", 'Licenses', LICENSE_COLUMNS),
+    'license-file': ("License Files", 'Licenses', LICENSE_COLUMNS),
+}
+# Results of a class without a spec are rendered as vulnerabilities when they carry any
+FALLBACK_SPEC = ("Other Findings", 'Vulnerabilities', VULNERABILITY_COLUMNS)
+
+
+def class_spec(result):
+    return CLASS_SPECS.get(result.get('Class'), FALLBACK_SPEC)
+
+
+def result_findings(result):
+    return result.get(class_spec(result)[1]) or []
 
 
 def count_severity(vulnerabilities):
-    severity_counts = {'CRITICAL': 0, 'HIGH': 0, 'MEDIUM': 0, 'LOW': 0, 'UNKNOWN': 0}
+    severity_counts = {severity: 0 for severity in SEVERITIES}
     for vuln in vulnerabilities:
-        severity = vuln['Severity'].upper()
+        severity = str(vuln.get('Severity', 'UNKNOWN')).upper()
         if severity in severity_counts:
             severity_counts[severity] += 1
         else:
@@ -13,27 +74,79 @@ def count_severity(vulnerabilities):
     return severity_counts
 
 
-def generate_markdown_report(trivy_output):
-    artifact = trivy_output['ArtifactName']
-    artifact_type = trivy_output['ArtifactType']
-    created_at = trivy_output['CreatedAt']
+def detect_os(trivy_output):
+    """Operating system from the scan metadata, else from the first os-pkgs target such as 'image (debian 12.5)'."""
+    os_info = trivy_output.get('Metadata', {}).get('OS')
+    if os_info:
+        return f"{os_info.get('Family', 'N/A')} {os_info.get('Name', 'N/A')}"
+    for result in trivy_output.get('Results') or []:
+        if result.get('Class') != 'os-pkgs':
+            continue
+        target = result.get('Target', '')
+        if target.endswith(')') and '(' in target:
+            return target[target.rindex('(') + 1:-1]
+        os_info = target.split()
+        if len(os_info) >= 2:
+            return f"{os_info[-2]} {os_info[-1]}"
+    return 'N/A'
+
+
+def cell(value):
+    return str(value).replace('|', '\\|').replace('\r', ' ').replace('\n', ' ')
+
+
+def render_target(result):
+    """Markdown section for one Results entry; empty when the target has no findings."""
+    findings = result_findings(result)
+    if not findings:
+        return ""
+    title, _, columns = class_spec(result)
+    package_class = result.get('Class', 'N/A')
+
+    lines = [
+        f"\n#### {title} (`{package_class}`)",
+        f"**Target:** `{result.get('Target', 'N/A')}`",
+        "| " + " | ".join(header for header, _ in columns) + " |",
+        "| " + " | ".join(":---" for _ in columns) + " |",
+    ]
+    for finding in findings:
+        lines.append("| " + " | ".join(cell(finding.get(field, 'N/A')) for _, field in columns) + " |")
+    return "\n".join(lines) + "\n"
+
+
+def iter_rendered_targets(results, workers=1):
+    """Render every target, in parallel worker processes when workers > 1, yielding sections in input order."""
+    if workers <= 1:
+        yield from map(render_target, results)
+        return
+    chunksize = max(1, len(results) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        yield from executor.map(render_target, results, chunksize=chunksize)
+
+
+def generate_report_header(trivy_output):
+    artifact = trivy_output.get('ArtifactName', 'N/A')
+    artifact_type = trivy_output.get('ArtifactType', 'N/A')
+    created_at = trivy_output.get('CreatedAt', 'N/A')
     image_id = trivy_output.get('Metadata', {}).get('ImageID', 'N/A')
     image_size = trivy_output.get('Metadata', {}).get('Size', 'N/A')
-
-    if 'Results' in trivy_output and len(trivy_output['Results']) > 0:
-        os_info = trivy_output['Results'][0].get('Target', 'N/A').split()
-        os_name = os_info[-2]  # Expected format "OS version"
-        os_version = os_info[-1]
-    else:
-        os_name = 'N/A'
-        os_version = 'N/A'
+    results = trivy_output.get('Results') or []
 
     all_vulnerabilities = []
-    for result in trivy_output['Results']:
-        all_vulnerabilities.extend(result.get('Vulnerabilities', []))
-
+    for result in results:
+        all_vulnerabilities.extend(result.get('Vulnerabilities') or [])
     severity_counts = count_severity(all_vulnerabilities)
 
+    class_rows = {}
+    for result in results:
+        findings = result_findings(result)
+        if not findings:
+            continue
+        row = class_rows.setdefault(result.get('Class', 'N/A'), [0, {severity: 0 for severity in SEVERITIES}])
+        row[0] += 1
+        for severity, count in count_severity(findings).items():
+            row[1][severity] += count
+
     markdown_report = f"""
 ## Trivy Scan Report: {artifact}
 
@@ -43,12 +156,14 @@ def generate_markdown_report(trivy_output):
 
 **Scan Date:** `{created_at}`
 
-**Operating System:** `{os_name} {os_version}`
+**Operating System:** `{detect_os(trivy_output)}`
 
 **Image ID:** `{image_id}`
 
 **Image Size:** `{image_size}`
 
+**Targets Scanned:** `{len(results)}`
+
 ---
 ### Overview of Vulnerabilities
 | Severity   | Count |
@@ -58,66 +173,69 @@ def generate_markdown_report(trivy_output):
 | MEDIUM     | {severity_counts.get('MEDIUM', 0)} |
 | LOW        | {severity_counts.get('LOW', 0)} |
 | UNKNOWN    | {severity_counts.get('UNKNOWN', 0)} |
----
-### Detected Vulnerabilities by Package
-This section lists all detected vulnerabilities, categorized by the type of package (OS or language-specific) and then by individual packages.
 """
-
-    for result in trivy_output['Results']:
-        # Skip if Results key does not have a "Vulnerabilities" key or if Vulnerabilities is empty
-        if 'Vulnerabilities' not in result or not result['Vulnerabilities']:
-            continue
-            
-        package_class = result['Class']
-        target = result['Target']
-
-        if package_class == 'os-pkgs':
-            markdown_report += f"""
-#### OS Packages (`os-pkgs`)
-**Target:** `{target}`
-| Vulnerability ID | Package    | Installed Version | Severity | Description                                   | Status      |
-| :--------------- | :--------- | :---------------- | :------- | :-------------------------------------------- | :---------- |
-"""
-            for vuln in result['Vulnerabilities']:
-                markdown_report += f"| {vuln['VulnerabilityID']} | {vuln['PkgName']} | {vuln['InstalledVersion']} | {vuln['Severity']} | {vuln['Description']} | {vuln['Status']} |\n"
-
-        elif package_class == 'lang-pkgs':
-            markdown_report += f"""
-#### Language-specific Packages (`lang-pkgs`)
-**Target:** `{target}`
-| Vulnerability ID | Package    | Installed Version | Fixed Version | Severity | Description                                   | Status      |
-| :--------------- | :--------- | :---------------- | :------------ | :------- | :-------------------------------------------- | :---------- |
+    if class_rows:
+        markdown_report += "\n### Findings by Class\n"
+        markdown_report += "| Class | Targets | " + " | ".join(SEVERITIES) + " |\n"
+        markdown_report += "| :---- | ----: | " + " | ".join("----:" for _ in SEVERITIES) + " |\n"
+        for package_class, (targets, counts) in class_rows.items():
+            markdown_report += f"| {package_class} | {targets} | " + " | ".join(str(counts[severity]) for severity in SEVERITIES) + " |\n"
+
+    markdown_report += """---
+### Detected Findings by Target
+This section lists the findings of every scanned target, categorized by result class (OS packages, language-specific packages, secrets, misconfigurations and licenses).
 """
-            for vuln in result['Vulnerabilities']:
-                fixed_version = vuln.get('FixedVersion', 'N/A')
-                markdown_report += f"| {vuln['VulnerabilityID']} | {vuln['PkgName']} | {vuln['InstalledVersion']} | {fixed_version} | {vuln['Severity']} | {vuln['Description']} | {vuln['Status']} |\n"
-
-    markdown_report += "\n---"
     return markdown_report
 
 
-def main(input_file):
-    # Read JSON input from a file
-    with open(input_file, 'r') as file:
-        trivy_output = json.load(file)
-
-    # Generate the Markdown report
-    markdown_report = generate_markdown_report(trivy_output)
-
-    # Define the output file path
-    output_file = 'trivy-results.md'
-
-    # Write the Markdown report to a file
+def generate_markdown_report(trivy_output, workers=1):
+    sections = iter_rendered_targets(trivy_output.get('Results') or [], workers)
+    return generate_report_header(trivy_output) + "".join(sections) + "\n---"
+
+
+def benchmark(input_file, workers, rounds=3):
+    """Time loading the report, then rendering every target sequentially and with the given number of worker processes."""
+    best_load = float('inf')
+    for _ in range(rounds):
+        start = time.perf_counter()
+        trivy_output = load_trivy_report(input_file)
+        best_load = min(best_load, time.perf_counter() - start)
+    results = trivy_output.get('Results') or []
+    findings = sum(len(result_findings(result)) for result in results)
+    print(f"Targets: {len(results)}, findings: {findings}")
+    print(f"Load: {best_load:.3f}s  ({findings / best_load:.0f} findings/s)")
+    for worker_count in sorted({1, workers}):
+        best = float('inf')
+        for _ in range(rounds):
+            start = time.perf_counter()
+            generate_markdown_report(trivy_output, worker_count)
+            best = min(best, time.perf_counter() - start)
+        print(f"Workers: {worker_count}  render: {best:.3f}s  ({len(results) / best:.0f} targets/s)")
+
+
+def main(input_file, output_file='trivy-results.md', workers=1):
+    # Native JSON, SARIF and CycloneDX reports are all read into the native Results layout
+    trivy_output = load_trivy_report(input_file)
+
+    # Sections are written as they are rendered, in the order of the Results array
     with open(output_file, 'w') as file:
-        file.write(markdown_report)
+        file.write(generate_report_header(trivy_output))
+        for section in iter_rendered_targets(trivy_output.get('Results') or [], workers):
+            file.write(section)
+        file.write("\n---")
 
     print(f"Markdown report generated successfully and saved to {output_file}!")
 
 
 if __name__ == '__main__':
-    if len(sys.argv) != 2:
-        print("Usage: python trivy_json_to_markdown_helper.py <input_file>")
-        sys.exit(1)
-
-    input_file = sys.argv[1]
-    main(input_file)
+    parser = argparse.ArgumentParser(description="Generate a Markdown report from Trivy JSON results.")
+    parser.add_argument('input_file', help="Trivy report (--format json, sarif or cyclonedx)")
+    parser.add_argument('-o', '--output', default='trivy-results.md', help="Markdown file to write")
+    parser.add_argument('--workers', type=int, default=1, help="Worker processes rendering targets in parallel")
+    parser.add_argument('--benchmark', action='store_true', help="Report render throughput instead of writing the report")
+    args = parser.parse_args()
+
+    if args.benchmark:
+        benchmark(args.input_file, args.workers)
+    else:
+        main(args.input_file, args.output, args.workers)
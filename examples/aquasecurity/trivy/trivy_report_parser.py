@@ -0,0 +1,259 @@
+"""Stream Trivy reports in native JSON, SARIF or CycloneDX (with vulnerabilities / VEX) format.
+
+Every format is turned into the native layout, `{"ArtifactName": ..., "Results": [{"Target", "Class",
+"Vulnerabilities" | "Secrets" | "Misconfigurations": [...]}]}`, with findings carrying the native field
+names, so the Markdown helper renders and aggregates all three the same way. Findings are decoded one at
+a time from the file instead of loading the whole document first.
+"""
+import os
+import sys
+
+# Shared helpers live in examples/common; a copy placed next to this script is found first
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'common'))
+
+from json_stream import JsonStream
+
+# Result class for package vulnerabilities when the format does not tell OS and language packages apart
+PACKAGES_CLASS = 'pkgs'
+
+SARIF_LEVEL_SEVERITY = {'error': 'HIGH', 'warning': 'MEDIUM', 'note': 'LOW'}
+SEVERITY_NAMES = ('CRITICAL', 'HIGH', 'MEDIUM', 'LOW', 'UNKNOWN')
+TRIVY_PROPERTY_PREFIX = 'aquasecurity:trivy:'
+
+
+class FindingCollector:
+    """Groups findings into native Results entries by (target, class), in first-seen order."""
+
+    def __init__(self):
+        self.results = {}
+
+    def add(self, target, package_class, findings_key, finding):
+        result = self.results.get((target, package_class))
+        if result is None:
+            result = self.results[(target, package_class)] = {'Target': target, 'Class': package_class, findings_key: []}
+        result[findings_key].append(finding)
+
+
+def normalize_severity(severity):
+    severity = str(severity or 'UNKNOWN').upper()
+    return severity if severity in SEVERITY_NAMES else 'UNKNOWN'
+
+
+def trivy_properties(component):
+    """`aquasecurity:trivy:*` properties of a CycloneDX component, without the prefix."""
+    return {prop['name'][len(TRIVY_PROPERTY_PREFIX):]: prop.get('value')
+            for prop in component.get('properties') or []
+            if prop.get('name', '').startswith(TRIVY_PROPERTY_PREFIX)}
+
+
+def purl_name_version(purl):
+    """(name, version) from a package URL, e.g. pkg:npm/%40scope/lib@1.2.3?arch=x -> ('@scope/lib', '1.2.3')."""
+    if not purl.startswith('pkg:'):
+        return purl or 'N/A', 'N/A'
+    path = purl[4:].split('#', 1)[0].split('?', 1)[0]
+    path, _, version = path.rpartition('@') if '@' in path else (path, '', '')
+    name = path.split('/', 1)[-1].replace('%40', '@')
+    return name or purl, version or 'N/A'
+
+
+def parse_sarif_message(text):
+    """Trivy SARIF messages are 'Label: value' lines plus one 'Vulnerability <id>' or 'Secret <title>' line."""
+    fields = {}
+    for line in text.splitlines():
+        label, separator, value = line.partition(': ')
+        if not separator:
+            label, _, value = line.partition(' ')
+        fields[label.strip()] = value.strip()
+    return fields
+
+
+def compact_sarif_rule(rule):
+    """(short description, full description, help text, tags): the only parts of a rule the findings use."""
+    return (rule.get('shortDescription', {}).get('text', 'N/A'),
+            rule.get('fullDescription', {}).get('text'),
+            rule.get('help', {}).get('text', 'N/A'),
+            tuple(rule.get('properties', {}).get('tags') or ()))
+
+
+NO_RULE = ('N/A', None, 'N/A', ())
+
+
+def sarif_finding(result, rules, collector):
+    rule_id = result.get('ruleId', 'N/A')
+    short_description, full_description, help_text, tags = rules.get(rule_id, NO_RULE)
+    fields = parse_sarif_message(result.get('message', {}).get('text', ''))
+
+    severity = fields.get('Severity') or next((tag for tag in tags if tag in SEVERITY_NAMES), None)
+    severity = normalize_severity(severity or SARIF_LEVEL_SEVERITY.get(result.get('level')))
+    location = (result.get('locations') or [{}])[0].get('physicalLocation', {})
+    target = location.get('artifactLocation', {}).get('uri', 'N/A')
+    region = location.get('region', {})
+    description = full_description or short_description
+
+    if 'secret' in tags or 'Secret' in fields:
+        collector.add(target, 'secret', 'Secrets', {
+            'RuleID': rule_id,
+            'Category': fields.get('Type') or 'N/A',
+            'Severity': severity,
+            'Title': fields.get('Secret') or short_description,
+            'StartLine': region.get('startLine', 'N/A'),
+            'EndLine': region.get('endLine', 'N/A'),
+        })
+    elif 'misconfiguration' in tags or ('Package' not in fields and 'Type' in fields):
+        collector.add(target, 'config', 'Misconfigurations', {
+            'ID': rule_id,
+            'Type': fields.get('Type') or 'N/A',
+            'Title': short_description,
+            'Severity': severity,
+            'Status': 'FAIL',
+            'Message': fields.get('Message', 'N/A'),
+            'Resolution': help_text,
+        })
+    else:
+        finding = {
+            'VulnerabilityID': fields.get('Vulnerability') or rule_id,
+            'PkgName': fields.get('Package', 'N/A'),
+            'InstalledVersion': fields.get('Installed Version', 'N/A'),
+            'Severity': severity,
+            'Description': description,
+        }
+        if fields.get('Fixed Version'):
+            finding['FixedVersion'] = fields['Fixed Version']
+        collector.add(target, PACKAGES_CLASS, 'Vulnerabilities', finding)
+
+
+def read_sarif_tool(stream, rules):
+    """Stream tool.driver.rules into rules as compact tuples; a rule per vulnerability adds up on large scans."""
+    for key in stream.members():
+        if key != 'driver':
+            stream.value()
+            continue
+        for driver_key in stream.members():
+            if driver_key == 'rules' and stream.peek() == '[':
+                for _ in stream.items():
+                    rule = stream.value()
+                    rules[rule.get('id')] = compact_sarif_rule(rule)
+            else:
+                stream.value()
+
+
+def read_sarif_runs(stream, report, collector):
+    for _ in stream.items():
+        # Trivy writes the tool (and its rules) before the results of a run
+        rules = {}
+        for key in stream.members():
+            if key == 'results':
+                for _ in stream.items():
+                    sarif_finding(stream.value(), rules, collector)
+            elif key == 'tool':
+                read_sarif_tool(stream, rules)
+            elif key == 'properties':
+                properties = stream.value()
+                if properties.get('imageName'):
+                    report.setdefault('ArtifactName', properties['imageName'])
+                    report.setdefault('ArtifactType', 'container_image')
+                if properties.get('imageID'):
+                    report.setdefault('Metadata', {})['ImageID'] = properties['imageID']
+            else:
+                stream.value()
+
+
+class CycloneDxReader:
+    """Turns CycloneDX components, dependencies and vulnerabilities into native findings.
+
+    Packages are attributed to the application or operating-system component that depends on them,
+    which Trivy emits for each scanned target. Components precede vulnerabilities in Trivy output; an
+    affected ref without a known component (e.g. in a standalone VEX document) is read as a purl.
+    """
+
+    def __init__(self, collector):
+        self.collector = collector
+        self.components = {}
+        self.targets = {}
+        self.package_targets = {}
+
+    def add_component(self, component):
+        ref = component.get('bom-ref')
+        properties = trivy_properties(component)
+        if component.get('type') in ('application', 'operating-system') and 'PkgType' not in properties:
+            if component.get('type') == 'operating-system':
+                name = f"{component.get('name', 'N/A')} {component.get('version', '')}".strip()
+                package_class = properties.get('Class', 'os-pkgs')
+            else:
+                name = component.get('name', 'N/A')
+                package_class = properties.get('Class', 'lang-pkgs')
+            self.targets[ref] = (name, package_class)
+        elif ref:
+            self.components[ref] = (component.get('name', 'N/A'), component.get('version', 'N/A'))
+        for child in component.get('components') or []:
+            self.add_component(child)
+
+    def add_dependency(self, dependency):
+        target = self.targets.get(dependency.get('ref'))
+        if target:
+            for ref in dependency.get('dependsOn') or []:
+                self.package_targets.setdefault(ref, target)
+
+    def add_vulnerability(self, vulnerability):
+        severity = next((rating.get('severity') for rating in vulnerability.get('ratings') or [] if rating.get('severity')), None)
+        analysis_state = vulnerability.get('analysis', {}).get('state')
+        finding_base = {
+            'VulnerabilityID': vulnerability.get('id', 'N/A'),
+            'Severity': normalize_severity(severity),
+            'Description': vulnerability.get('description', 'N/A'),
+        }
+        for affect in vulnerability.get('affects') or []:
+            ref = affect.get('ref', '')
+            name, version = self.components.get(ref) or purl_name_version(ref)
+            finding = dict(finding_base, PkgName=name, InstalledVersion=version)
+            for entry in affect.get('versions') or []:
+                if entry.get('status') == 'unaffected' and (entry.get('version') or entry.get('range')):
+                    finding['FixedVersion'] = entry.get('version') or entry.get('range')
+            # VEX analysis wins; otherwise a known unaffected version means a fix exists, as in the native Status
+            finding['Status'] = analysis_state or ('fixed' if 'FixedVersion' in finding else 'affected')
+            target, package_class = self.package_targets.get(ref, ('N/A', PACKAGES_CLASS))
+            self.collector.add(target, package_class, 'Vulnerabilities', finding)
+
+
+def cyclonedx_metadata(metadata, report):
+    component = metadata.get('component') or {}
+    if component.get('name'):
+        report.setdefault('ArtifactName', component['name'])
+    if component.get('type'):
+        report.setdefault('ArtifactType', 'container_image' if component['type'] == 'container' else component['type'])
+    if metadata.get('timestamp'):
+        report.setdefault('CreatedAt', metadata['timestamp'])
+    properties = trivy_properties(component)
+    for key in ('ImageID', 'Size'):
+        if key in properties:
+            report.setdefault('Metadata', {})[key] = properties[key]
+
+
+def load_trivy_report(path):
+    """Read a Trivy report in native JSON, SARIF or CycloneDX format into the native layout."""
+    report = {}
+    native_results = []
+    collector = FindingCollector()
+    cyclonedx = CycloneDxReader(collector)
+
+    with open(path, 'r') as f:
+        stream = JsonStream(f)
+        for key in stream.members():
+            if key == 'Results' and stream.peek() == '[':
+                for _ in stream.items():
+                    native_results.append(stream.value())
+            elif key == 'runs' and stream.peek() == '[':
+                read_sarif_runs(stream, report, collector)
+            elif key in ('components', 'dependencies', 'vulnerabilities') and stream.peek() == '[':
+                handler = {'components': cyclonedx.add_component,
+                           'dependencies': cyclonedx.add_dependency,
+                           'vulnerabilities': cyclonedx.add_vulnerability}[key]
+                for _ in stream.items():
+                    handler(stream.value())
+            elif key == 'metadata':
+                cyclonedx_metadata(stream.value(), report)
+            else:
+                report[key] = stream.value()
+
+    report['Results'] = native_results + list(collector.results.values())
+    return report
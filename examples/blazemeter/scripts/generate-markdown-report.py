@@ -1,22 +1,234 @@
+import argparse
 import json
+import math
 import os
 import sys
 from datetime import datetime
 
-def generate_markdown_report(json_data, artifact_name, test_id):
+import numpy as np
+
+# Aggregate report fields kept as columns for the per-label table
+LABEL_METRICS = ['samples', 'avgResponseTime', '90line', '95line', '99line', 'errorsRate', 'avgThroughput']
+# Relative p95/p99 increase (in percent) flagged as a regression in baseline comparisons
+DEFAULT_REGRESSION_THRESHOLD = 10.0
+# Violations kept in the JSON verdict; the full list is only rendered in markdown
+MAX_VERDICT_VIOLATIONS = 100
+DEFAULT_VERDICT_FILE = 'blazemeter-slo-verdict.json'
+
+
+def format_metric(value, spec='.2f'):
+    """Format a numeric metric, falling back to N/A when it is missing or not a number."""
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or math.isnan(value):
+        return 'N/A'
+    if spec == 'd' and isinstance(value, float):
+        return f"{value:.0f}"
+    return f"{value:{spec}}"
+
+
+def get_label_results(json_data):
+    """Return the per-label entries of an aggregate report, excluding the ALL summary."""
+    if not json_data or not isinstance(json_data.get('result'), list):
+        return []
+    return [item for item in json_data['result'] if item.get('labelName') != 'ALL']
+
+
+def build_label_columns(label_results):
+    """Convert per-label aggregate entries into columnar arrays; missing values become NaN."""
+    labels = np.array([str(item.get('labelName', 'N/A')) for item in label_results], dtype=object)
+    columns = {'labelName': labels}
+    for metric in LABEL_METRICS:
+        values = []
+        for item in label_results:
+            value = item.get(metric)
+            values.append(value if isinstance(value, (int, float)) and not isinstance(value, bool) else np.nan)
+        columns[metric] = np.array(values, dtype=np.float64)
+    return columns
+
+
+def sort_key(values):
+    """Descending sort key that places missing values last."""
+    return np.where(np.isnan(values), np.inf, -values)
+
+
+def generate_label_table(columns):
+    markdown_output = "## Per-Label Results\n\n"
+    if len(columns['labelName']) == 0:
+        return markdown_output + "No per-label data found in the aggregate report.\n\n"
+
+    # Slowest p99 first, highest error rate breaking ties
+    order = np.lexsort((sort_key(columns['errorsRate']), sort_key(columns['99line'])))
+
+    rows = ["| Label | Samples | Avg (ms) | p90 (ms) | p95 (ms) | p99 (ms) | Error Rate | Throughput (req/s) |\n",
+            "| :---- | ------: | -------: | -------: | -------: | -------: | ---------: | -----------------: |\n"]
+    for i in order:
+        rows.append(
+            f"| {columns['labelName'][i]} | {format_metric(columns['samples'][i], 'd')} "
+            f"| {format_metric(columns['avgResponseTime'][i])} | {format_metric(columns['90line'][i])} "
+            f"| {format_metric(columns['95line'][i])} | {format_metric(columns['99line'][i])} "
+            f"| {format_metric(columns['errorsRate'][i])}% | {format_metric(columns['avgThroughput'][i])} |\n"
+        )
+    return markdown_output + "".join(rows) + "\n"
+
+
+def compare_with_baseline(columns, baseline_columns, threshold=DEFAULT_REGRESSION_THRESHOLD):
+    """Align baseline labels to the current run and compute p95/p99 changes in percent."""
+    baseline_index = {label: i for i, label in enumerate(baseline_columns['labelName'])}
+    positions = np.array([baseline_index.get(label, -1) for label in columns['labelName']], dtype=np.int64)
+    matched = positions >= 0
+
+    comparison = {'matched': matched}
+    for metric in ('95line', '99line'):
+        baseline = np.full(len(positions), np.nan)
+        baseline[matched] = baseline_columns[metric][positions[matched]]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            change = (columns[metric] - baseline) / baseline * 100
+        comparison[metric] = baseline
+        comparison[f"{metric}_change"] = np.where(baseline > 0, change, np.nan)
+
+    worst_change = np.fmax(comparison['95line_change'], comparison['99line_change'])
+    comparison['worst_change'] = worst_change
+    comparison['regressed'] = np.nan_to_num(worst_change, nan=-np.inf) > threshold
+    return comparison
+
+
+def generate_baseline_section(columns, comparison, threshold):
+    regressed = np.flatnonzero(comparison['regressed'])
+    markdown_output = "## Baseline Comparison\n\n"
+    markdown_output += f"**Labels Compared:** {int(comparison['matched'].sum())} of {len(columns['labelName'])}  \n"
+    markdown_output += f"**Regression Threshold:** +{threshold:.1f}% on p95 or p99  \n"
+    markdown_output += f"**Regressed Labels:** {len(regressed)}  \n\n"
+
+    if len(regressed) == 0:
+        return markdown_output + "No p95/p99 regressions beyond the threshold.\n\n"
+
+    regressed = regressed[np.argsort(-comparison['worst_change'][regressed])]
+    rows = ["| Label | Baseline p95 (ms) | p95 (ms) | p95 Change | Baseline p99 (ms) | p99 (ms) | p99 Change |\n",
+            "| :---- | ----------------: | -------: | ---------: | ----------------: | -------: | ---------: |\n"]
+    for i in regressed:
+        rows.append(
+            f"| {columns['labelName'][i]} | {format_metric(comparison['95line'][i])} | {format_metric(columns['95line'][i])} "
+            f"| {format_metric(comparison['95line_change'][i], '+.1f')}% | {format_metric(comparison['99line'][i])} "
+            f"| {format_metric(columns['99line'][i])} | {format_metric(comparison['99line_change'][i], '+.1f')}% |\n"
+        )
+    return markdown_output + "".join(rows) + "\n"
+
+
+def get_summary_data(json_data):
+    """Return the ALL summary entry, falling back to the first label."""
+    if not json_data or not isinstance(json_data.get('result'), list):
+        return None
+    for item in json_data['result']:
+        if item.get('labelName') == 'ALL':
+            return item
+    return json_data['result'][0] if json_data['result'] else None
+
+
+def violation_severity(violation):
+    """How far a violation is past its threshold, as a ratio, so the worst offenders sort first.
+
+    A missing value cannot be checked at all and sorts before every measured one.
+    """
+    value, threshold = violation['value'], violation['threshold']
+    if value is None:
+        return float('inf')
+    if violation['metric'] == 'throughput_rps':
+        value, threshold = threshold, value
+    return value / threshold if threshold > 0 else float('inf')
+
+
+def evaluate_slos(json_data, p95_ms=None, error_rate=None, throughput=None):
+    """Check every label against the p95 and error rate SLOs and the run against the throughput SLO.
+
+    A report with only the ALL row is checked against that row, as
+    get_summary_data does. The gate fails closed: a configured metric that is
+    missing or not a number is a violation with value None, and so is a report
+    with no rows to check at all.
+    """
+    label_results = get_label_results(json_data)
+    if not label_results:
+        summary_data = get_summary_data(json_data)
+        label_results = [summary_data] if summary_data else []
+    columns = build_label_columns(label_results)
+    labels = columns['labelName']
+    violations = []
+
+    # Each check is a single vectorized pass over the label columns
+    for metric, limit, name in (('95line', p95_ms, 'p95_ms'), ('errorsRate', error_rate, 'error_rate_pct')):
+        if limit is None:
+            continue
+        if len(labels) == 0:
+            violations.append({'label': 'ALL', 'metric': name, 'value': None, 'threshold': limit})
+            continue
+        values = columns[metric]
+        # NaN marks a missing metric, which fails the check
+        for i in np.flatnonzero(np.nan_to_num(values, nan=np.inf) >= limit):
+            value = None if np.isnan(values[i]) else round(float(values[i]), 3)
+            violations.append({'label': labels[i], 'metric': name, 'value': value, 'threshold': limit})
+
+    if throughput is not None:
+        summary_data = get_summary_data(json_data) or {}
+        value = summary_data.get('avgThroughput')
+        if not isinstance(value, (int, float)) or isinstance(value, bool) or math.isnan(value):
+            violations.append({'label': summary_data.get('labelName', 'ALL'), 'metric': 'throughput_rps',
+                               'value': None, 'threshold': throughput})
+        elif value <= throughput:
+            violations.append({'label': summary_data.get('labelName', 'ALL'), 'metric': 'throughput_rps',
+                               'value': round(float(value), 3), 'threshold': throughput})
+
+    violations.sort(key=violation_severity, reverse=True)
+
+    return {
+        'passed': not violations,
+        'slo': {'p95_ms': p95_ms, 'error_rate_pct': error_rate, 'throughput_rps': throughput},
+        'labels_evaluated': len(labels),
+        'labels_failed': len({v['label'] for v in violations if v['metric'] != 'throughput_rps'}),
+        'violation_count': len(violations),
+        'violations': violations,
+    }
+
+
+def generate_slo_section(verdict):
+    slo = verdict['slo']
+    markdown_output = "## SLO Verdict\n\n"
+    markdown_output += f"**Result:** {'PASSED' if verdict['passed'] else 'FAILED'}  \n"
+    # Targets that were not configured are left out rather than shown as N/A
+    if slo['p95_ms'] is not None:
+        markdown_output += f"**p95 Target:** {format_metric(slo['p95_ms'])} ms per label  \n"
+    if slo['error_rate_pct'] is not None:
+        markdown_output += f"**Error Rate Target:** {format_metric(slo['error_rate_pct'])}% per label  \n"
+    if slo['throughput_rps'] is not None:
+        markdown_output += f"**Throughput Target:** {format_metric(slo['throughput_rps'])} req/s overall  \n"
+    if verdict['labels_evaluated']:
+        markdown_output += f"**Labels Failed:** {verdict['labels_failed']} of {verdict['labels_evaluated']}  \n\n"
+    else:
+        markdown_output += "**Labels Failed:** no label or ALL rows to evaluate  \n\n"
+
+    if verdict['passed']:
+        return markdown_output + "All labels meet the configured SLOs.\n\n"
+
+    rows = ["| Label | Metric | Value | Threshold |\n",
+            "| :---- | :----- | ----: | --------: |\n"]
+    for violation in verdict['violations']:
+        value = 'missing' if violation['value'] is None else format_metric(violation['value'])
+        rows.append(f"| {violation['label']} | {violation['metric']} | {value} "
+                    f"| {format_metric(violation['threshold'])} |\n")
+    return markdown_output + "".join(rows) + "\n"
+
+
+def compact_verdict(verdict, max_violations=MAX_VERDICT_VIOLATIONS):
+    """Wrap the verdict under the key policy.rego reads and cap the violation list."""
+    compact = dict(verdict, violations=verdict['violations'][:max_violations])
+    return {'performance_slo': compact}
+
+
+def generate_markdown_report(json_data, artifact_name, test_id, baseline_data=None,
+                             regression_threshold=DEFAULT_REGRESSION_THRESHOLD, verdict=None):
     markdown_output = "# BlazeMeter Performance Test Report\n\n"
     markdown_output += f"**Artifact Name:** {artifact_name}  \n"
     markdown_output += f"**Test ID:** {test_id}  \n"
     markdown_output += f"**Execution Date:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S UTC')}  \n\n"
-    
-    summary_data = None
-    if json_data and 'result' in json_data and isinstance(json_data['result'], list):
-        for item in json_data['result']:
-            if item.get('labelName') == 'ALL':
-                summary_data = item
-                break
-        if not summary_data and json_data['result']:
-            summary_data = json_data['result'][0] 
+
+    summary_data = get_summary_data(json_data)
 
     if not summary_data:
         markdown_output += "## No Performance Summary Data Found\n\n"
@@ -27,45 +239,76 @@ def generate_markdown_report(json_data, artifact_name, test_id):
     markdown_output += "| Metric                | Value      |\n"
     markdown_output += "| :-------------------- | :--------- |\n"
     markdown_output += f"| **Total Samples** | {summary_data.get('samples', 'N/A')} |\n"
-    markdown_output += f"| **Avg Response Time** | {summary_data.get('avgResponseTime', 'N/A'):.2f} ms |\n"
+    markdown_output += f"| **Avg Response Time** | {format_metric(summary_data.get('avgResponseTime'))} ms |\n"
     markdown_output += f"| **Median Response** | {summary_data.get('medianResponseTime', 'N/A')} ms |\n"
     markdown_output += f"| **90th Percentile** | {summary_data.get('90line', 'N/A')} ms |\n"
     markdown_output += f"| **95th Percentile** | {summary_data.get('95line', 'N/A')} ms |\n"
     markdown_output += f"| **99th Percentile** | {summary_data.get('99line', 'N/A')} ms |\n"
     markdown_output += f"| **Min Response Time** | {summary_data.get('minResponseTime', 'N/A')} ms |\n"
     markdown_output += f"| **Max Response Time** | {summary_data.get('maxResponseTime', 'N/A')} ms |\n"
-    markdown_output += f"| **Avg Latency** | {summary_data.get('avgLatency', 'N/A'):.2f} ms |\n"
-    markdown_output += f"| **Std Deviation** | {summary_data.get('stDev', 'N/A'):.2f} |\n"
+    markdown_output += f"| **Avg Latency** | {format_metric(summary_data.get('avgLatency'))} ms |\n"
+    markdown_output += f"| **Std Deviation** | {format_metric(summary_data.get('stDev'))} |\n"
     markdown_output += f"| **Total Duration** | {summary_data.get('duration', 'N/A')} seconds |\n"
-    markdown_output += f"| **Avg Throughput** | {summary_data.get('avgThroughput', 'N/A'):.2f} req/s |\n"
+    markdown_output += f"| **Avg Throughput** | {format_metric(summary_data.get('avgThroughput'))} req/s |\n"
     markdown_output += f"| **Error Count** | {summary_data.get('errorsCount', 'N/A')} |\n"
-    markdown_output += f"| **Error Rate** | {summary_data.get('errorsRate', 'N/A'):.2f}% |\n"
+    markdown_output += f"| **Error Rate** | {format_metric(summary_data.get('errorsRate'))}% |\n"
     markdown_output += f"| **Concurrency** | {summary_data.get('concurrency', 'N/A')} |\n"
     markdown_output += "\n"
 
-    return markdown_output
+    if verdict is not None:
+        markdown_output += generate_slo_section(verdict)
 
-if __name__ == "__main__":
-    if len(sys.argv) < 4:
-        print("Usage: python generate-markdown-report.py <path_to_blazemeter_report.json> <artifact_name> <test_id>")
-        sys.exit(1)
+    columns = build_label_columns(get_label_results(json_data))
+    markdown_output += generate_label_table(columns)
+
+    if baseline_data is not None:
+        baseline_columns = build_label_columns(get_label_results(baseline_data))
+        comparison = compare_with_baseline(columns, baseline_columns, regression_threshold)
+        markdown_output += generate_baseline_section(columns, comparison, regression_threshold)
+
+    return markdown_output
 
-    json_file_path = sys.argv[1]
-    artifact_name = sys.argv[2]
-    test_id = sys.argv[3]
 
+def load_report(json_file_path):
     if not os.path.exists(json_file_path):
         print(f"Error: File not found at {json_file_path}")
         sys.exit(1)
-
     try:
         with open(json_file_path, 'r') as f:
-            blazemeter_report_json = json.load(f)
-        markdown_report = generate_markdown_report(blazemeter_report_json, artifact_name, test_id)
-        print(markdown_report)
+            return json.load(f)
     except json.JSONDecodeError:
         print(f"Error: Invalid JSON in file {json_file_path}")
         sys.exit(1)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate a markdown report from a BlazeMeter aggregate report.")
+    parser.add_argument('json_file_path', help="BlazeMeter aggregate report JSON")
+    parser.add_argument('artifact_name', help="Name of the tested artifact")
+    parser.add_argument('test_id', help="BlazeMeter test ID")
+    parser.add_argument('--baseline', help="Aggregate report JSON of a baseline run to compare p95/p99 against")
+    parser.add_argument('--regression-threshold', type=float, default=DEFAULT_REGRESSION_THRESHOLD,
+                        help="Relative p95/p99 increase in percent flagged as a regression (default: 10)")
+    parser.add_argument('--slo-p95-ms', type=float, help="Maximum p95 response time per label in ms")
+    parser.add_argument('--slo-error-rate', type=float, help="Maximum error rate per label in percent")
+    parser.add_argument('--slo-throughput', type=float, help="Minimum overall throughput in req/s")
+    parser.add_argument('--verdict-file', default=DEFAULT_VERDICT_FILE,
+                        help=f"Where the JSON SLO verdict is written (default: {DEFAULT_VERDICT_FILE})")
+    args = parser.parse_args()
+
+    blazemeter_report_json = load_report(args.json_file_path)
+    baseline_report_json = load_report(args.baseline) if args.baseline else None
+
+    try:
+        verdict = None
+        if args.slo_p95_ms is not None or args.slo_error_rate is not None or args.slo_throughput is not None:
+            verdict = evaluate_slos(blazemeter_report_json, args.slo_p95_ms, args.slo_error_rate, args.slo_throughput)
+            with open(args.verdict_file, 'w') as f:
+                json.dump(compact_verdict(verdict), f, indent=2)
+
+        markdown_report = generate_markdown_report(blazemeter_report_json, args.artifact_name, args.test_id,
+                                                   baseline_report_json, args.regression_threshold, verdict)
+        print(markdown_report)
     except Exception as e:
         print(f"An unexpected error occurred: {e}")
         sys.exit(1)
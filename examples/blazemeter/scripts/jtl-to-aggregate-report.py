@@ -0,0 +1,288 @@
+import argparse
+import csv
+import gc
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+import numpy as np
+
+# Rows parsed per chunk; bounds memory independently of the JTL size
+DEFAULT_CHUNK_ROWS = 100_000
+DEFAULT_PERCENTILES = [50.0, 90.0, 95.0, 99.0]
+
+# Log-linear histogram: values below 2^SUB_BUCKET_BITS ms are exact, larger values
+# keep SUB_BUCKET_BITS - 1 significant bits (under 1% relative error)
+SUB_BUCKET_BITS = 7
+SUB_BUCKETS = 1 << SUB_BUCKET_BITS
+HALF_SUB_BUCKETS = SUB_BUCKETS // 2
+MAX_EXPONENT = 40
+BUCKET_COUNT = SUB_BUCKETS + (MAX_EXPONENT - SUB_BUCKET_BITS + 1) * HALF_SUB_BUCKETS
+
+# Per-label scalar statistics, stored as columns next to the histograms
+SAMPLES, ERRORS, ELAPSED_SUM, ELAPSED_SQ_SUM, LATENCY_SUM, MIN, MAX = range(7)
+
+
+def bucket_index(values):
+    """Map non-negative integer latencies in ms to histogram buckets."""
+    values = np.clip(values, 0, (1 << (MAX_EXPONENT + 1)) - 1).astype(np.int64)
+    _, exponents = np.frexp(values.astype(np.float64))
+    shifts = np.maximum(exponents.astype(np.int64) - SUB_BUCKET_BITS, 0)
+    mantissas = values >> shifts
+    return np.where(values < SUB_BUCKETS, values, SUB_BUCKETS + (shifts - 1) * HALF_SUB_BUCKETS + mantissas - HALF_SUB_BUCKETS)
+
+
+def bucket_values():
+    """Representative value (bucket midpoint) of every histogram bucket."""
+    indexes = np.arange(BUCKET_COUNT, dtype=np.int64)
+    offsets = np.maximum(indexes - SUB_BUCKETS, 0)
+    shifts = offsets // HALF_SUB_BUCKETS + 1
+    lower = (HALF_SUB_BUCKETS + offsets % HALF_SUB_BUCKETS) << shifts
+    midpoints = lower + ((1 << shifts) - 1) / 2
+    return np.where(indexes < SUB_BUCKETS, indexes, midpoints).astype(np.float64)
+
+
+class LatencySketch:
+    """Mergeable per-label latency histograms plus the scalar statistics of an aggregate report."""
+
+    def __init__(self):
+        self.labels = []
+        self.label_ids = {}
+        self.histograms = np.zeros((0, BUCKET_COUNT), dtype=np.int64)
+        self.stats = np.zeros((0, 7), dtype=np.float64)
+        self.first_timestamp = None
+        self.last_timestamp = None
+
+    def _resize(self):
+        missing = len(self.labels) - len(self.histograms)
+        if missing > 0:
+            self.histograms = np.vstack([self.histograms, np.zeros((missing, BUCKET_COUNT), dtype=np.int64)])
+            new_stats = np.zeros((missing, 7), dtype=np.float64)
+            new_stats[:, MIN] = np.inf
+            new_stats[:, MAX] = -np.inf
+            self.stats = np.vstack([self.stats, new_stats])
+
+    def _label_id(self, label):
+        label_id = self.label_ids.get(label)
+        if label_id is None:
+            label_id = self.label_ids[label] = len(self.labels)
+            self.labels.append(label)
+        return label_id
+
+    def _track_time_range(self, first, last):
+        if first is not None:
+            self.first_timestamp = first if self.first_timestamp is None else min(self.first_timestamp, first)
+            self.last_timestamp = last if self.last_timestamp is None else max(self.last_timestamp, last)
+
+    def add_chunk(self, labels, timestamps, elapsed, latency, success):
+        """Fold one chunk of parsed samples into the sketch."""
+        if not labels:
+            return
+        ids = self.label_ids
+        label_ids = np.array([ids.setdefault(label, len(ids)) for label in labels], dtype=np.int64)
+        if len(ids) > len(self.labels):
+            # Dicts keep insertion order, so new labels are the tail of the id map
+            self.labels.extend(list(ids)[len(self.labels):])
+        self._resize()
+        label_count = len(self.labels)
+
+        # Only the buckets that occur in this chunk are touched, whatever the label count
+        keys, counts = np.unique(label_ids * BUCKET_COUNT + bucket_index(elapsed), return_counts=True)
+        self.histograms.reshape(-1)[keys] += counts
+
+        elapsed = elapsed.astype(np.float64)
+        self.stats[:, SAMPLES] += np.bincount(label_ids, minlength=label_count)
+        self.stats[:, ERRORS] += np.bincount(label_ids, weights=~success, minlength=label_count)
+        self.stats[:, ELAPSED_SUM] += np.bincount(label_ids, weights=elapsed, minlength=label_count)
+        self.stats[:, ELAPSED_SQ_SUM] += np.bincount(label_ids, weights=elapsed * elapsed, minlength=label_count)
+        self.stats[:, LATENCY_SUM] += np.bincount(label_ids, weights=latency, minlength=label_count)
+        np.minimum.at(self.stats[:, MIN], label_ids, elapsed)
+        np.maximum.at(self.stats[:, MAX], label_ids, elapsed)
+
+        self._track_time_range(int(timestamps.min()), int((timestamps + elapsed).max()))
+
+    def merge(self, other):
+        """Add another sketch (e.g. from a different shard) into this one."""
+        if not other.labels:
+            return self
+        positions = np.array([self._label_id(label) for label in other.labels], dtype=np.int64)
+        self._resize()
+        self.histograms[positions] += other.histograms
+        self.stats[positions, :MIN] += other.stats[:, :MIN]
+        self.stats[positions, MIN] = np.minimum(self.stats[positions, MIN], other.stats[:, MIN])
+        self.stats[positions, MAX] = np.maximum(self.stats[positions, MAX], other.stats[:, MAX])
+        self._track_time_range(other.first_timestamp, other.last_timestamp)
+        return self
+
+
+def percentiles(histograms, values, quantiles):
+    """Nearest-rank percentiles for each histogram row, as an array of shape (rows, len(quantiles))."""
+    cumulative = np.cumsum(histograms, axis=1)
+    totals = cumulative[:, -1:]
+    ranks = np.maximum(np.ceil(totals * (np.asarray(quantiles) / 100.0)), 1)
+    result = np.empty((len(histograms), len(quantiles)), dtype=np.float64)
+    for row in range(len(histograms)):
+        result[row] = values[np.searchsorted(cumulative[row], ranks[row])]
+    return result
+
+
+def percentile_key(percentile):
+    """Aggregate report field name for a percentile, e.g. 95 -> '95line'."""
+    return 'medianResponseTime' if percentile == 50 else f"{percentile:g}line"
+
+
+def build_aggregate_report(sketch, extra_percentiles=()):
+    """Render the sketch as a BlazeMeter aggregate report ({'result': [ALL, label, ...]})."""
+    quantiles = DEFAULT_PERCENTILES + [p for p in extra_percentiles if p not in DEFAULT_PERCENTILES]
+    histograms = np.vstack([sketch.histograms.sum(axis=0, keepdims=True), sketch.histograms])
+    stats = np.vstack([
+        np.concatenate([sketch.stats[:, :MIN].sum(axis=0), [sketch.stats[:, MIN].min(), sketch.stats[:, MAX].max()]]),
+        sketch.stats,
+    ])
+    values = percentiles(histograms, bucket_values(), quantiles)
+    duration = max((sketch.last_timestamp - sketch.first_timestamp) / 1000.0, 1e-3)
+
+    result = []
+    for row, label in enumerate(['ALL'] + sketch.labels):
+        samples = stats[row, SAMPLES]
+        mean = stats[row, ELAPSED_SUM] / samples
+        entry = {
+            'labelName': label,
+            'samples': int(samples),
+            'avgResponseTime': round(mean, 3),
+            'minResponseTime': int(stats[row, MIN]),
+            'maxResponseTime': int(stats[row, MAX]),
+            'avgLatency': round(stats[row, LATENCY_SUM] / samples, 3),
+            'stDev': round(float(np.sqrt(max(stats[row, ELAPSED_SQ_SUM] / samples - mean * mean, 0))), 3),
+            'duration': round(duration),
+            'avgThroughput': round(samples / duration, 3),
+            'errorsCount': int(stats[row, ERRORS]),
+            'errorsRate': round(stats[row, ERRORS] * 100 / samples, 3),
+        }
+        for column, percentile in enumerate(quantiles):
+            entry[percentile_key(percentile)] = round(float(values[row, column]), 1)
+        result.append(entry)
+
+    return {'result': result}
+
+
+def parse_chunk(rows, columns, window):
+    """Convert raw CSV rows into column arrays, keeping only samples inside the time window."""
+    timestamp_col, elapsed_col, label_col, success_col, latency_col = columns
+    timestamps = np.array([row[timestamp_col] for row in rows], dtype=np.int64)
+    elapsed = np.array([row[elapsed_col] for row in rows], dtype=np.int64)
+    success = np.array([row[success_col] == 'true' for row in rows], dtype=bool)
+    if latency_col is None:
+        latency = np.zeros(len(rows), dtype=np.float64)
+    else:
+        latency = np.array([row[latency_col] or 0 for row in rows], dtype=np.float64)
+    labels = [row[label_col] for row in rows]
+
+    start, end = window
+    if start is not None or end is not None:
+        keep = np.ones(len(rows), dtype=bool)
+        if start is not None:
+            keep &= timestamps >= start
+        if end is not None:
+            keep &= timestamps < end
+        labels = [label for label, kept in zip(labels, keep) if kept]
+        timestamps, elapsed, latency, success = timestamps[keep], elapsed[keep], latency[keep], success[keep]
+
+    return labels, timestamps, elapsed, latency, success
+
+
+def sketch_file(jtl_file_path, chunk_rows=DEFAULT_CHUNK_ROWS, window=(None, None)):
+    """Stream one JTL CSV shard into a sketch, chunk_rows rows at a time."""
+    sketch = LatencySketch()
+    with open(jtl_file_path, 'r', newline='') as f:
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if header is None:
+            return sketch
+        try:
+            columns = (header.index('timeStamp'), header.index('elapsed'), header.index('label'),
+                       header.index('success'), header.index('Latency') if 'Latency' in header else None)
+        except ValueError:
+            raise ValueError(f"{jtl_file_path} is not a JTL CSV with a timeStamp,elapsed,label,success header")
+
+        # Parsed rows hold no reference cycles; pausing the cyclic GC avoids rescanning
+        # every buffered row, which otherwise costs more than the CSV parsing itself
+        gc_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            while True:
+                chunk = list(islice(reader, chunk_rows))
+                if not chunk:
+                    break
+                rows = [row for row in chunk if row]
+                if rows:
+                    sketch.add_chunk(*parse_chunk(rows, columns, window))
+        finally:
+            if gc_enabled:
+                gc.enable()
+    return sketch
+
+
+def expand_inputs(inputs):
+    """Expand directories into the JTL/CSV shards they contain."""
+    jtl_files = []
+    for path in inputs:
+        if os.path.isdir(path):
+            jtl_files.extend(sorted(os.path.join(path, name) for name in os.listdir(path)
+                                    if name.endswith(('.jtl', '.csv'))))
+        else:
+            jtl_files.append(path)
+    return jtl_files
+
+
+def aggregate_files(jtl_files, workers=None, chunk_rows=DEFAULT_CHUNK_ROWS, window=(None, None)):
+    """Sketch every shard in a worker process and merge the results."""
+    sketch = LatencySketch()
+    if workers == 1 or len(jtl_files) == 1:
+        for jtl_file in jtl_files:
+            sketch.merge(sketch_file(jtl_file, chunk_rows, window))
+        return sketch
+
+    count = len(jtl_files)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for shard in pool.map(sketch_file, jtl_files, [chunk_rows] * count, [window] * count):
+            sketch.merge(shard)
+    return sketch
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Compute a BlazeMeter-style aggregate report from raw JMeter JTL/CSV sample logs.")
+    parser.add_argument('inputs', nargs='+', help="JTL/CSV files, or directories of shards")
+    parser.add_argument('-o', '--output', default='jtl-aggregate-report.json', help="Aggregate report JSON to write")
+    parser.add_argument('--workers', type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument('--chunk-rows', type=int, default=DEFAULT_CHUNK_ROWS, help="Rows parsed per chunk")
+    parser.add_argument('--percentile', type=float, action='append', default=[],
+                        help="Additional percentile to compute, e.g. 99.9 (repeatable)")
+    parser.add_argument('--from-ms', type=int, help="Only include samples starting at or after this epoch ms")
+    parser.add_argument('--to-ms', type=int, help="Only include samples starting before this epoch ms")
+    args = parser.parse_args()
+
+    jtl_files = expand_inputs(args.inputs)
+    missing = [path for path in jtl_files if not os.path.exists(path)]
+    if not jtl_files or missing:
+        print(f"Error: File not found at {missing[0] if missing else args.inputs[0]}")
+        sys.exit(1)
+
+    try:
+        sketch = aggregate_files(jtl_files, args.workers, args.chunk_rows, (args.from_ms, args.to_ms))
+    except ValueError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+    if not sketch.labels:
+        print("Error: No samples found in the given time window")
+        sys.exit(1)
+
+    with open(args.output, 'w') as f:
+        json.dump(build_aggregate_report(sketch, args.percentile), f, indent=2)
+
+    print(f"Aggregated {int(sketch.stats[:, SAMPLES].sum())} samples over {len(sketch.labels)} labels "
+          f"from {len(jtl_files)} file(s) into {args.output}")
@@ -0,0 +1,302 @@
+#!/usr/bin/env python3
+"""
+CVSS v3.x Vector Parser and Scorer
+
+Parses CVSS v3.0/v3.1 vector strings and computes base, temporal and
+environmental scores as defined by the FIRST specification. A deployment
+context (temporal and environmental metrics such as "E:P/RL:O/CR:H/MAV:L")
+can be applied to every vector to rescore findings for a specific environment.
+
+Scores are memoized with an LRU cache keyed by the vector string, since the
+same handful of vectors recurs thousands of times in a single report.
+"""
+
+import argparse
+import json
+import math
+import sys
+import time
+from functools import lru_cache
+from typing import Any, Dict, Iterator, NamedTuple, Optional
+
+
+CACHE_SIZE = 4096
+
+BASE_METRICS = ('AV', 'AC', 'PR', 'UI', 'S', 'C', 'I', 'A')
+TEMPORAL_METRICS = ('E', 'RL', 'RC')
+ENVIRONMENTAL_METRICS = ('CR', 'IR', 'AR', 'MAV', 'MAC', 'MPR', 'MUI', 'MS', 'MC', 'MI', 'MA')
+METRIC_ORDER = BASE_METRICS + TEMPORAL_METRICS + ENVIRONMENTAL_METRICS
+
+WEIGHTS = {
+    'AV': {'N': 0.85, 'A': 0.62, 'L': 0.55, 'P': 0.2},
+    'AC': {'L': 0.77, 'H': 0.44},
+    'UI': {'N': 0.85, 'R': 0.62},
+    'CIA': {'H': 0.56, 'L': 0.22, 'N': 0.0},
+    'E': {'X': 1.0, 'H': 1.0, 'F': 0.97, 'P': 0.94, 'U': 0.91},
+    'RL': {'X': 1.0, 'U': 1.0, 'W': 0.97, 'T': 0.96, 'O': 0.95},
+    'RC': {'X': 1.0, 'C': 1.0, 'R': 0.96, 'U': 0.92},
+    'REQ': {'X': 1.0, 'H': 1.5, 'M': 1.0, 'L': 0.5},
+}
+# Privileges Required weighs more when the scope changes
+PR_WEIGHTS = {
+    'U': {'N': 0.85, 'L': 0.62, 'H': 0.27},
+    'C': {'N': 0.85, 'L': 0.68, 'H': 0.5},
+}
+ALLOWED_VALUES = {
+    'AV': 'NALP', 'AC': 'LH', 'PR': 'NLH', 'UI': 'NR', 'S': 'UC', 'C': 'HLN', 'I': 'HLN', 'A': 'HLN',
+    'E': 'XHFPU', 'RL': 'XUWTO', 'RC': 'XCRU', 'CR': 'XHML', 'IR': 'XHML', 'AR': 'XHML',
+    'MAV': 'XNALP', 'MAC': 'XLH', 'MPR': 'XNLH', 'MUI': 'XNR', 'MS': 'XUC', 'MC': 'XHLN', 'MI': 'XHLN', 'MA': 'XHLN',
+}
+
+# Dependency-Check reports the base metrics as separate fields instead of a vector string
+FIELD_METRICS = {
+    'attackVector': ('AV', {'NETWORK': 'N', 'ADJACENT_NETWORK': 'A', 'ADJACENT': 'A', 'LOCAL': 'L', 'PHYSICAL': 'P'}),
+    'attackComplexity': ('AC', {'LOW': 'L', 'HIGH': 'H'}),
+    'privilegesRequired': ('PR', {'NONE': 'N', 'LOW': 'L', 'HIGH': 'H'}),
+    'userInteraction': ('UI', {'NONE': 'N', 'REQUIRED': 'R'}),
+    'scope': ('S', {'UNCHANGED': 'U', 'CHANGED': 'C'}),
+    'confidentialityImpact': ('C', {'HIGH': 'H', 'LOW': 'L', 'NONE': 'N'}),
+    'integrityImpact': ('I', {'HIGH': 'H', 'LOW': 'L', 'NONE': 'N'}),
+    'availabilityImpact': ('A', {'HIGH': 'H', 'LOW': 'L', 'NONE': 'N'}),
+}
+
+
+class CvssScores(NamedTuple):
+    version: str
+    base: float
+    temporal: float
+    environmental: float
+
+
+def severity_rating(score: Optional[float]) -> str:
+    """Qualitative severity rating for a CVSS v3 score."""
+    if score is None:
+        return 'N/A'
+    if score >= 9.0:
+        return 'Critical'
+    if score >= 7.0:
+        return 'High'
+    if score >= 4.0:
+        return 'Medium'
+    if score >= 0.1:
+        return 'Low'
+    return 'None'
+
+
+def _roundup(value: float, version: str) -> float:
+    """Round up to one decimal; v3.1 avoids floating point artifacts by working on integers."""
+    if version == '3.0':
+        return math.ceil(value * 10) / 10
+    int_input = round(value * 100000)
+    if int_input % 10000 == 0:
+        return int_input / 100000.0
+    return (math.floor(int_input / 10000) + 1) / 10.0
+
+
+def parse_vector(vector: str) -> Dict[str, str]:
+    """Parse a CVSS v3.x vector into {'version': '3.1', 'AV': 'N', ...}; raises ValueError if invalid."""
+    prefix, _, body = vector.strip().partition('/')
+    if prefix not in ('CVSS:3.0', 'CVSS:3.1') or not body:
+        raise ValueError(f"Not a CVSS v3 vector: {vector!r}")
+    metrics = {'version': prefix[5:]}
+    for part in body.split('/'):
+        metric, _, value = part.partition(':')
+        if metric not in ALLOWED_VALUES or not value or value not in ALLOWED_VALUES[metric]:
+            raise ValueError(f"Invalid CVSS metric {part!r} in {vector!r}")
+        if metric in metrics:
+            raise ValueError(f"Duplicate CVSS metric {metric!r} in {vector!r}")
+        metrics[metric] = value
+    missing = [metric for metric in BASE_METRICS if metric not in metrics]
+    if missing:
+        raise ValueError(f"CVSS vector {vector!r} lacks base metrics {', '.join(missing)}")
+    return metrics
+
+
+def parse_context(context: str) -> Dict[str, str]:
+    """Parse temporal/environmental metrics such as 'E:P/RL:O/CR:H/MAV:L'."""
+    metrics = {}
+    for part in filter(None, context.strip().strip('/').split('/')):
+        metric, _, value = part.partition(':')
+        if metric not in TEMPORAL_METRICS + ENVIRONMENTAL_METRICS or not value or value not in ALLOWED_VALUES[metric]:
+            raise ValueError(f"Invalid CVSS context metric {part!r}; expected temporal or environmental metrics")
+        metrics[metric] = value
+    return metrics
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def score_vector(vector: str) -> CvssScores:
+    """Base, temporal and environmental scores of a CVSS v3.x vector."""
+    m = parse_vector(vector)
+    version = m['version']
+
+    def metric(name: str) -> str:
+        return m.get(name, 'X')
+
+    def modified(name: str) -> str:
+        value = metric('M' + name)
+        return m[name] if value == 'X' else value
+
+    # Base score
+    scope_changed = m['S'] == 'C'
+    iss = 1 - ((1 - WEIGHTS['CIA'][m['C']]) * (1 - WEIGHTS['CIA'][m['I']]) * (1 - WEIGHTS['CIA'][m['A']]))
+    if scope_changed:
+        impact = 7.52 * (iss - 0.029) - 3.25 * (iss - 0.02) ** 15
+    else:
+        impact = 6.42 * iss
+    exploitability = (8.22 * WEIGHTS['AV'][m['AV']] * WEIGHTS['AC'][m['AC']]
+                      * PR_WEIGHTS[m['S']][m['PR']] * WEIGHTS['UI'][m['UI']])
+    if impact <= 0:
+        base = 0.0
+    elif scope_changed:
+        base = _roundup(min(1.08 * (impact + exploitability), 10), version)
+    else:
+        base = _roundup(min(impact + exploitability, 10), version)
+
+    # Temporal score
+    temporal_factor = WEIGHTS['E'][metric('E')] * WEIGHTS['RL'][metric('RL')] * WEIGHTS['RC'][metric('RC')]
+    temporal = _roundup(base * temporal_factor, version)
+
+    # Environmental score: base formulas over the modified metrics, weighted by the security requirements
+    modified_scope = modified('S')
+    miss = min(1 - ((1 - WEIGHTS['REQ'][metric('CR')] * WEIGHTS['CIA'][modified('C')])
+                    * (1 - WEIGHTS['REQ'][metric('IR')] * WEIGHTS['CIA'][modified('I')])
+                    * (1 - WEIGHTS['REQ'][metric('AR')] * WEIGHTS['CIA'][modified('A')])), 0.915)
+    if modified_scope == 'C':
+        if version == '3.0':
+            modified_impact = 7.52 * (miss - 0.029) - 3.25 * (miss - 0.02) ** 15
+        else:
+            modified_impact = 7.52 * (miss - 0.029) - 3.25 * (miss * 0.9731 - 0.02) ** 13
+    else:
+        modified_impact = 6.42 * miss
+    modified_exploitability = (8.22 * WEIGHTS['AV'][modified('AV')] * WEIGHTS['AC'][modified('AC')]
+                               * PR_WEIGHTS[modified_scope][modified('PR')] * WEIGHTS['UI'][modified('UI')])
+    if modified_impact <= 0:
+        environmental = 0.0
+    elif modified_scope == 'C':
+        environmental = _roundup(_roundup(min(1.08 * (modified_impact + modified_exploitability), 10), version)
+                                 * temporal_factor, version)
+    else:
+        environmental = _roundup(_roundup(min(modified_impact + modified_exploitability, 10), version)
+                                 * temporal_factor, version)
+
+    return CvssScores(version, base, temporal, environmental)
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def apply_context(vector: str, context: str) -> str:
+    """Vector with the context metrics set (overriding any the vector already carries), in canonical order."""
+    metrics = parse_vector(vector)
+    metrics.update(parse_context(context))
+    version = metrics.pop('version')
+    return f"CVSS:{version}/" + '/'.join(f"{name}:{metrics[name]}" for name in METRIC_ORDER if name in metrics)
+
+
+def rescore(vector: str, context: Optional[str] = None) -> CvssScores:
+    """Scores of vector under the deployment context, if one is given."""
+    return score_vector(apply_context(vector, context) if context else vector)
+
+
+def vector_from_fields(cvss: Dict[str, Any]) -> Optional[str]:
+    """Vector string of a Dependency-Check `cvssv3` object, or None if its metrics are incomplete."""
+    vector = cvss.get('vectorString')
+    if isinstance(vector, str) and vector.startswith('CVSS:3'):
+        return vector
+    parts = []
+    for field, (metric, values) in FIELD_METRICS.items():
+        value = values.get(str(cvss.get(field, '')).upper())
+        if value is None:
+            return None
+        parts.append(f"{metric}:{value}")
+    version = str(cvss.get('version') or '3.1')
+    return f"CVSS:{'3.0' if version.startswith('3.0') else '3.1'}/" + '/'.join(parts)
+
+
+def cache_stats() -> Dict[str, Any]:
+    """Hit/miss counters of the vector caches."""
+    stats = {}
+    for name, function in (('score_vector', score_vector), ('apply_context', apply_context)):
+        info = function.cache_info()
+        lookups = info.hits + info.misses
+        stats[name] = {'hits': info.hits, 'misses': info.misses, 'size': info.currsize,
+                       'hit_rate': info.hits / lookups if lookups else 0.0}
+    return stats
+
+
+def clear_caches() -> None:
+    """Empty the vector caches and reset their counters, e.g. before timing an uncached run."""
+    score_vector.cache_clear()
+    apply_context.cache_clear()
+
+
+def iter_vectors(node: Any) -> Iterator[str]:
+    """Every CVSS v3 vector in a JSON document: vector strings and Dependency-Check `cvssv3` objects."""
+    stack = [node]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, dict):
+            vector = vector_from_fields(node) if 'attackVector' in node else None
+            if vector:
+                yield vector
+            stack.extend(node.values())
+        elif isinstance(node, list):
+            stack.extend(node)
+        elif isinstance(node, str) and node.startswith('CVSS:3'):
+            yield node
+
+
+def benchmark(report_file: str, context: Optional[str], rounds: int = 3) -> None:
+    """Score every vector of a report uncached and through the LRU cache, and print the cache hit rate."""
+    with open(report_file, 'r', encoding='utf-8') as file:
+        vectors = list(iter_vectors(json.load(file)))
+    if not vectors:
+        print(f"No CVSS v3 vectors found in {report_file}")
+        return
+    uncached = score_vector.__wrapped__
+
+    best_uncached = best_cached = float('inf')
+    for _ in range(rounds):
+        started = time.perf_counter()
+        for vector in vectors:
+            uncached(apply_context.__wrapped__(vector, context) if context else vector)
+        best_uncached = min(best_uncached, time.perf_counter() - started)
+
+        clear_caches()
+        started = time.perf_counter()
+        for vector in vectors:
+            rescore(vector, context)
+        best_cached = min(best_cached, time.perf_counter() - started)
+
+    stats = cache_stats()['score_vector']
+    print(f"Vectors: {len(vectors)} ({stats['size']} distinct)")
+    print(f"Uncached: {best_uncached * 1000:.1f} ms ({len(vectors) / best_uncached:.0f} vectors/s)")
+    print(f"Cached:   {best_cached * 1000:.1f} ms ({len(vectors) / best_cached:.0f} vectors/s)")
+    print(f"Cache hit rate: {stats['hit_rate']:.1%} ({stats['hits']} hits, {stats['misses']} misses)")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Score CVSS v3.x vectors, optionally under a deployment context.",
+        epilog='Example: python cvss3.py "CVSS:3.1/AV:N/AC:L/PR:N/UI:N/S:U/C:H/I:H/A:H" --context "E:P/MAV:L"',
+    )
+    parser.add_argument('vectors', nargs='*', help="CVSS v3.0/v3.1 vector strings")
+    parser.add_argument('--context', help="Temporal/environmental metrics applied to every vector, e.g. E:P/RL:O/CR:H")
+    parser.add_argument('--benchmark', metavar='REPORT', help="Report cache hit rates for the vectors of a JSON report")
+    args = parser.parse_args()
+
+    try:
+        if args.context:
+            parse_context(args.context)
+        if args.benchmark:
+            benchmark(args.benchmark, args.context)
+        for vector in args.vectors:
+            scores = rescore(vector, args.context)
+            print(f"{vector}: base {scores.base} ({severity_rating(scores.base)}), "
+                  f"temporal {scores.temporal}, environmental {scores.environmental} "
+                  f"({severity_rating(scores.environmental)})")
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+"""
+Per-file and per-directory hotspot rollup for SARIF findings.
+
+Findings are tallied on the file node of a path trie while results are read;
+every distinct path is split once, no matter how many results point at it.
+rollup() then sums the tallies into every directory level in one bottom-up
+walk, so the cost is linear in results plus trie nodes.
+"""
+
+import heapq
+
+SARIF_LEVELS = ('error', 'warning', 'note', 'none')
+
+
+def result_level(result, rule_levels):
+    """SARIF level of a result: its own, else its rule's default, else the SARIF default 'warning'."""
+    return result.get('level') or rule_levels.get(result.get('ruleId'), 'warning')
+
+
+def result_uri(result):
+    locations = result.get('locations')
+    if not locations:
+        return None
+    return locations[0].get('physicalLocation', {}).get('artifactLocation', {}).get('uri')
+
+
+class PathNode:
+    __slots__ = ('name', 'parent', 'children', 'counts', 'totals', 'is_file')
+
+    def __init__(self, name, parent, levels):
+        self.name = name
+        self.parent = parent
+        # Created on the first child; files never get one, which keeps 100k-file trees light on the garbage collector
+        self.children = None
+        # Findings located at this node itself, and including everything below it once rolled up
+        self.counts = [0] * levels
+        self.totals = self.counts
+        self.is_file = False
+
+    def path(self):
+        parts = []
+        node = self
+        while node.parent is not None:
+            parts.append(node.name)
+            node = node.parent
+        return '/'.join(reversed(parts))
+
+
+class PathTrie:
+    """Findings counted by severity at every file and directory of a source tree."""
+
+    def __init__(self, levels=SARIF_LEVELS):
+        self.levels = tuple(levels)
+        self.level_index = {level: index for index, level in enumerate(self.levels)}
+        self.root = PathNode('', None, len(self.levels))
+        self.files = {}
+        self.rolled_up = False
+
+    def file_node(self, path):
+        node = self.files.get(path)
+        if node is not None:
+            return node
+        parts = path[7:] if path.startswith('file://') else path
+        node = self.root
+        for part in parts.split('/'):
+            if not part or part == '.':
+                continue
+            if node.children is None:
+                node.children = {}
+            child = node.children.get(part)
+            if child is None:
+                child = node.children[part] = PathNode(part, node, len(self.levels))
+            node = child
+        node.is_file = True
+        self.files[path] = node
+        return node
+
+    def add(self, path, level):
+        """Count one finding at path; levels outside the trie's list count as the last one."""
+        index = self.level_index.get(level, len(self.levels) - 1)
+        self.file_node(path).counts[index] += 1
+        self.rolled_up = False
+
+    def rollup(self):
+        """Sum file tallies into every ancestor directory (iteratively, so deep trees cannot overflow the stack)."""
+        order = []
+        stack = [self.root]
+        while stack:
+            node = stack.pop()
+            if node.children:
+                order.append(node)
+                stack.extend(node.children.values())
+        # Children come after their parent in order, so walking it backwards finishes every child first
+        for node in reversed(order):
+            totals = list(node.counts)
+            for child in node.children.values():
+                for index, count in enumerate(child.totals):
+                    totals[index] += count
+            node.totals = totals
+        self.rolled_up = True
+
+    def _rank(self, node):
+        # Most findings of the highest level first, then the next level, and so on
+        return tuple(-count for count in node.totals)
+
+    def hotspot_files(self, top_n):
+        if not self.rolled_up:
+            self.rollup()
+        # Spellings of one path such as './a' and 'a' share a node
+        nodes = {id(node): (path, node) for path, node in self.files.items()}.values()
+        return [node for _, node in heapq.nsmallest(top_n, nodes, key=lambda item: (self._rank(item[1]), item[0]))]
+
+    def hotspot_directories(self, top_n):
+        """Directories with the most severe findings.
+
+        A directory whose findings all sit in one child is skipped, so a
+        chain of single-entry directories is listed once, at its deepest level.
+        """
+        if not self.rolled_up:
+            self.rollup()
+        candidates = []
+        stack = list((self.root.children or {}).values())
+        while stack:
+            node = stack.pop()
+            if not node.children:
+                continue
+            stack.extend(node.children.values())
+            total = sum(node.totals)
+            if total and all(sum(child.totals) != total for child in node.children.values()):
+                candidates.append(node)
+        return heapq.nsmallest(top_n, candidates, key=lambda node: (self._rank(node), node.path()))
+
+    def format_markdown(self, top_n=10, heading='##'):
+        """Markdown lines with the top-N hotspot directories and files."""
+        if not self.files or top_n <= 0:
+            return []
+        directories = self.hotspot_directories(top_n)
+        # Levels without a single finding get no column
+        shown = [index for index, count in enumerate(self.root.totals) if count]
+        header = "| Path | " + " | ".join(self.levels[index].title() for index in shown) + " | Total |"
+        # Rows are ordered by the most severe level first (see _rank), not by the total
+        ranked = [self.levels[index] for index in shown]
+        ranking = f"ranked by {ranked[0]} count" + (f", then {', '.join(ranked[1:])}" if len(ranked) > 1 else "")
+        divider = "|------|" + "|".join("------" for _ in shown) + "|-------|"
+
+        def rows(nodes, suffix):
+            return [f"| `{node.path()}{suffix}` | " + " | ".join(str(node.totals[index]) for index in shown)
+                    + f" | {sum(node.totals)} |" for node in nodes]
+
+        lines = []
+        if directories:
+            lines.extend([f"\n{heading} Hotspot Directories ({ranking})", "", header, divider])
+            lines.extend(rows(directories, '/'))
+        file_count = len({id(node) for node in self.files.values()})
+        lines.extend([f"\n{heading} Hotspot Files ({file_count} files with findings, {ranking})", "", header, divider])
+        lines.extend(rows(self.hotspot_files(top_n), ''))
+        return lines
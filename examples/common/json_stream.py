@@ -0,0 +1,107 @@
+"""
+Streaming JSON pull parser for reports too large to load whole.
+
+The document is read in chunks and decoded value by value with
+json.JSONDecoder.raw_decode, so objects and arrays can be walked lazily
+while only the value being decoded is held in memory.
+"""
+
+import json
+
+# Characters read per refill while streaming the document
+STREAM_CHUNK_SIZE = 1 << 16
+
+
+class JsonStream:
+    """Pull parser over a JSON file: objects and arrays can be walked lazily, any value decoded whole."""
+
+    def __init__(self, f, chunk_size=STREAM_CHUNK_SIZE):
+        self.f = f
+        self.chunk_size = chunk_size
+        self.decoder = json.JSONDecoder()
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+
+    def _fill(self, size=None):
+        chunk = self.f.read(size or self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        # Drop what has been consumed so the buffer only holds the pending value
+        self.buffer = self.buffer[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self):
+        """Return the next non-whitespace character without consuming it ('' at end of input)."""
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in " \t\r\n":
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self._fill():
+                return ""
+
+    def _expect(self, char):
+        if self.peek() != char:
+            raise ValueError(f"Expected '{char}' in the JSON document")
+        self.pos += 1
+
+    def value(self):
+        """Decode the next value whole."""
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+                # A value that runs to the end of the buffer may be a truncated number
+                if end < len(self.buffer) or self.eof:
+                    self.pos = end
+                    return value
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            # Read at least as much again as is pending, so a large value is re-parsed a logarithmic number of times
+            self._fill(max(self.chunk_size, len(self.buffer) - self.pos))
+
+    def members(self):
+        """Yield the keys of the next object; the caller consumes each member's value before the next key."""
+        self._expect("{")
+        if self.peek() == "}":
+            self.pos += 1
+            return
+        while True:
+            key = self.value()
+            self._expect(":")
+            yield key
+            if self.peek() == ",":
+                self.pos += 1
+            else:
+                self._expect("}")
+                return
+
+    def items(self):
+        """Step through the next array; the caller consumes each element before the next step."""
+        self._expect("[")
+        if self.peek() == "]":
+            self.pos += 1
+            return
+        while True:
+            yield
+            if self.peek() == ",":
+                self.pos += 1
+            else:
+                self._expect("]")
+                return
+
+    def read(self, array_handlers):
+        """Pass every element of the arrays named in array_handlers to its handler; return the other members."""
+        members = {}
+        for key in self.members():
+            handler = array_handlers.get(key)
+            if handler is not None and self.peek() == "[":
+                for _ in self.items():
+                    handler(self.value())
+            else:
+                members[key] = self.value()
+        return members
@@ -7,32 +7,117 @@ This script converts OWASP Dependency Check JSON reports to readable markdown fo
 for better integration with documentation and reporting systems.
 """
 
+import argparse
+import hashlib
 import json
 import sys
 import os
+import time
 from datetime import datetime
-from typing import Dict, List, Any, Optional
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Any, Optional, Tuple
 
+# Shared helpers live in examples/common; a copy placed next to this script is found first
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'common'))
 
-class DependencyCheckMarkdownConverter:
-    """Converts Dependency Check JSON reports to markdown format."""
+import cvss3
+
+
+# Bump when the layout of a rendered dependency section changes so stale
+# cached fragments are never spliced into a new report.
+SECTION_CACHE_VERSION = 2
+
+# evidenceCollected keys, in the order their lists are rendered
+EVIDENCE_TYPES = [
+    ('productEvidence', 'Product Evidence'),
+    ('vendorEvidence', 'Vendor Evidence'),
+    ('versionEvidence', 'Version Evidence'),
+]
+
+
+def literal_evidence(ev: Any) -> str:
+    """Text of an evidence entry that is not an object."""
+    return ev if isinstance(ev, str) else json.dumps(ev)
+
+
+class EvidenceTable:
+    """Interns identical evidence entries across all dependencies.
     
-    def __init__(self, json_file_path: str):
-        """Initialize the converter with a JSON report file."""
-        self.json_file_path = json_file_path
-        self.report_data = self._load_json_report()
+    Used as the ``object_hook`` while loading the report: the entries of every
+    evidence list are replaced by the id of their (name, value, source,
+    confidence) tuple, so each distinct entry is held in memory once no
+    matter how many jars repeat it. Entries that are not objects are interned
+    as literals with only a value. Ids follow the order of first appearance.
+    """
     
-    def _load_json_report(self) -> Dict[str, Any]:
-        """Load and parse the JSON report file."""
+    def __init__(self):
+        self.ids: Dict[Tuple[str, str, str, str], int] = {}
+        self.entries: List[Tuple[str, str, str, str]] = []
+        self.occurrences: List[int] = []
+    
+    def __call__(self, obj: Dict[str, Any]) -> Dict[str, Any]:
+        for key, _ in EVIDENCE_TYPES:
+            entries = obj.get(key)
+            if isinstance(entries, list):
+                obj[key] = [self.intern(ev) for ev in entries]
+        return obj
+    
+    def intern(self, ev: Any) -> int:
+        """Return the id of an evidence entry, adding it to the table when new."""
+        if isinstance(ev, dict):
+            entry = (ev.get('name', 'N/A'), ev.get('value', 'N/A'), ev.get('source', 'N/A'), ev.get('confidence', 'N/A'))
+        else:
+            entry = ('N/A', literal_evidence(ev), 'N/A', 'N/A')
+        index = self.ids.get(entry)
+        if index is None:
+            index = self.ids[entry] = len(self.entries)
+            self.entries.append(entry)
+            self.occurrences.append(0)
+        self.occurrences[index] += 1
+        return index
+    
+    @staticmethod
+    def label(index: int) -> str:
+        """Reference label of an interned entry, as shown in dependency sections and the appendix."""
+        return f"E{index + 1}"
+    
+    def format_appendix(self) -> str:
+        """Render every distinct evidence entry once as a table."""
+        markdown = "## Evidence Appendix\n\n"
+        markdown += f"{len(self.entries)} distinct evidence entries, referenced {sum(self.occurrences)} times.\n\n"
+        markdown += "| ID | Name | Value | Source | Confidence | Occurrences |\n"
+        markdown += "|----|------|-------|--------|------------|-------------|\n"
+        for index, (name, value, source, confidence) in enumerate(self.entries):
+            cells = [str(field).replace('|', '\\|').replace('\n', ' ') for field in (name, value, source, confidence)]
+            markdown += f"| {self.label(index)} | " + " | ".join(cells) + f" | {self.occurrences[index]} |\n"
+        return markdown
+
+
+class DependencySectionRenderer:
+    """Renders the markdown section of a single dependency.
+    
+    Kept separate from the converter so worker processes only receive the
+    renderer and their slice of dependencies, never the whole report.
+    """
+    
+    def __init__(self, cvss_context: Optional[str] = None, compact_evidence: bool = False):
+        """Optionally rescore CVSS vectors under a deployment context such as 'E:P/RL:O/CR:H'.
+        
+        With compact_evidence, evidence lists hold EvidenceTable ids and are
+        rendered as references into the appendix.
+        """
+        self.cvss_context = cvss_context
+        self.compact_evidence = compact_evidence
+    
+    def _rescored_cvss(self, cvss: Dict[str, Any]) -> str:
+        """Environmental score of a vulnerability's CVSS v3 vector under the deployment context."""
+        vector = cvss3.vector_from_fields(cvss)
+        if vector is None:
+            return "N/A"
         try:
-            with open(self.json_file_path, 'r', encoding='utf-8') as file:
-                return json.load(file)
-        except FileNotFoundError:
-            print(f"Error: Report file '{self.json_file_path}' not found.")
-            sys.exit(1)
-        except json.JSONDecodeError as e:
-            print(f"Error: Invalid JSON in report file: {e}")
-            sys.exit(1)
+            return self._format_cvss_score(cvss3.rescore(vector, self.cvss_context).environmental)
+        except ValueError:
+            return "N/A"
     
     def _format_cvss_score(self, score: Optional[float]) -> str:
         """Format CVSS score with color coding."""
@@ -71,13 +156,26 @@ class DependencyCheckMarkdownConverter:
         if not vulnerabilities:
             return "No vulnerabilities found."
         
-        table = "| CVE ID | Severity | CVSS Score | Description | References |\n"
-        table += "|--------|----------|------------|-------------|------------|\n"
+        if self.cvss_context:
+            table = "| CVE ID | Severity | CVSS Score | Rescored CVSS | Description | References |\n"
+            table += "|--------|----------|------------|---------------|-------------|------------|\n"
+        else:
+            table = "| CVE ID | Severity | CVSS Score | Description | References |\n"
+            table += "|--------|----------|------------|-------------|------------|\n"
         
         for vuln in vulnerabilities:
             cve_id = vuln.get('name', 'N/A')
             severity = vuln.get('severity', 'Unknown')
-            cvss_score = self._format_cvss_score(vuln.get('cvssv3', {}).get('baseScore'))
+            cvss = vuln.get('cvssv3', {})
+            base_score = cvss.get('baseScore')
+            vector = cvss3.vector_from_fields(cvss) if base_score is None else None
+            if vector:
+                # Reports without a stored base score can still be scored from the vector
+                try:
+                    base_score = cvss3.score_vector(vector).base
+                except ValueError:
+                    pass
+            cvss_score = self._format_cvss_score(base_score)
             description = vuln.get('description', 'No description available')
             # Truncate description if too long
             if len(description) > 100:
@@ -87,98 +185,265 @@ class DependencyCheckMarkdownConverter:
             if len(references) > 50:
                 references = references[:47] + "..."
             
-            table += f"| {cve_id} | {severity} | {cvss_score} | {description} | {references} |\n"
+            if self.cvss_context:
+                table += f"| {cve_id} | {severity} | {cvss_score} | {self._rescored_cvss(cvss)} | {description} | {references} |\n"
+            else:
+                table += f"| {cve_id} | {severity} | {cvss_score} | {description} | {references} |\n"
         
         return table
     
+    def _format_evidence(self, evidence: Dict[str, List[Any]]) -> str:
+        """Format the product, vendor and version evidence of a dependency."""
+        markdown = "#### Evidence Collected\n\n"
+        for key, title in EVIDENCE_TYPES:
+            entries = evidence.get(key, [])
+            if not entries:
+                continue
+            if self.compact_evidence:
+                markdown += f"**{title}:** " + ", ".join(EvidenceTable.label(index) for index in entries) + "\n\n"
+                continue
+            markdown += f"**{title}:**\n"
+            for ev in entries:
+                if not isinstance(ev, dict):
+                    markdown += f"- {literal_evidence(ev)}\n"
+                    continue
+                name = ev.get('name', 'N/A')
+                value = ev.get('value', 'N/A')
+                confidence = ev.get('confidence', 'N/A')
+                source = ev.get('source', 'N/A')
+                markdown += f"- **{name}:** {value} (Confidence: {confidence}, Source: {source})\n"
+            markdown += "\n"
+        return markdown
+    
+    def format_dependency(self, dep: Dict[str, Any]) -> str:
+        """Format a single dependency section with its vulnerabilities."""
+        markdown = ""
+        
+        file_path = dep.get('filePath', 'Unknown')
+        file_name = dep.get('fileName', 'Unknown')
+        is_virtual = dep.get('isVirtual', False)
+        
+        markdown += f"### {file_name}\n\n"
+        markdown += f"- **File Path:** `{file_path}`\n"
+        markdown += f"- **Is Virtual:** {is_virtual}\n"
+        
+        # Add SHA information
+        md5 = dep.get('md5', 'N/A')
+        sha1 = dep.get('sha1', 'N/A')
+        sha256 = dep.get('sha256', 'N/A')
+        
+        markdown += f"- **MD5:** `{md5}`\n"
+        markdown += f"- **SHA1:** `{sha1}`\n"
+        markdown += f"- **SHA256:** `{sha256}`\n"
+        
+        # Add all packages
+        packages = dep.get('packages', [])
+        if packages:
+            markdown += "\n#### Packages\n\n"
+            for i, pkg in enumerate(packages, 1):
+                pkg_id = pkg.get('id', 'Unknown')
+                confidence = pkg.get('confidence', 'N/A')
+                markdown += f"**Package {i}:**\n"
+                markdown += f"- **ID:** `{pkg_id}`\n"
+                markdown += f"- **Confidence:** {confidence}\n"
+                markdown += "\n"
+        
+        # Add evidence collected
+        evidence = dep.get('evidenceCollected', {})
+        if evidence:
+            markdown += self._format_evidence(evidence)
+        
+        vulnerabilities = dep.get('vulnerabilities', [])
+        if vulnerabilities:
+            markdown += f"#### Vulnerabilities Found: {len(vulnerabilities)}\n\n"
+            markdown += self._format_vulnerability_table(vulnerabilities)
+        else:
+            markdown += "#### Vulnerabilities Found: 0\n\n"
+        
+        markdown += "\n---\n\n"
+        
+        return markdown
+
+
+def _render_dependency_chunk(renderer: DependencySectionRenderer,
+                             chunk: List[Dict[str, Any]]) -> Tuple[int, float, List[str]]:
+    """Render a chunk of dependencies in a worker process."""
+    started = time.perf_counter()
+    fragments = [renderer.format_dependency(dep) for dep in chunk]
+    return os.getpid(), time.perf_counter() - started, fragments
+
+
+class DependencyCheckMarkdownConverter:
+    """Converts Dependency Check JSON reports to markdown format."""
+    
+    def __init__(self, json_file_path: str, incremental: bool = False, workers: int = 1,
+                 cvss_context: Optional[str] = None, compact_evidence: bool = False):
+        """Initialize the converter with a JSON report file."""
+        self.json_file_path = json_file_path
+        self.incremental = incremental
+        self.workers = max(1, workers)
+        # Evidence is interned while the report is parsed, before it can pile up as per-entry dicts
+        self.evidence_table = EvidenceTable() if compact_evidence else None
+        self.report_data = self._load_json_report()
+        self.renderer = DependencySectionRenderer(cvss_context, compact_evidence)
+        self.worker_stats: Dict[int, Dict[str, float]] = {}
+        # Populated by save_markdown() when incremental mode is enabled
+        self.section_cache: Optional[Dict[str, Dict[str, Any]]] = None
+        self.rendered_sections: Dict[str, Dict[str, Any]] = {}
+        self.incremental_stats: Dict[str, Any] = {}
+    
+    def _load_json_report(self) -> Dict[str, Any]:
+        """Load and parse the JSON report file."""
+        try:
+            with open(self.json_file_path, 'r', encoding='utf-8') as file:
+                return json.load(file, object_hook=self.evidence_table)
+        except FileNotFoundError:
+            print(f"Error: Report file '{self.json_file_path}' not found.")
+            sys.exit(1)
+        except json.JSONDecodeError as e:
+            print(f"Error: Invalid JSON in report file: {e}")
+            sys.exit(1)
+    
     def _format_dependency_details(self, dependencies: List[Dict[str, Any]]) -> str:
         """Format dependency details with vulnerabilities."""
         if not dependencies:
             return "No dependencies analyzed."
         
-        markdown = ""
+        if self.section_cache is not None:
+            return self._format_dependency_details_incremental(dependencies)
         
-        for dep in dependencies:
-            file_path = dep.get('filePath', 'Unknown')
-            file_name = dep.get('fileName', 'Unknown')
-            is_virtual = dep.get('isVirtual', False)
-            
-            markdown += f"### {file_name}\n\n"
-            markdown += f"- **File Path:** `{file_path}`\n"
-            markdown += f"- **Is Virtual:** {is_virtual}\n"
-            
-            # Add SHA information
-            md5 = dep.get('md5', 'N/A')
-            sha1 = dep.get('sha1', 'N/A')
-            sha256 = dep.get('sha256', 'N/A')
-            
-            markdown += f"- **MD5:** `{md5}`\n"
-            markdown += f"- **SHA1:** `{sha1}`\n"
-            markdown += f"- **SHA256:** `{sha256}`\n"
-            
-            # Add all packages
-            packages = dep.get('packages', [])
-            if packages:
-                markdown += "\n#### Packages\n\n"
-                for i, pkg in enumerate(packages, 1):
-                    pkg_id = pkg.get('id', 'Unknown')
-                    confidence = pkg.get('confidence', 'N/A')
-                    markdown += f"**Package {i}:**\n"
-                    markdown += f"- **ID:** `{pkg_id}`\n"
-                    markdown += f"- **Confidence:** {confidence}\n"
-                    markdown += "\n"
-            
-            # Add evidence collected
-            evidence = dep.get('evidenceCollected', {})
-            if evidence:
-                markdown += "#### Evidence Collected\n\n"
-                
-                # Product evidence
-                product_evidence = evidence.get('productEvidence', [])
-                if product_evidence:
-                    markdown += "**Product Evidence:**\n"
-                    for ev in product_evidence:
-                        name = ev.get('name', 'N/A')
-                        value = ev.get('value', 'N/A')
-                        confidence = ev.get('confidence', 'N/A')
-                        source = ev.get('source', 'N/A')
-                        markdown += f"- **{name}:** {value} (Confidence: {confidence}, Source: {source})\n"
-                    markdown += "\n"
-                
-                # Vendor evidence
-                vendor_evidence = evidence.get('vendorEvidence', [])
-                if vendor_evidence:
-                    markdown += "**Vendor Evidence:**\n"
-                    for ev in vendor_evidence:
-                        name = ev.get('name', 'N/A')
-                        value = ev.get('value', 'N/A')
-                        confidence = ev.get('confidence', 'N/A')
-                        source = ev.get('source', 'N/A')
-                        markdown += f"- **{name}:** {value} (Confidence: {confidence}, Source: {source})\n"
-                    markdown += "\n"
-                
-                # Version evidence
-                version_evidence = evidence.get('versionEvidence', [])
-                if version_evidence:
-                    markdown += "**Version Evidence:**\n"
-                    for ev in version_evidence:
-                        name = ev.get('name', 'N/A')
-                        value = ev.get('value', 'N/A')
-                        confidence = ev.get('confidence', 'N/A')
-                        source = ev.get('source', 'N/A')
-                        markdown += f"- **{name}:** {value} (Confidence: {confidence}, Source: {source})\n"
-                    markdown += "\n"
+        fragments, _ = self._render_sections(dependencies)
+        return "".join(fragments)
+    
+    def _render_sections(self, dependencies: List[Dict[str, Any]]) -> Tuple[List[str], List[float]]:
+        """Render dependency sections in order, returning fragments and per-section render times."""
+        if self.workers == 1 or len(dependencies) < 2:
+            fragments = []
+            timings = []
+            for dep in dependencies:
+                started = time.perf_counter()
+                fragments.append(self.renderer.format_dependency(dep))
+                timings.append(time.perf_counter() - started)
+            return fragments, timings
+        
+        # Several chunks per worker keep the pool busy when section sizes vary
+        chunk_size = max(1, -(-len(dependencies) // (self.workers * 4)))
+        chunks = [dependencies[i:i + chunk_size] for i in range(0, len(dependencies), chunk_size)]
+        
+        fragments = []
+        timings = []
+        with ProcessPoolExecutor(max_workers=self.workers) as pool:
+            # map() yields results in submission order, so sections stay in report order
+            results = pool.map(_render_dependency_chunk, [self.renderer] * len(chunks), chunks)
+            for chunk, (pid, elapsed, chunk_fragments) in zip(chunks, results):
+                fragments.extend(chunk_fragments)
+                timings.extend([elapsed / len(chunk)] * len(chunk))
+                stats = self.worker_stats.setdefault(pid, {'sections': 0, 'seconds': 0.0})
+                stats['sections'] += len(chunk)
+                stats['seconds'] += elapsed
+        return fragments, timings
+    
+    def _dependency_key(self, dep: Dict[str, Any]) -> str:
+        """Return the stable key identifying a dependency across builds."""
+        return dep.get('filePath') or dep.get('fileName', 'Unknown')
+    
+    def _dependency_fingerprint(self, dep: Dict[str, Any]) -> str:
+        """Fingerprint the inputs that determine a dependency's rendered section."""
+        digest = hashlib.sha256()
+        # Sections rendered under another CVSS context have different rescored columns
+        digest.update(json.dumps(self.renderer.cvss_context).encode('utf-8'))
+        sha256 = dep.get('sha256')
+        if sha256:
+            # The artifact hash pins packages and evidence, so only the
+            # identity fields and the vulnerability list can still change.
+            identity = [sha256, dep.get('fileName'), dep.get('filePath'), dep.get('isVirtual', False)]
+            digest.update(json.dumps(identity).encode('utf-8'))
+            if self.renderer.compact_evidence:
+                # Evidence ids depend on the rest of the report, not on the artifact
+                digest.update(json.dumps(dep.get('evidenceCollected', {})).encode('utf-8'))
+            digest.update(json.dumps(dep.get('vulnerabilities', []), sort_keys=True).encode('utf-8'))
+        else:
+            # Virtual dependencies have no artifact hash; fingerprint everything
+            # (in compact mode this covers the evidence ids as well)
+            digest.update(json.dumps(dep, sort_keys=True).encode('utf-8'))
+        return digest.hexdigest()
+    
+    def _format_dependency_details_incremental(self, dependencies: List[Dict[str, Any]]) -> str:
+        """Re-render only changed dependency sections, splicing cached fragments for the rest."""
+        fragments: List[Optional[str]] = []
+        keys = []
+        fingerprints = []
+        stale = []
+        reused = 0
+        saved_seconds = 0.0
+        
+        for index, dep in enumerate(dependencies):
+            key = self._dependency_key(dep)
+            fingerprint = self._dependency_fingerprint(dep)
+            cached = self.section_cache.get(key)
+            keys.append(key)
+            fingerprints.append(fingerprint)
             
-            vulnerabilities = dep.get('vulnerabilities', [])
-            if vulnerabilities:
-                markdown += f"#### Vulnerabilities Found: {len(vulnerabilities)}\n\n"
-                markdown += self._format_vulnerability_table(vulnerabilities)
+            if cached and cached.get('fingerprint') == fingerprint:
+                fragments.append(cached['fragment'])
+                elapsed = cached.get('renderSeconds', 0.0)
+                self.rendered_sections[key] = {
+                    'fingerprint': fingerprint,
+                    'fragment': cached['fragment'],
+                    'renderSeconds': elapsed,
+                }
+                reused += 1
+                saved_seconds += elapsed
             else:
-                markdown += "#### Vulnerabilities Found: 0\n\n"
-            
-            markdown += "\n---\n\n"
+                fragments.append(None)
+                stale.append(index)
         
-        return markdown
+        rendered, timings = self._render_sections([dependencies[index] for index in stale])
+        for index, fragment, elapsed in zip(stale, rendered, timings):
+            fragments[index] = fragment
+            self.rendered_sections[keys[index]] = {
+                'fingerprint': fingerprints[index],
+                'fragment': fragment,
+                'renderSeconds': elapsed,
+            }
+        
+        self.incremental_stats = {
+            'total': len(dependencies),
+            'reused': reused,
+            'rendered': len(stale),
+            'render_seconds': sum(timings),
+            'saved_seconds': saved_seconds,
+        }
+        return "".join(fragments)
+    
+    def _section_cache_path(self, output_file: str) -> str:
+        """Return the path of the section cache stored next to the markdown output."""
+        return f"{output_file}.sections.json"
+    
+    def _load_section_cache(self, cache_file: str) -> Dict[str, Dict[str, Any]]:
+        """Load cached dependency sections from a previous run, if compatible."""
+        try:
+            with open(cache_file, 'r', encoding='utf-8') as file:
+                cache = json.load(file)
+        except FileNotFoundError:
+            return {}
+        except (json.JSONDecodeError, OSError) as e:
+            print(f"Warning: Ignoring unreadable section cache '{cache_file}': {e}")
+            return {}
+        
+        if cache.get('version') != SECTION_CACHE_VERSION:
+            print(f"Warning: Section cache '{cache_file}' is from an older layout, re-rendering all sections.")
+            return {}
+        return cache.get('sections', {})
+    
+    def _save_section_cache(self, cache_file: str) -> None:
+        """Persist the fingerprints and fragments rendered in this run."""
+        cache = {'version': SECTION_CACHE_VERSION, 'sections': self.rendered_sections}
+        try:
+            with open(cache_file, 'w', encoding='utf-8') as file:
+                json.dump(cache, file)
+        except OSError as e:
+            print(f"Warning: Could not write section cache '{cache_file}': {e}")
     
     def generate_summary(self) -> str:
         """Generate a summary section of the report."""
@@ -278,6 +543,9 @@ class DependencyCheckMarkdownConverter:
             markdown += "\n## Dependencies Analysis\n\n"
             markdown += self._format_dependency_details(dependencies)
         
+        if self.evidence_table is not None and self.evidence_table.entries:
+            markdown += "\n" + self.evidence_table.format_appendix()
+        
         # Footer
         markdown += "\n---\n\n"
         
@@ -292,6 +560,11 @@ class DependencyCheckMarkdownConverter:
                 base_name = base_name[:-7]  # Remove "-report"
             output_file = f"{base_name}-report.md"
         
+        cache_file = None
+        if self.incremental:
+            cache_file = self._section_cache_path(output_file)
+            self.section_cache = self._load_section_cache(cache_file)
+        
         markdown_content = self.generate_report()
         
         try:
@@ -303,6 +576,9 @@ class DependencyCheckMarkdownConverter:
             with open(output_file, 'w', encoding='utf-8') as file:
                 file.write(markdown_content)
             print(f"Markdown report saved to: {output_file}")
+            if cache_file:
+                self._save_section_cache(cache_file)
+                self._print_incremental_stats()
             return output_file
         except PermissionError as e:
             print(f"Permission denied: {e}")
@@ -320,21 +596,65 @@ class DependencyCheckMarkdownConverter:
         except Exception as e:
             print(f"Error saving markdown file: {e}")
             return None
+    
+    def print_worker_stats(self) -> None:
+        """Print per-worker rendering throughput for parallel runs."""
+        for pid, stats in sorted(self.worker_stats.items()):
+            seconds = stats['seconds']
+            rate = stats['sections'] / seconds if seconds > 0 else float('inf')
+            print(f"Worker {pid}: {int(stats['sections'])} sections in {seconds:.3f}s ({rate:.0f} sections/s)")
+    
+    def _print_incremental_stats(self) -> None:
+        """Print how many dependency sections were reused from the cache."""
+        stats = self.incremental_stats
+        if not stats:
+            return
+        print(f"Incremental sections: {stats['reused']}/{stats['total']} reused, "
+              f"{stats['rendered']} re-rendered in {stats['render_seconds']:.3f}s "
+              f"(saved ~{stats['saved_seconds']:.3f}s)")
 
 
 def main():
     """Main function to run the converter."""
-    if len(sys.argv) < 2:
-        print("Usage: python markdown-converter.py <json-report-file> [output-markdown-file]")
-        print("Example: python markdown-converter.py dependency-check-report.json")
-        sys.exit(1)
+    parser = argparse.ArgumentParser(
+        description="Convert an OWASP Dependency Check JSON report to markdown.",
+        epilog="Example: python markdown-converter.py dependency-check-report.json",
+    )
+    parser.add_argument('json_file', help="Dependency Check JSON report")
+    parser.add_argument('output_file', nargs='?', default=None, help="Output markdown file")
+    parser.add_argument('--incremental', action='store_true',
+                        help="Reuse unchanged dependency sections cached next to the previous output")
+    parser.add_argument('--workers', type=int, default=1,
+                        help="Render dependency sections in this many worker processes (default: 1)")
+    parser.add_argument('--cvss-context', default=None,
+                        help="Rescore CVSS v3 vectors with these temporal/environmental metrics, e.g. E:P/RL:O/CR:H/MAV:L")
+    parser.add_argument('--compact-evidence', action='store_true',
+                        help="Render each distinct evidence entry once in an appendix and reference it by id")
+    parser.add_argument('--cvss-stats', action='store_true',
+                        help="Print CVSS vector cache hit rates after the conversion")
+    args = parser.parse_args()
+    
+    if args.cvss_context:
+        try:
+            cvss3.parse_context(args.cvss_context)
+        except ValueError as e:
+            print(f"Error: {e}")
+            sys.exit(1)
     
-    json_file = sys.argv[1]
-    output_file = sys.argv[2] if len(sys.argv) > 2 else None
+    json_file = args.json_file
+    output_file = args.output_file
     
     try:
-        converter = DependencyCheckMarkdownConverter(json_file)
+        converter = DependencyCheckMarkdownConverter(json_file, incremental=args.incremental,
+                                                     workers=args.workers, cvss_context=args.cvss_context,
+                                                     compact_evidence=args.compact_evidence)
         output_path = converter.save_markdown(output_file)
+        converter.print_worker_stats()
+        if args.cvss_stats:
+            # Worker processes keep their own caches, so these cover the main process only
+            for name, stats in cvss3.cache_stats().items():
+                print(f"CVSS cache {name}: {stats['hits']} hits, {stats['misses']} misses "
+                      f"({stats['hit_rate']:.1%} hit rate)")
         
         if output_path:
             print(f"\nConversion completed successfully!")
@@ -1,13 +1,107 @@
+import argparse
+import heapq
 import json
+import os
 import sys
+from concurrent.futures import ProcessPoolExecutor
 
-def generate_markdown_report(dive_output):
+# Number of files and directories listed in the report tables
+DEFAULT_TOP_K = 25
+# Deepest directory level reported in the per-directory rollup
+DEFAULT_MAX_DEPTH = 4
+# Wasteful files each image contributes to the fleet analysis; bounds memory per image
+DEFAULT_FILES_PER_IMAGE = 5000
+
+
+def reclaimable_bytes(count, size):
+    """Bytes freed by keeping one copy of a file.
+
+    Dive's sizeBytes is already the total across all copies (it is what
+    inefficientBytes sums), so every copy but one is reclaimable.
+    """
+    if count < 2:
+        return 0
+    return size * (count - 1) // count
+
+
+class PathTrie:
+    """Directory trie that rolls reclaimable bytes up to every parent directory."""
+
+    __slots__ = ('children', 'wasted_bytes', 'file_count')
+
+    def __init__(self):
+        self.children = {}
+        self.wasted_bytes = 0
+        self.file_count = 0
+
+    def add(self, path, wasted_bytes):
+        # Each component is visited once, so inserts are linear in path length
+        node = self
+        node.wasted_bytes += wasted_bytes
+        node.file_count += 1
+        for part in path.strip('/').split('/')[:-1]:
+            child = node.children.get(part)
+            if child is None:
+                child = node.children[part] = PathTrie()
+            child.wasted_bytes += wasted_bytes
+            child.file_count += 1
+            node = child
+
+    def iter_directories(self, max_depth, prefix='', depth=0):
+        """Yield (directory, wasted_bytes, file_count) down to max_depth.
+
+        Directories whose only content is a single subdirectory are skipped,
+        since their totals would just repeat the subdirectory's.
+        """
+        if depth >= max_depth:
+            return
+        for name, child in self.children.items():
+            path = f"{prefix}/{name}"
+            only_child = next(iter(child.children.values())) if len(child.children) == 1 else None
+            if only_child is None or only_child.file_count != child.file_count:
+                yield path, child.wasted_bytes, child.file_count
+            yield from child.iter_directories(max_depth, path, depth + 1)
+
+
+def analyze_file_references(file_references, top_k=DEFAULT_TOP_K, max_depth=DEFAULT_MAX_DEPTH):
+    """Compute reclaimable bytes per file, the top-K wasteful files and per-directory rollups in one pass."""
+    trie = PathTrie()
+    top_files = []
+
+    for index, file_ref in enumerate(file_references):
+        path = file_ref.get('file', 'N/A')
+        count = file_ref.get('count', 0) or 0
+        size = file_ref.get('sizeBytes', 0) or 0
+        wasted_bytes = reclaimable_bytes(count, size)
+
+        trie.add(path, wasted_bytes)
+        # The index breaks ties so the heap never has to compare paths
+        entry = (wasted_bytes, -index, path, count, size)
+        if len(top_files) < top_k:
+            heapq.heappush(top_files, entry)
+        elif entry > top_files[0]:
+            heapq.heapreplace(top_files, entry)
+
+    top_files.sort(reverse=True)
+    top_directories = heapq.nlargest(top_k, trie.iter_directories(max_depth), key=lambda d: d[1])
+
+    return {
+        'file_count': trie.file_count,
+        'wasted_bytes': trie.wasted_bytes,
+        'top_files': [(path, count, size, wasted) for wasted, _, path, count, size in top_files],
+        'top_directories': top_directories,
+    }
+
+
+def generate_markdown_report(dive_output, top_k=DEFAULT_TOP_K, max_depth=DEFAULT_MAX_DEPTH):
     image_info = dive_output.get('image', {})
 
     size_bytes = image_info.get('sizeBytes', 'N/A')
     inefficient_bytes = image_info.get('inefficientBytes', 'N/A')
     efficiency_score = image_info.get('efficiencyScore', 'N/A')
 
+    analysis = analyze_file_references(image_info.get('fileReference', []), top_k, max_depth)
+
     markdown_report = f"""
 ## Dive Analysis Report
 
@@ -17,31 +111,196 @@ def generate_markdown_report(dive_output):
 
 **Efficiency Score:** `{efficiency_score}`
 
+**Files With Inefficiencies:** `{analysis['file_count']}`
+
+**Reclaimable Bytes:** `{analysis['wasted_bytes']} bytes`
+
+Inefficient bytes count every copy of a duplicated file; reclaimable bytes count every copy but one.
+
+---
+### Top {top_k} Wasteful Files
+This section lists the files contributing the most reclaimable bytes to the image, sorted by reclaimable bytes.
+
+| File Path | Copies | Size of All Copies (Bytes) | Reclaimable (Bytes) |
+| :-------- | :----- | :------------------------- | :------------------ |
+"""
+
+    lines = [f"| {path} | {count} | {size} | {wasted} |\n" for path, count, size, wasted in analysis['top_files']]
+    markdown_report += "".join(lines)
+
+    markdown_report += f"""
+---
+### Top {top_k} Directories by Reclaimable Bytes
+Reclaimable bytes are rolled up to every parent directory, down to a depth of {max_depth}.
+
+| Directory | Files | Reclaimable (Bytes) |
+| :-------- | :---- | :------------------ |
+"""
+
+    lines = [f"| {path}/ | {files} | {wasted} |\n" for path, wasted, files in analysis['top_directories']]
+    markdown_report += "".join(lines)
+
+    markdown_report += "\n---"
+    return markdown_report
+
+def summarize_image(input_file, files_per_image=DEFAULT_FILES_PER_IMAGE):
+    """Load one Dive JSON output and reduce it to a bounded summary for the fleet report.
+
+    A file that cannot be read or is not Dive output yields a summary with an
+    'error' key instead, so one bad image does not abort the fleet run.
+    """
+    image = os.path.splitext(os.path.basename(input_file))[0]
+    try:
+        with open(input_file, 'r') as file:
+            dive_output = json.load(file)
+        if not isinstance(dive_output, dict) or not isinstance(dive_output.get('image', {}), dict):
+            raise ValueError("not a Dive JSON output")
+        image_info = dive_output.get('image', {})
+        file_references = image_info.get('fileReference', []) or []
+        wasted = ((reclaimable_bytes(ref.get('count', 0) or 0, ref.get('sizeBytes', 0) or 0), ref.get('file', 'N/A'))
+                  for ref in file_references)
+        top_files = heapq.nlargest(files_per_image, wasted)
+    except (OSError, ValueError, TypeError, AttributeError) as e:
+        return {'image': image, 'path': input_file, 'error': str(e)}
+
+    return {
+        'image': image,
+        'size_bytes': image_info.get('sizeBytes', 0) or 0,
+        'inefficient_bytes': image_info.get('inefficientBytes', 0) or 0,
+        'efficiency_score': image_info.get('efficiencyScore', 0) or 0,
+        'file_count': len(file_references),
+        'top_files': top_files,
+    }
+
+
+def analyze_fleet(input_files, workers=None, files_per_image=DEFAULT_FILES_PER_IMAGE):
+    """Summarize many images in worker processes and merge their wasted files by path."""
+    path_ids = {}
+    paths = []
+    image_counts = []
+    total_waste = []
+    images = []
+    failed = []
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        summaries = pool.map(summarize_image, input_files, [files_per_image] * len(input_files))
+        for summary in summaries:
+            if 'error' in summary:
+                print(f"Warning: Skipping {summary['path']}: {summary['error']}")
+                failed.append(summary)
+                continue
+            for waste, path in summary.pop('top_files'):
+                # Intern paths so files shared by many images are stored once
+                path_id = path_ids.get(path)
+                if path_id is None:
+                    path_id = path_ids[path] = len(paths)
+                    paths.append(path)
+                    image_counts.append(0)
+                    total_waste.append(0)
+                image_counts[path_id] += 1
+                total_waste[path_id] += waste
+            images.append(summary)
+
+    return images, paths, image_counts, total_waste, failed
+
+
+def generate_fleet_markdown_report(images, paths, image_counts, total_waste, top_k=DEFAULT_TOP_K, min_images=2,
+                                   failed=()):
+    shared = [path_id for path_id, count in enumerate(image_counts) if count >= min_images]
+    shared = heapq.nlargest(top_k, shared, key=lambda path_id: (image_counts[path_id], total_waste[path_id]))
+    ranked = sorted(images, key=lambda image: (image['efficiency_score'], -image['inefficient_bytes']))
+
+    markdown_report = f"""
+## Dive Fleet Analysis Report
+
+**Images Analyzed:** `{len(images)}`
+
+**Images Skipped:** `{len(failed)}`
+
+**Distinct Wasteful Files:** `{len(paths)}`
+
+**Files Wasted in {min_images}+ Images:** `{sum(1 for count in image_counts if count >= min_images)}`
+
+---
+### Files Wasted Across Many Images
+Files that are wasted in several images usually come from a shared base layer.
+
+| File Path | Images | Total Reclaimable (Bytes) |
+| :-------- | :----- | :------------------------ |
+"""
+
+    lines = [f"| {paths[path_id]} | {image_counts[path_id]} | {total_waste[path_id]} |\n" for path_id in shared]
+    markdown_report += "".join(lines)
+
+    markdown_report += """
 ---
-### File References
-This section lists the files contributing to inefficiencies in the image.
+### Image Efficiency Ranking
+Images are listed from least to most efficient.
 
-| File Path | Count | Size (Bytes) |
-| :-------- | :---- | :----------- |
+| Rank | Image | Efficiency Score | Image Size (Bytes) | Inefficient Bytes | Wasteful Files |
+| :--- | :---- | :--------------- | :----------------- | :---------------- | :------------- |
 """
 
-    file_references = image_info.get('fileReference', [])
-    for file_ref in file_references:
-        file_path = file_ref.get('file', 'N/A')
-        count = file_ref.get('count', 'N/A')
-        size = file_ref.get('sizeBytes', 'N/A')
-        markdown_report += f"| {file_path} | {count} | {size} |\n"
+    lines = [
+        f"| {rank} | {image['image']} | {image['efficiency_score']} | {image['size_bytes']} "
+        f"| {image['inefficient_bytes']} | {image['file_count']} |\n"
+        for rank, image in enumerate(ranked, 1)
+    ]
+    markdown_report += "".join(lines)
+
+    if failed:
+        markdown_report += """
+---
+### Skipped Images
+These files could not be read as Dive JSON output and are not part of the analysis.
+
+| File | Error |
+| :--- | :---- |
+"""
+        lines = [f"| {image['path']} | {image['error']} |\n" for image in failed]
+        markdown_report += "".join(lines)
 
     markdown_report += "\n---"
     return markdown_report
 
-def main(input_file):
+
+def expand_inputs(inputs):
+    """Expand directories into the Dive JSON files they contain."""
+    input_files = []
+    for path in inputs:
+        if os.path.isdir(path):
+            input_files.extend(sorted(os.path.join(path, name) for name in os.listdir(path) if name.endswith('.json')))
+        else:
+            input_files.append(path)
+    return input_files
+
+
+def main_fleet(inputs, top_k=DEFAULT_TOP_K, workers=None, files_per_image=DEFAULT_FILES_PER_IMAGE, min_images=2):
+    input_files = expand_inputs(inputs)
+    if not input_files:
+        print("Error: No Dive JSON files found")
+        sys.exit(1)
+
+    images, paths, image_counts, total_waste, failed = analyze_fleet(input_files, workers, files_per_image)
+    if not images:
+        print("Error: None of the Dive JSON files could be read")
+        sys.exit(1)
+    markdown_report = generate_fleet_markdown_report(images, paths, image_counts, total_waste, top_k, min_images,
+                                                     failed)
+
+    output_file = 'dive-fleet-analysis.md'
+    with open(output_file, 'w') as file:
+        file.write(markdown_report)
+
+    print(f"Fleet report for {len(images)} images generated successfully and saved to {output_file}!")
+
+def main(input_file, top_k=DEFAULT_TOP_K, max_depth=DEFAULT_MAX_DEPTH):
     # Read JSON input from a file
     with open(input_file, 'r') as file:
         dive_output = json.load(file)
 
     # Generate the Markdown report
-    markdown_report = generate_markdown_report(dive_output)
+    markdown_report = generate_markdown_report(dive_output, top_k, max_depth)
 
     # Define the output file path
     output_file = 'dive-analysis.md'
@@ -53,9 +312,25 @@ def main(input_file):
     print(f"Markdown report generated successfully and saved to {output_file}!")
 
 if __name__ == '__main__':
-    if len(sys.argv) != 2:
-        print("Usage: python dive_json_to_md.py <input_file>")
+    parser = argparse.ArgumentParser(description="Convert Dive JSON output to a markdown report.")
+    parser.add_argument('inputs', nargs='+', help="Dive JSON output (several files or directories with --fleet)")
+    parser.add_argument('--top', type=int, default=DEFAULT_TOP_K, help="Rows per table")
+    parser.add_argument('--max-depth', type=int, default=DEFAULT_MAX_DEPTH, help="Deepest directory level in the rollup")
+    parser.add_argument('--fleet', action='store_true', help="Compare many images in one report")
+    parser.add_argument('--workers', type=int, default=None, help="Worker processes for --fleet (default: CPU count)")
+    parser.add_argument('--files-per-image', type=int, default=DEFAULT_FILES_PER_IMAGE,
+                        help="Most wasteful files kept per image in --fleet mode")
+    parser.add_argument('--min-images', type=int, default=2, help="Images a file must be wasted in to be reported as shared")
+    args = parser.parse_args()
+
+    if args.top < 1:
+        print("Error: --top must be at least 1")
         sys.exit(1)
 
-    input_file = sys.argv[1]
-    main(input_file)
+    if args.fleet:
+        main_fleet(args.inputs, args.top, args.workers, args.files_per_image, args.min_images)
+    elif len(args.inputs) != 1:
+        print("Usage: python dive_json_to_md.py <input_file> (use --fleet for several images)")
+        sys.exit(1)
+    else:
+        main(args.inputs[0], args.top, args.max_depth)
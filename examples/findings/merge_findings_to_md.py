@@ -0,0 +1,432 @@
+#!/usr/bin/env python3
+"""
+Consolidated Vulnerability Findings Report
+
+This script maps the reports of several scanners that look at the same image
+(Trivy JSON, Dependabot alert export, OWASP Dependency-Check JSON and Anchore
+SARIF) into one finding model, deduplicates them by (advisory, package, version)
+and writes a single markdown report that keeps track of which scanners saw
+each finding.
+"""
+
+import argparse
+import json
+import re
+import sys
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Tuple
+from urllib.parse import unquote
+
+
+SEVERITY_ORDER = ['CRITICAL', 'HIGH', 'MEDIUM', 'LOW', 'UNKNOWN']
+SEVERITY_RANK = {severity: rank for rank, severity in enumerate(SEVERITY_ORDER)}
+
+# CVSS score to severity buckets used for SARIF `security-severity` values
+CVSS_RANGES = [
+    (9.0, 'CRITICAL'),
+    (7.0, 'HIGH'),
+    (4.0, 'MEDIUM'),
+    (0.1, 'LOW'),
+]
+
+SCANNERS = ['trivy', 'dependabot', 'depcheck', 'anchore']
+
+ADVISORY_ID_PATTERN = re.compile(r'^(CVE-\d{4}-\d+|GHSA(?:-[a-z0-9]{4}){3})-?(.*)$', re.IGNORECASE)
+ANCHORE_VERSION_PATTERN = re.compile(r'reports (\S+) at version (\S+)')
+
+# Longest title kept in the findings table
+MAX_TITLE_LENGTH = 80
+
+
+def normalize_severity(value) -> str:
+    """Map scanner-specific severity labels or CVSS scores to a common scale."""
+    if value is None:
+        return 'UNKNOWN'
+    if isinstance(value, (int, float)):
+        for threshold, severity in CVSS_RANGES:
+            if value >= threshold:
+                return severity
+        return 'UNKNOWN'
+    severity = str(value).strip().upper()
+    if severity == 'MODERATE':
+        return 'MEDIUM'
+    return severity if severity in SEVERITY_RANK else 'UNKNOWN'
+
+
+def normalize_package(name: Optional[str]) -> str:
+    """Normalize a package name so the same package matches across scanners."""
+    return (name or '').strip().lower()
+
+
+def parse_purl(purl: str) -> Tuple[str, Optional[str]]:
+    """Split a package URL into a scanner-neutral package name and its version.
+
+    Components are percent-decoded, so pkg:npm/%40scope/lib@1.0 gives ('@scope/lib', '1.0')
+    and joins the '@scope/lib' other scanners report.
+    """
+    body = purl.split('?', 1)[0].split('#', 1)[0]
+    if body.startswith('pkg:'):
+        body = body[4:]
+    package_type, _, path = body.partition('/')
+    namespace, _, name = path.rpartition('/')
+    # The version follows the last '@' of the name; an unencoded '@scope' namespace is not a version
+    name, _, version = name.partition('@')
+    namespace = '/'.join(unquote(part) for part in namespace.split('/')) if namespace else ''
+    name, version = unquote(name), unquote(version)
+    if namespace and package_type == 'maven':
+        # Dependabot and Trivy both report maven packages as group:artifact
+        name = f"{namespace}:{name}"
+    elif namespace:
+        name = f"{namespace}/{name}"
+    return name, version or None
+
+
+class Finding:
+    """A single vulnerability in a package version, possibly seen by several scanners."""
+
+    __slots__ = ('advisory_id', 'aliases', 'package', 'version', 'severity',
+                 'fixed_version', 'title', 'scanners')
+
+    def __init__(self, advisory_id: str, package: str, version: Optional[str]):
+        self.advisory_id = advisory_id
+        self.aliases = set()
+        self.package = package
+        self.version = version
+        self.severity = 'UNKNOWN'
+        self.fixed_version = None
+        self.title = None
+        self.scanners = set()
+
+    def absorb(self, scanner: str, severity: str, aliases=(), fixed_version=None, title=None) -> None:
+        """Merge one scanner's observation of this finding."""
+        self.scanners.add(scanner)
+        self.aliases.update(aliases)
+        if SEVERITY_RANK[severity] < SEVERITY_RANK[self.severity]:
+            self.severity = severity
+        if fixed_version and not self.fixed_version:
+            self.fixed_version = fixed_version
+        if title and not self.title:
+            self.title = title
+
+    def merge(self, other: 'Finding') -> None:
+        """Fold another observation of the same vulnerability into this one."""
+        for scanner in other.scanners:
+            self.absorb(scanner, other.severity, other.aliases, other.fixed_version, other.title)
+
+
+def advisory_preference(advisory_id: str) -> Tuple[bool, str]:
+    """Sort key choosing the canonical id of a set of aliases: a CVE if there is one, then the lowest id."""
+    return (not advisory_id.startswith('CVE-'), advisory_id)
+
+
+class FindingsStore:
+    """Deduplicating store of findings keyed by (canonical advisory, package, version).
+
+    Observations are first collected per advisory id exactly as reported, so
+    every insert is a constant number of dictionary lookups. Aliases link
+    advisory ids in a union-find, because a GHSA-only Trivy finding and the
+    Dependabot alert that names its CVE can arrive in any order. findings()
+    then resolves every id to the canonical advisory of its alias set (a CVE
+    when one is known) and merges in one linear pass. Scanners that do not
+    report an installed version (Dependabot) are joined onto every versioned
+    finding of the same advisory and package; without one they stay unversioned.
+    """
+
+    def __init__(self):
+        self._observed: Dict[Tuple[str, str, Optional[str]], Finding] = {}
+        self._parent: Dict[str, str] = {}
+        self.scanner_counts: Dict[str, int] = {scanner: 0 for scanner in SCANNERS}
+
+    def _root(self, advisory_id: str) -> str:
+        parent = self._parent.setdefault(advisory_id, advisory_id)
+        while parent != advisory_id:
+            # Path halving keeps alias chains short
+            grandparent = self._parent[parent]
+            self._parent[advisory_id] = grandparent
+            advisory_id, parent = parent, grandparent
+        return advisory_id
+
+    def _link(self, advisory_id: str, alias: str) -> None:
+        root, alias_root = self._root(advisory_id), self._root(alias)
+        if root != alias_root:
+            self._parent[alias_root] = root
+
+    def add(self, scanner: str, advisory_id: str, package: str, version: Optional[str],
+            severity: str, aliases=(), fixed_version=None, title=None) -> None:
+        """Record one finding reported by a scanner."""
+        advisory_id = advisory_id.upper()
+        aliases = [alias.upper() for alias in aliases if alias and alias.upper() != 'N/A']
+        package = normalize_package(package)
+        self.scanner_counts[scanner] += 1
+
+        if advisory_id != 'N/A':
+            for alias in aliases:
+                self._link(advisory_id, alias)
+
+        key = (advisory_id, package, version or None)
+        finding = self._observed.get(key)
+        if finding is None:
+            finding = self._observed[key] = Finding(advisory_id, package, version or None)
+        finding.absorb(scanner, severity, aliases, fixed_version, title)
+
+    def _canonical_ids(self) -> Dict[str, str]:
+        """Map every advisory id to the preferred id of its alias set."""
+        canonical: Dict[str, str] = {}
+        for advisory_id in self._parent:
+            root = self._root(advisory_id)
+            best = canonical.get(root)
+            if best is None or advisory_preference(advisory_id) < advisory_preference(best):
+                canonical[root] = advisory_id
+        return {advisory_id: canonical[self._root(advisory_id)] for advisory_id in self._parent}
+
+    def findings(self) -> List[Finding]:
+        """Return all deduplicated findings ordered by severity, advisory and package."""
+        canonical = self._canonical_ids()
+        groups: Dict[Tuple[str, str], Dict[Optional[str], Finding]] = {}
+        for (advisory_id, package, version), observed in self._observed.items():
+            advisory = canonical.get(advisory_id, advisory_id)
+            versions = groups.setdefault((advisory, package), {})
+            finding = versions.get(version)
+            if finding is None:
+                finding = versions[version] = Finding(advisory, package, version)
+            finding.merge(observed)
+            # Alias sets are global, so the ids an observation was filed under are aliases too
+            finding.aliases.add(advisory_id)
+
+        merged = []
+        for versions in groups.values():
+            unversioned = versions.pop(None, None) if len(versions) > 1 else None
+            for finding in versions.values():
+                if unversioned is not None:
+                    finding.merge(unversioned)
+                merged.append(finding)
+        merged.sort(key=lambda f: (SEVERITY_RANK[f.severity], f.advisory_id, f.package, f.version or ''))
+        return merged
+
+
+def iter_trivy_findings(report: Dict) -> Iterator[Dict]:
+    """Yield normalized findings from a Trivy JSON report."""
+    for result in report.get('Results') or []:
+        for vuln in result.get('Vulnerabilities') or []:
+            yield {
+                'advisory_id': vuln.get('VulnerabilityID', 'N/A'),
+                'package': vuln.get('PkgName'),
+                'version': vuln.get('InstalledVersion'),
+                'severity': normalize_severity(vuln.get('Severity')),
+                'aliases': vuln.get('VendorIDs') or [],
+                'fixed_version': vuln.get('FixedVersion'),
+                'title': vuln.get('Title'),
+            }
+
+
+def iter_dependabot_findings(report: Dict) -> Iterator[Dict]:
+    """Yield normalized findings from a Dependabot alert export."""
+    for alert in report.get('data', []):
+        cve_id = alert.get('cveId')
+        ghsa_id = alert.get('ghsaId')
+        if cve_id in (None, '', 'N/A'):
+            cve_id = None
+        if ghsa_id in (None, '', 'N/A'):
+            ghsa_id = None
+        patched_version = alert.get('patchedVersion')
+        yield {
+            'advisory_id': cve_id or ghsa_id or 'N/A',
+            'aliases': [ghsa_id] if cve_id and ghsa_id else [],
+            'package': alert.get('packageName'),
+            # Dependabot reports the vulnerable range, not the installed version
+            'version': None,
+            'severity': normalize_severity(alert.get('severity')),
+            'fixed_version': patched_version if patched_version != 'N/A' else None,
+            'title': alert.get('summary'),
+        }
+
+
+def iter_depcheck_findings(report: Dict) -> Iterator[Dict]:
+    """Yield normalized findings from an OWASP Dependency-Check JSON report."""
+    for dep in report.get('dependencies', []):
+        vulnerabilities = dep.get('vulnerabilities', [])
+        if not vulnerabilities:
+            continue
+        packages = dep.get('packages', [])
+        if packages:
+            package, version = parse_purl(packages[0].get('id', ''))
+        else:
+            package, version = dep.get('fileName', 'Unknown'), None
+        for vuln in vulnerabilities:
+            score = vuln.get('cvssv3', {}).get('baseScore')
+            yield {
+                'advisory_id': vuln.get('name', 'N/A'),
+                'package': package,
+                'version': version,
+                'severity': normalize_severity(vuln.get('severity') or score),
+                'title': (vuln.get('description') or '').split('\n', 1)[0] or None,
+            }
+
+
+def iter_anchore_findings(report: Dict) -> Iterator[Dict]:
+    """Yield normalized findings from an Anchore (Grype) SARIF report."""
+    for run in report.get('runs', []):
+        rules = {rule.get('id'): rule for rule in run.get('tool', {}).get('driver', {}).get('rules', [])}
+        for result in run.get('results', []):
+            rule_id = result.get('ruleId', '')
+            rule = rules.get(rule_id, {})
+            match = ADVISORY_ID_PATTERN.match(rule_id)
+            if match:
+                advisory_id, package = match.group(1), match.group(2) or None
+            else:
+                advisory_id, package = rule_id or 'N/A', None
+
+            message = result.get('message', {}).get('text', '')
+            version = None
+            version_match = ANCHORE_VERSION_PATTERN.search(message)
+            if version_match:
+                package = package or version_match.group(1)
+                version = version_match.group(2)
+
+            score = rule.get('properties', {}).get('security-severity')
+            try:
+                severity = normalize_severity(float(score))
+            except (TypeError, ValueError):
+                severity = 'UNKNOWN'
+            yield {
+                'advisory_id': advisory_id,
+                'package': package or 'Unknown',
+                'version': version,
+                'severity': severity,
+                'title': rule.get('shortDescription', {}).get('text'),
+            }
+
+
+ADAPTERS = {
+    'trivy': iter_trivy_findings,
+    'dependabot': iter_dependabot_findings,
+    'depcheck': iter_depcheck_findings,
+    'anchore': iter_anchore_findings,
+}
+
+
+def load_reports(store: FindingsStore, scanner: str, paths: List[str]) -> None:
+    """Load every report of one scanner type into the store."""
+    adapter = ADAPTERS[scanner]
+    for path in paths:
+        with open(path, 'r', encoding='utf-8') as file:
+            report = json.load(file)
+        for finding in adapter(report):
+            store.add(scanner, **finding)
+
+
+def cell(value) -> str:
+    """Escape a value for a markdown table cell."""
+    return str(value).replace('|', '\\|').replace('\r', ' ').replace('\n', ' ')
+
+
+def generate_markdown_report(store: FindingsStore) -> str:
+    """Render the consolidated findings as markdown."""
+    findings = store.findings()
+    used_scanners = [scanner for scanner in SCANNERS if store.scanner_counts[scanner]]
+
+    severity_counts = {severity: 0 for severity in SEVERITY_ORDER}
+    overlap_counts: Dict[int, int] = {}
+    for finding in findings:
+        severity_counts[finding.severity] += 1
+        seen_by = len(finding.scanners)
+        overlap_counts[seen_by] = overlap_counts.get(seen_by, 0) + 1
+
+    lines = [
+        "# Consolidated Vulnerability Report",
+        "",
+        f"**Generated on**: {datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S UTC')}",
+        "",
+        f"**Unique Findings**: {len(findings)}",
+        "",
+        "---",
+        "",
+        "## Overview of Vulnerabilities",
+        "",
+        "| Severity | Count |",
+        "| :------- | :---- |",
+    ]
+    for severity in SEVERITY_ORDER:
+        lines.append(f"| {severity} | {severity_counts[severity]} |")
+
+    lines.extend([
+        "",
+        "## Scanner Coverage",
+        "",
+        "| Scanner | Raw Findings |",
+        "| :------ | :----------- |",
+    ])
+    for scanner in used_scanners:
+        lines.append(f"| {scanner} | {store.scanner_counts[scanner]} |")
+
+    lines.extend([
+        "",
+        "| Seen By Scanners | Findings |",
+        "| :--------------- | :------- |",
+    ])
+    for seen_by in sorted(overlap_counts, reverse=True):
+        lines.append(f"| {seen_by} | {overlap_counts[seen_by]} |")
+
+    lines.extend([
+        "",
+        "---",
+        "",
+        "## Findings",
+        "",
+    ])
+    if not findings:
+        lines.append("No vulnerabilities were reported by any scanner.")
+    else:
+        lines.append("| Advisory | Aliases | Package | Version | Severity | Fixed Version | Title | Scanners |")
+        lines.append("| :------- | :------ | :------ | :------ | :------- | :------------ | :---- | :------- |")
+        for finding in findings:
+            aliases = ', '.join(sorted(finding.aliases - {finding.advisory_id})) or '-'
+            scanners = ', '.join(scanner for scanner in SCANNERS if scanner in finding.scanners)
+            title = finding.title or '-'
+            if len(title) > MAX_TITLE_LENGTH:
+                title = title[:MAX_TITLE_LENGTH - 3] + '...'
+            lines.append(
+                f"| {cell(finding.advisory_id)} | {cell(aliases)} | `{cell(finding.package)}` "
+                f"| {cell(finding.version or 'N/A')} | {finding.severity} | {cell(finding.fixed_version or 'N/A')} "
+                f"| {cell(title)} | {scanners} |"
+            )
+
+    lines.append("")
+    return '\n'.join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Merge Trivy, Dependabot, Dependency-Check and Anchore reports into one deduplicated markdown report."
+    )
+    parser.add_argument('--trivy', action='append', default=[], help="Trivy JSON report (repeatable)")
+    parser.add_argument('--dependabot', action='append', default=[], help="Dependabot alert export (repeatable)")
+    parser.add_argument('--depcheck', action='append', default=[], help="Dependency-Check JSON report (repeatable)")
+    parser.add_argument('--anchore', action='append', default=[], help="Anchore SARIF report (repeatable)")
+    parser.add_argument('-o', '--output', default='consolidated-findings.md', help="Output markdown file")
+    args = parser.parse_args()
+
+    inputs = {scanner: getattr(args, scanner) for scanner in SCANNERS}
+    if not any(inputs.values()):
+        parser.error("at least one scanner report is required")
+
+    store = FindingsStore()
+    try:
+        for scanner, paths in inputs.items():
+            load_reports(store, scanner, paths)
+    except FileNotFoundError as e:
+        print(f"Error: Input file '{e.filename}' not found.")
+        sys.exit(1)
+    except json.JSONDecodeError as e:
+        print(f"Error: Invalid JSON in input report: {e}")
+        sys.exit(1)
+
+    markdown_report = generate_markdown_report(store)
+    with open(args.output, 'w', encoding='utf-8') as file:
+        file.write(markdown_report)
+
+    print(f"Markdown report generated successfully and saved to {args.output}!")
+
+
+if __name__ == '__main__':
+    main()
@@ -7,14 +7,23 @@ This script converts CodeQL SARIF output files to readable Markdown format.
 It includes severity ratings, CVSS scores, and detailed analysis information.
 """
 
+import argparse
+import heapq
 import json
 import sys
 import logging
 from datetime import datetime
+from functools import lru_cache
 from typing import Dict, List, Optional, Any
 import platform
 import os
 
+# Shared helpers live in examples/common; a copy placed next to this script is found first
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'common'))
+
+import cvss3
+from hotspots import PathTrie
+
 class SeverityFormatter:
     """Handles severity-related formatting and conversions."""
 
@@ -29,20 +38,130 @@ class SeverityFormatter:
     def get_cvss_rating(cls, security_severity: Any) -> str:
         if not security_severity:
             return "N/A"
+        try:
+            return cls._cvss_rating(security_severity)
+        except TypeError:
+            # Unhashable values cannot be memoized
+            return str(security_severity)
+
+    @staticmethod
+    @lru_cache(maxsize=cvss3.CACHE_SIZE)
+    def _cvss_rating(security_severity: Any) -> str:
+        # Every result of a rule repeats its security-severity, so each distinct value is parsed once
         try:
             score = float(security_severity)
-            for threshold, rating in cls.CVSS_RANGES:
+            for threshold, rating in SeverityFormatter.CVSS_RANGES:
                 if score >= threshold:
                     return f"{rating} ({score})"
             return f"Low ({score})"
         except (ValueError, TypeError):
             return str(security_severity)
 
+    @staticmethod
+    def find_cvss_vector(properties: Dict[str, Any]) -> Optional[str]:
+        """A CVSS v3 vector carried in a rule's properties, under whatever key the query pack uses."""
+        for value in properties.values():
+            if isinstance(value, str) and value.startswith('CVSS:3'):
+                return value
+        return None
+
+    @classmethod
+    def get_rescored_rating(cls, vector: Optional[str], context: str) -> str:
+        """Rating of the environmental score of vector under the deployment context."""
+        if not vector:
+            return "N/A"
+        try:
+            score = cvss3.rescore(vector, context).environmental
+        except ValueError:
+            return "N/A"
+        return f"{cvss3.severity_rating(score)} ({score})"
+
+class ArtifactTable:
+    """Interned artifact URIs of a single SARIF run.
+
+    Results reference files either by ``artifactLocation.index`` into
+    ``run.artifacts`` or by ``artifactLocation.uri``. Both resolve to the same
+    slot here, so each distinct file is stored, formatted and counted once.
+    """
+
+    def __init__(self, run: Dict):
+        self.uris: List[str] = []
+        self.languages: List[Optional[str]] = []
+        # Location cells start with "`<uri>:", computed once per file instead of once per result
+        self.prefixes: List[str] = []
+        self.findings: List[int] = []
+        self.slots: Dict[str, int] = {}
+        self.index_slots: List[int] = []
+
+        for artifact in run.get('artifacts', []):
+            slot = self._slot(artifact.get('location', {}).get('uri', 'unknown'))
+            self.index_slots.append(slot)
+            if artifact.get('sourceLanguage') and not self.languages[slot]:
+                self.languages[slot] = artifact['sourceLanguage']
+
+        # CodeQL reports the language of extracted files through notifications located at artifact indexes
+        notifications = list(run.get('tool', {}).get('driver', {}).get('notifications', []))
+        for invocation in run.get('invocations', []):
+            notifications.extend(invocation.get('toolExecutionNotifications', []))
+        for notification in notifications:
+            lang = notification.get('properties', {}).get('languageDisplayName')
+            if not lang:
+                continue
+            for loc in notification.get('locations', []):
+                idx = loc.get('physicalLocation', {}).get('artifactLocation', {}).get('index')
+                if isinstance(idx, int) and 0 <= idx < len(self.index_slots):
+                    self.languages[self.index_slots[idx]] = lang
+
+    def _slot(self, uri: str) -> int:
+        slot = self.slots.get(uri)
+        if slot is None:
+            slot = self.slots[uri] = len(self.uris)
+            self.uris.append(sys.intern(uri))
+            self.languages.append(None)
+            self.prefixes.append(f"`{uri}:")
+            self.findings.append(0)
+        return slot
+
+    def resolve(self, artifact_location: Dict) -> int:
+        """Slot of the file an artifactLocation points at, preferring its index into run.artifacts."""
+        # SARIF uses -1 for "no index"
+        idx = artifact_location.get('index', -1)
+        if 0 <= idx < len(self.index_slots):
+            return self.index_slots[idx]
+        uri = artifact_location.get('uri', 'unknown')
+        slot = self.slots.get(uri)
+        return self._slot(uri) if slot is None else slot
+
+    def result_slot(self, result: Dict) -> Optional[int]:
+        """Slot of a result's primary location, or None when it has no location."""
+        locations = result.get('locations')
+        if not locations:
+            return None
+        return self.resolve(locations[0].get('physicalLocation', {}).get('artifactLocation', {}))
+
 class MarkdownBuilder:
-    def __init__(self, sarif_data: Dict):
+    # Files listed in Most Affected Files when the hotspot rollup is disabled
+    TOP_FILES = 10
+
+    def __init__(self, sarif_data: Dict, cvss_context: Optional[str] = None, top_n: int = 10):
         self.data = sarif_data
         self.formatter = SeverityFormatter()
+        self.cvss_context = cvss_context
+        self.top_n = top_n
         self.sections: List[str] = []
+        self._run_indexes: Dict[int, tuple] = {}
+
+    def _run_index(self, run: Dict) -> tuple:
+        """Rules by id and the artifact table of a run, built once and shared by every section."""
+        key = id(run)
+        if key not in self._run_indexes:
+            # Collect rules from driver and all extensions
+            rules = {rule['id']: rule for rule in run.get('tool', {}).get('driver', {}).get('rules', [])}
+            for ext in run.get('tool', {}).get('extensions', []):
+                for rule in ext.get('rules', []):
+                    rules[rule['id']] = rule
+            self._run_indexes[key] = (rules, ArtifactTable(run))
+        return self._run_indexes[key]
 
     def add_header(self) -> None:
         codeql_version = "unknown"
@@ -70,17 +189,12 @@ class MarkdownBuilder:
             f"- **Version**: {tool.get('semanticVersion', tool.get('version', 'N/A'))}",
         ])
 
-        # Map artifact index to language
-        artifact_lang = {}
-        for notification in tool.get('notifications', []):
-            lang = notification.get('properties', {}).get('languageDisplayName')
-            locations = notification.get('locations', [])
-            for loc in locations:
-                idx = loc.get('physicalLocation', {}).get('artifactLocation', {}).get('index')
-                if lang and idx is not None:
-                    artifact_lang[idx] = lang
-
-
+        # Artifact languages are resolved per run by ArtifactTable and reported in the summary
+        languages = set()
+        for run in self.data['runs']:
+            languages.update(lang for lang in self._run_index(run)[1].languages if lang)
+        if languages:
+            self.sections.append(f"- **Languages**: {', '.join(sorted(languages))}")
 
     def add_summary(self) -> None:
         severity_count = {
@@ -90,13 +204,13 @@ class MarkdownBuilder:
             'none': 0
         }
         total_issues = 0
+        file_counts: Dict[str, int] = {}
+        language_counts: Dict[str, int] = {}
+        hotspots = PathTrie()
 
         for run in self.data.get('runs', []):
-            # Collect rules from driver and all extensions
-            rules = {rule['id']: rule for rule in run.get('tool', {}).get('driver', {}).get('rules', [])}
-            for ext in run.get('tool', {}).get('extensions', []):
-                for rule in ext.get('rules', []):
-                    rules[rule['id']] = rule
+            rules, artifacts = self._run_index(run)
+            findings = artifacts.findings
 
             for result in run.get('results', []):
                 rule_id = result.get('ruleId', 'unknown')
@@ -107,6 +221,19 @@ class MarkdownBuilder:
                     severity_count[level] = 0
                 severity_count[level] += 1
                 total_issues += 1
+                slot = artifacts.result_slot(result)
+                if slot is not None:
+                    findings[slot] += 1
+                    if self.top_n > 0:
+                        hotspots.add(artifacts.uris[slot], level)
+
+            # Per-file tallies are kept by slot during the pass and folded into names once per file
+            for uri, lang, count in zip(artifacts.uris, artifacts.languages, findings):
+                if count:
+                    if self.top_n <= 0:
+                        file_counts[uri] = file_counts.get(uri, 0) + count
+                    lang = lang or 'Unknown'
+                    language_counts[lang] = language_counts.get(lang, 0) + count
 
         self.sections.extend([
             "\n## 📊 Analysis Summary",
@@ -118,6 +245,24 @@ class MarkdownBuilder:
             count = severity_count.get(severity, 0)
             self.sections.append(f"- **{severity.title()}**: {count}")
 
+        if set(language_counts) - {'Unknown'}:
+            self.sections.append("\n### Findings by Language")
+            for lang, count in sorted(language_counts.items(), key=lambda item: (-item[1], item[0])):
+                self.sections.append(f"- **{lang}**: {count}")
+
+        # Severity counts at every directory level, from the same pass
+        self.sections.extend(hotspots.format_markdown(self.top_n, '###'))
+
+        # Without the rollup, keep the plain per-file list
+        if file_counts:
+            top_files = heapq.nsmallest(self.TOP_FILES, file_counts.items(), key=lambda item: (-item[1], item[0]))
+            self.sections.extend([
+                f"\n### Most Affected Files ({len(file_counts)} files with findings)",
+                "\n| File | Findings |",
+                "|------|----------|",
+            ])
+            for uri, count in top_files:
+                self.sections.append(f"| `{uri}` | {count} |")
 
     def add_query_info(self) -> None:
         self.sections.append("\n## 📝 Query Information")
@@ -138,6 +283,11 @@ class MarkdownBuilder:
                         cvss = self.formatter.get_cvss_rating(properties['security-severity'])
                         self.sections.append(f"- **CVSS Score**: {cvss}")
 
+                    vector = self.formatter.find_cvss_vector(properties)
+                    if self.cvss_context and vector:
+                        rescored = self.formatter.get_rescored_rating(vector, self.cvss_context)
+                        self.sections.append(f"- **Rescored CVSS**: {rescored} (`{vector}` under `{self.cvss_context}`)")
+
                     severity = properties.get('problem.severity', 'none')
 
                     if 'tags' in properties:
@@ -148,18 +298,21 @@ class MarkdownBuilder:
                     self.sections.extend(['', description, ''])
 
     def add_findings(self) -> None:
-        self.sections.extend([
-            "\n## 🔍 Detailed Findings",
-            "\n| Severity | Query | Location | Description |",
-            "|----------|--------|-----------|-------------|"
-        ])
+        if self.cvss_context:
+            self.sections.extend([
+                "\n## 🔍 Detailed Findings",
+                "\n| Severity | Rescored CVSS | Query | Location | Description |",
+                "|----------|---------------|--------|-----------|-------------|"
+            ])
+        else:
+            self.sections.extend([
+                "\n## 🔍 Detailed Findings",
+                "\n| Severity | Query | Location | Description |",
+                "|----------|--------|-----------|-------------|"
+            ])
 
         for run in self.data.get('runs', []):
-            # Collect rules from driver and all extensions
-            rules = {rule['id']: rule for rule in run.get('tool', {}).get('driver', {}).get('rules', [])}
-            for ext in run.get('tool', {}).get('extensions', []):
-                for rule in ext.get('rules', []):
-                    rules[rule['id']] = rule
+            rules, artifacts = self._run_index(run)
 
             for result in run.get('results', []):
                 rule_id = result.get('ruleId', 'unknown')
@@ -170,24 +323,34 @@ class MarkdownBuilder:
                 rule_severity = rule.get('properties', {}).get('problem.severity', 'none')
                 severity = result.get('level', rule_severity)
 
-                location = self._format_location(result.get('locations', []))
+                location = self._format_location(result.get('locations', []), artifacts)
                 message = result.get('message', {}).get('text', 'No description available')
 
-                self.sections.append(
-                    f"| {severity.title()} | {rule_name} | {location} | {message} |"
-                )
-    def _format_location(self, locations: List[Dict]) -> str:
+                if self.cvss_context:
+                    vector = self.formatter.find_cvss_vector(rule.get('properties', {}))
+                    rescored = self.formatter.get_rescored_rating(vector, self.cvss_context)
+                    self.sections.append(
+                        f"| {severity.title()} | {rescored} | {rule_name} | {location} | {message} |"
+                    )
+                else:
+                    self.sections.append(
+                        f"| {severity.title()} | {rule_name} | {location} | {message} |"
+                    )
+    def _format_location(self, locations: List[Dict], artifacts: Optional[ArtifactTable] = None) -> str:
         if not locations:
             return "N/A"
         loc = locations[0].get('physicalLocation', {})
-        file_path = loc.get('artifactLocation', {}).get('uri', 'unknown')
+        artifact_location = loc.get('artifactLocation', {})
+        if artifacts is None:
+            prefix = f"`{artifact_location.get('uri', 'unknown')}:"
+        else:
+            prefix = artifacts.prefixes[artifacts.resolve(artifact_location)]
         region = loc.get('region', {})
         start_line = region.get('startLine', '?')
         end_line = region.get('endLine', start_line)
-        location = f"`{file_path}:{start_line}`"
         if start_line != end_line:
-            location += f"-`{end_line}`"
-        return location
+            return f"{prefix}{start_line}`-`{end_line}`"
+        return f"{prefix}{start_line}`"
 
 
     def build(self) -> str:
@@ -208,13 +371,25 @@ def main():
     setup_logging()
     logger = logging.getLogger(__name__)
 
-    if len(sys.argv) != 3:
-        logger.error("Incorrect number of arguments")
-        print("Usage: python sarif_to_markdown.py <input_sarif_file> <output_markdown_file>")
-        sys.exit(1)
-
-    input_file = sys.argv[1]
-    output_file = sys.argv[2]
+    parser = argparse.ArgumentParser(description="Convert a CodeQL SARIF file to Markdown.")
+    parser.add_argument('input_file', help="CodeQL SARIF file")
+    parser.add_argument('output_file', help="Markdown file to write")
+    parser.add_argument('--cvss-context', default=None,
+                        help="Rescore CVSS v3 vectors found in rule properties with these "
+                             "temporal/environmental metrics, e.g. E:P/RL:O/CR:H/MAV:L")
+    parser.add_argument('--top', type=int, default=10,
+                        help="Hotspot directories and files to list in the summary (default: 10, 0 disables the rollup)")
+    parser.add_argument('--cvss-stats', action='store_true', help="Log CVSS cache hit rates after the conversion")
+    args = parser.parse_args()
+
+    input_file = args.input_file
+    output_file = args.output_file
+    if args.cvss_context:
+        try:
+            cvss3.parse_context(args.cvss_context)
+        except ValueError as e:
+            logger.error(str(e))
+            sys.exit(1)
 
     try:
         logger.info(f"Reading SARIF file: {input_file}")
@@ -222,9 +397,16 @@ def main():
             sarif_data = json.load(f)
 
         logger.info("Converting SARIF to Markdown")
-        builder = MarkdownBuilder(sarif_data)
+        builder = MarkdownBuilder(sarif_data, args.cvss_context, args.top)
         markdown_content = builder.build()
 
+        if args.cvss_stats:
+            rating_info = SeverityFormatter._cvss_rating.cache_info()
+            logger.info(f"security-severity cache: {rating_info.hits} hits, {rating_info.misses} misses")
+            for name, stats in cvss3.cache_stats().items():
+                logger.info(f"CVSS cache {name}: {stats['hits']} hits, {stats['misses']} misses "
+                            f"({stats['hit_rate']:.1%} hit rate)")
+
         logger.info(f"Writing Markdown file: {output_file}")
         with open(output_file, 'w') as f:
             f.write(markdown_content)
@@ -1,6 +1,136 @@
+import argparse
 import json
+import os
 import sys
 
+# Shared helpers live in examples/common; a copy placed next to this script is found first
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'common'))
+
+from json_stream import JsonStream
+
+SEVERITY_LEVELS = ["critical", "high", "medium", "low", "unknown"]
+
+
+def iter_export_alerts(stream):
+    """Incrementally decode the alerts of one export without loading the whole document.
+
+    Supports a `{"data": [...]}` export as produced by the workflow, a bare array, and
+    several arrays written back to back (as `gh api --paginate` does).
+    """
+    while True:
+        char = stream.peek()
+        if char == "[":
+            for _ in stream.items():
+                yield stream.value()
+        elif char == "{":
+            for key in stream.members():
+                if key == "data" and stream.peek() == "[":
+                    for _ in stream.items():
+                        yield stream.value()
+                else:
+                    stream.value()
+        elif char == "":
+            return
+        else:
+            raise ValueError(f"Unexpected '{char}' in Dependabot export")
+
+
+def iter_dependabot_alerts(json_file_paths):
+    """Stream alerts from several exported pages/files one at a time."""
+    for json_file_path in json_file_paths:
+        with open(json_file_path, 'r') as f:
+            yield from iter_export_alerts(JsonStream(f))
+
+
+def rollup_dependabot_alerts(alerts):
+    """Single pass computing severity totals, per-ecosystem counts and per-package alert rows."""
+    severity_counts = dict.fromkeys(SEVERITY_LEVELS, 0)
+    ecosystems = {}
+    packages = {}
+
+    for alert in alerts:
+        severity = (alert.get("severity") or "unknown").lower()
+        if severity not in severity_counts:
+            severity = "unknown"
+        severity_counts[severity] += 1
+
+        ecosystem = alert.get("ecosystem") or "N/A"
+        counts = ecosystems.get(ecosystem)
+        if counts is None:
+            counts = ecosystems[ecosystem] = dict.fromkeys(SEVERITY_LEVELS, 0)
+        counts[severity] += 1
+
+        key = (ecosystem, alert.get("packageName") or "N/A")
+        package = packages.get(key)
+        if package is None:
+            package = packages[key] = (dict.fromkeys(SEVERITY_LEVELS, 0), [])
+        package[0][severity] += 1
+
+        advisory = alert.get("cveId")
+        if not advisory or advisory == "N/A":
+            advisory = alert.get("ghsaId") or "N/A"
+        advisory_url = alert.get("advisoryUrl")
+        if advisory_url and advisory_url != "N/A":
+            advisory = f"[{advisory}]({advisory_url})"
+        package[1].append((SEVERITY_LEVELS.index(severity), advisory, alert.get("vulnerableVersionRange", "N/A"),
+                           alert.get("patchedVersion", "N/A"), (alert.get("summary") or "").replace("|", "\\|")))
+
+    return severity_counts, ecosystems, packages
+
+
+def severity_sort_key(counts):
+    """Sort key ranking the most critical groups first."""
+    return tuple(-counts[level] for level in SEVERITY_LEVELS)
+
+
+def generate_grouped_dependabot_markdown_report(json_file_paths, artifact_name, scan_date, image_id, image_size):
+    """Compact report grouping alerts by package, streamed from one or more exported pages."""
+    severity_counts, ecosystems, packages = rollup_dependabot_alerts(iter_dependabot_alerts(json_file_paths))
+
+    parts = [f"""# Dependabot Vulnerability Report
+
+**Artifact Name:** `{artifact_name}`
+
+**Scan Date:** `{scan_date}`
+
+**Image ID:** `{image_id}`
+
+**Image Size:** `{image_size}`
+
+**Total Alerts:** `{sum(severity_counts.values())}` across `{len(packages)}` packages
+
+---
+
+## Overview of Vulnerabilities
+
+| Severity | Count |
+| ------ | ------ |
+"""]
+    parts.extend(f"| {level.upper()} | {severity_counts[level]} |\n" for level in SEVERITY_LEVELS)
+
+    parts.append("\n---\n\n## Alerts by Ecosystem\n\n")
+    parts.append("| Ecosystem | Critical | High | Medium | Low | Unknown | Total |\n")
+    parts.append("| :-------- | -------: | ---: | -----: | --: | ------: | ----: |\n")
+    for ecosystem, counts in sorted(ecosystems.items(), key=lambda item: severity_sort_key(item[1])):
+        parts.append(f"| {ecosystem} | " + " | ".join(str(counts[level]) for level in SEVERITY_LEVELS)
+                     + f" | {sum(counts.values())} |\n")
+
+    parts.append("\n---\n\n## Alerts by Package\n\n")
+    if not packages:
+        parts.append("No Dependabot alerts were found in the provided JSON.\n")
+    for (ecosystem, package_name), (counts, rows) in sorted(packages.items(), key=lambda item: severity_sort_key(item[1][0])):
+        summary = ", ".join(f"{counts[level]} {level}" for level in SEVERITY_LEVELS if counts[level])
+        parts.append(f"### `{package_name}` ({ecosystem}): {summary}\n\n")
+        parts.append("| Severity | Advisory | Vulnerable Range | Patched | Summary |\n")
+        parts.append("| :------- | :------- | :--------------- | :------ | :------ |\n")
+        rows.sort(key=lambda row: row[0])
+        parts.extend(f"| {SEVERITY_LEVELS[level].capitalize()} | {advisory} | `{vulnerable_range}` | `{patched}` | {summary} |\n"
+                     for level, advisory, vulnerable_range, patched, summary in rows)
+        parts.append("\n")
+
+    return "".join(parts)
+
+
 def generate_dependabot_markdown_report(json_file_path, artifact_name, scan_date, image_id, image_size):
     try:
         with open(json_file_path, 'r') as f:
@@ -85,25 +215,40 @@ def generate_dependabot_markdown_report(json_file_path, artifact_name, scan_date
     return markdown_output
 
 if __name__ == "__main__":
-    if len(sys.argv) != 7:
-        print("Usage: python markdown_helper.py <path_to_dependabot.json> <output_report.md> <artifact_name> <scan_date> <image_id> <image_size>")
-        sys.exit(1)
-
-    json_file_path = sys.argv[1]
-    output_markdown_path = sys.argv[2]
-    artifact_name = sys.argv[3]
-    scan_date = sys.argv[4]
-    image_id = sys.argv[5]
-    image_size = sys.argv[6]
-    
-    markdown_report = generate_dependabot_markdown_report(
-        json_file_path, 
-        artifact_name, 
-        scan_date,  
-        image_id, 
-        image_size
-    )
-    
+    parser = argparse.ArgumentParser(description="Generate a markdown report from exported Dependabot alerts.")
+    parser.add_argument('json_file_path', help="Dependabot alerts JSON ({\"data\": [...]})")
+    parser.add_argument('output_markdown_path', help="Markdown report to write")
+    parser.add_argument('artifact_name')
+    parser.add_argument('scan_date')
+    parser.add_argument('image_id')
+    parser.add_argument('image_size')
+    parser.add_argument('--grouped', action='store_true',
+                        help="Stream the alerts and render compact per-ecosystem and per-package rollups")
+    parser.add_argument('--page', action='append', default=[],
+                        help="Additional exported page/file of alerts, streamed after the first (implies --grouped)")
+    args = parser.parse_args()
+    output_markdown_path = args.output_markdown_path
+
+    if args.grouped or args.page:
+        json_file_paths = [args.json_file_path] + args.page
+        try:
+            markdown_report = generate_grouped_dependabot_markdown_report(
+                json_file_paths, args.artifact_name, args.scan_date, args.image_id, args.image_size)
+        except FileNotFoundError as e:
+            print(f"Error: The file '{e.filename}' was not found. Please ensure it exists.")
+            sys.exit(1)
+        except ValueError as e:
+            print(f"Error: Could not decode the Dependabot JSON export: {e}")
+            sys.exit(1)
+    else:
+        markdown_report = generate_dependabot_markdown_report(
+            args.json_file_path,
+            args.artifact_name,
+            args.scan_date,
+            args.image_id,
+            args.image_size
+        )
+
     try:
         with open(output_markdown_path, 'w') as outfile:
             outfile.write(markdown_report)
@@ -1,28 +1,23 @@
+import heapq
 import json
 import sys
 from datetime import datetime
 
 
-def calculate_test_statistics(test_report):
-    """Calculate test statistics from the test report"""
-    summary = test_report.get('testReport', {}).get('summary', {})
-    
-    total_tests = summary.get('totalTests', 0)
-    total_failures = summary.get('totalFailures', 0)
-    total_errors = summary.get('totalErrors', 0)
-    total_skipped = summary.get('totalSkipped', 0)
-    success_rate = summary.get('successRate', 0)
-    total_time = summary.get('totalTime', 0)
-    
-    return {
-        'total_tests': total_tests,
-        'total_failures': total_failures,
-        'total_errors': total_errors,
-        'total_skipped': total_skipped,
-        'success_rate': success_rate,
-        'total_time': total_time
-    }
+# Number of slowest tests listed in the report
+SLOWEST_TESTS_COUNT = 10
+
+# Positions of the per-class counters collected while rendering
+TESTS, FAILURES, ERRORS, SKIPPED, TIME, ROWS = range(6)
+STATUS_COUNTER = {'failed': FAILURES, 'error': ERRORS, 'skipped': SKIPPED}
 
+# Counters in the summary block, used when the tests carry no status
+SUMMARY_COUNTERS = [
+    ('total_tests', 'totalTests'),
+    ('total_failures', 'totalFailures'),
+    ('total_errors', 'totalErrors'),
+    ('total_skipped', 'totalSkipped'),
+]
 
 def get_test_status_color(status):
     """Get color indicator for test status"""
@@ -36,17 +31,94 @@ def get_test_status_color(status):
         return 'UNKNOWN'
 
 
-def group_tests_by_class(test_suites):
-    """Group tests by their class name"""
-    grouped_tests = {}
+def collect_test_results(test_suites, slowest_count=SLOWEST_TESTS_COUNT):
+    """Compute statistics and render per-class table rows in a single pass.
+    
+    Counts are taken from the individual tests so merged reports are reported
+    accurately; reconcile_with_summary() falls back to the summary block only
+    when no test carries a status.
+    The rendered table rows are kept per class because the report groups tests
+    by class, and the slowest tests are tracked with a bounded min-heap.
+    """
+    classes = {}
+    status_labels = {}
+    slowest = []
+    # Tests at or below this time cannot enter the heap once it is full
+    slowest_floor = float('-inf')
     
     for test in test_suites:
         class_name = test.get('class', 'Unknown')
-        if class_name not in grouped_tests:
-            grouped_tests[class_name] = []
-        grouped_tests[class_name].append(test)
+        status = test.get('status', 'unknown')
+        time = test.get('time', '0')
+        try:
+            seconds = float(time)
+        except (TypeError, ValueError):
+            seconds = 0.0
+        
+        totals = classes.get(class_name)
+        if totals is None:
+            totals = classes[class_name] = [0, 0, 0, 0, 0.0, []]
+        
+        label = status_labels.get(status)
+        if label is None:
+            label = status_labels[status] = f"{get_test_status_color(status)} {status}"
+        
+        totals[TESTS] += 1
+        totals[TIME] += seconds
+        counter = STATUS_COUNTER.get(status)
+        if counter is not None:
+            totals[counter] += 1
+        
+        test_name = test.get('name', 'Unknown')
+        totals[ROWS].append(f"| {test_name} | {label} | {time}s |\n")
+        
+        if seconds > slowest_floor:
+            entry = (seconds, test_name, class_name, time)
+            if len(slowest) < slowest_count:
+                heapq.heappush(slowest, entry)
+                if len(slowest) == slowest_count:
+                    slowest_floor = slowest[0][0]
+            else:
+                heapq.heapreplace(slowest, entry)
+                slowest_floor = slowest[0][0]
+    
+    stats = {
+        'total_tests': sum(totals[TESTS] for totals in classes.values()),
+        'total_failures': sum(totals[FAILURES] for totals in classes.values()),
+        'total_errors': sum(totals[ERRORS] for totals in classes.values()),
+        'total_skipped': sum(totals[SKIPPED] for totals in classes.values()),
+        'total_time': round(sum(totals[TIME] for totals in classes.values()), 3),
+    }
+    stats['success_rate'] = success_rate(stats)
+    slowest.sort(reverse=True)
     
-    return grouped_tests
+    return stats, classes, slowest
+
+
+def success_rate(stats):
+    total_tests = stats['total_tests']
+    passed = total_tests - stats['total_failures'] - stats['total_errors']
+    return round(passed * 100 / total_tests, 1) if total_tests else 0
+
+
+def reconcile_with_summary(stats, summary, tests_have_status):
+    """Use the summary block's counts only when the tests cannot provide them.
+    
+    Per-test tallies win whenever tests carry a status, since the summary of a
+    merged report can be stale or count tests twice. Mixing the two sources
+    counter by counter could also contradict itself (failures + passed > tests),
+    so the summary replaces all counters together when there are no testcases
+    or none of them records a status.
+    """
+    if tests_have_status:
+        return stats
+    for stat, key in SUMMARY_COUNTERS:
+        try:
+            stats[stat] = int(summary[key])
+        except (KeyError, TypeError, ValueError):
+            pass
+    stats['success_rate'] = success_rate(stats)
+    return stats
 
 
 def generate_markdown_report(junit_output):
@@ -57,14 +129,15 @@ def generate_markdown_report(junit_output):
     summary = test_report.get('summary', {})
     test_suites = test_report.get('testSuites', [])
     
-    # Calculate statistics
-    stats = calculate_test_statistics(junit_output)
+    # Calculate statistics and render class rows in one pass over the tests
+    stats, classes, slowest = collect_test_results(test_suites)
+    stats = reconcile_with_summary(stats, summary, any('status' in test for test in test_suites))
     
     # Get timestamp
     timestamp = summary.get('timestamp', datetime.now().isoformat())
     
     # Generate the markdown report
-    markdown_report = f"""# JUnit Test Results Report
+    parts = [f"""# JUnit Test Results Report
 
 **Generated:** `{timestamp}`
 
@@ -95,27 +168,31 @@ def generate_markdown_report(junit_output):
 
 ---
 
-## Test Results by Class
+## Slowest Tests
 
-"""
+| Test Name | Class | Execution Time |
+| :-------- | :---- | :------------- |
+"""]
     
-    # Group tests by class
-    grouped_tests = group_tests_by_class(test_suites)
+    for _, test_name, class_name, time in slowest:
+        parts.append(f"| {test_name} | {class_name} | {time}s |\n")
     
-    for class_name, tests in grouped_tests.items():
-        markdown_report += f"### {class_name}\n\n"
-        markdown_report += "| Test Name | Status | Execution Time |\n"
-        markdown_report += "| :-------- | :----- | :------------- |\n"
-        
-        for test in tests:
-            test_name = test.get('name', 'Unknown')
-            status = test.get('status', 'unknown')
-            time = test.get('time', '0')
-            status_icon = get_test_status_color(status)
-            
-            markdown_report += f"| {test_name} | {status_icon} {status} | {time}s |\n"
-        
-        markdown_report += "\n"
+    parts.append("""
+---
+
+## Test Results by Class
+
+""")
+    
+    for class_name, totals in classes.items():
+        parts.append(f"### {class_name}\n\n")
+        parts.append(f"**Tests:** {totals[TESTS]} | **Failed:** {totals[FAILURES]} | "
+                     f"**Errors:** {totals[ERRORS]} | **Skipped:** {totals[SKIPPED]} | "
+                     f"**Time:** {round(totals[TIME], 3)}s\n\n")
+        parts.append("| Test Name | Status | Execution Time |\n")
+        parts.append("| :-------- | :----- | :------------- |\n")
+        parts.extend(totals[ROWS])
+        parts.append("\n")
     
     # Add overall status summary
     if stats['success_rate'] == 100:
@@ -125,7 +202,7 @@ def generate_markdown_report(junit_output):
     else:
         overall_status = "Significant test failures detected."
     
-    markdown_report += f"""
+    parts.append(f"""
 ---
 
 ## Overall Status
@@ -133,29 +210,29 @@ def generate_markdown_report(junit_output):
 {overall_status}
 
 **Recommendations:**
-"""
+""")
     
     if stats['total_failures'] > 0 or stats['total_errors'] > 0:
-        markdown_report += f"""
+        parts.append(f"""
 - Review and fix {stats['total_failures'] + stats['total_errors']} failing tests
 - Investigate test failures in the affected classes
 - Consider adding more test coverage for failing scenarios
-"""
+""")
     
     if stats['total_skipped'] > 0:
-        markdown_report += f"""
+        parts.append(f"""
 - Review {stats['total_skipped']} skipped tests to ensure they are intentionally skipped
 - Consider enabling skipped tests if conditions are met
-"""
+""")
     
     if stats['success_rate'] == 100:
-        markdown_report += """
+        parts.append("""
 - All tests are passing! Consider adding more test coverage for edge cases
 - Review test execution time for optimization opportunities
-"""
+""")
     
-    markdown_report += "\n---\n"
-    return markdown_report
+    parts.append("\n---\n")
+    return "".join(parts)
 
 
 def main(input_file):
@@ -61,16 +61,22 @@ cat >> "$json_file" << EOF
     "testSuites": [
 EOF
 
-# Process each test case
+# Process each test case; awk reads the whole <testcase> element so the
+# <failure>, <error> and <skipped> children decide its status
 first_test=true
-grep '<testcase' "$xml_file" | while IFS= read -r line; do
-    # Extract test case attributes using grep and sed
-    testname=$(echo "$line" | grep -o 'name="[^"]*"' | head -1 | sed 's/name="\([^"]*\)"/\1/')
-    classname=$(echo "$line" | grep -o 'classname="[^"]*"' | head -1 | sed 's/classname="\([^"]*\)"/\1/')
-    time=$(echo "$line" | grep -o 'time="[0-9.]*"' | head -1 | sed 's/time="\([0-9.]*\)"/\1/')
-    
-
-    
+awk '
+function attr(line, key) {
+    if (match(line, " " key "=\"[^\"]*\"")) {
+        return substr(line, RSTART + length(key) + 3, RLENGTH - length(key) - 4)
+    }
+    return ""
+}
+/<testcase/ { name = attr($0, "name"); classname = attr($0, "classname"); time = attr($0, "time"); status = "passed"; open = 1 }
+open && /<failure/ { status = "failed" }
+open && /<error/ { status = "error" }
+open && /<skipped/ { status = "skipped" }
+open && (/<testcase[^>]*\/>/ || /<\/testcase>/) { printf "%s\037%s\037%s\037%s\n", name, classname, time, status; open = 0 }
+' "$xml_file" | while IFS=$'\037' read -r testname classname time status; do
     # Handle empty values
     testname=${testname:-"unknown"}
     classname=${classname:-"unknown"}
@@ -89,7 +95,7 @@ grep '<testcase' "$xml_file" | while IFS= read -r line; do
         "name": "$testname",
         "class": "$classname",
         "time": "$time",
-        "status": "passed"
+        "status": "$status"
       }
 EOF
 done
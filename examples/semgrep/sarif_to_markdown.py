@@ -1,13 +1,23 @@
+import argparse
 import json
+import os
+import sys
 from datetime import datetime
 
-def convert_sarif_to_markdown(input_file, output_file):
+# Shared helpers live in examples/common; a copy placed next to this script is found first
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'common'))
+
+from hotspots import PathTrie, result_level, result_uri
+
+
+def convert_sarif_to_markdown(input_file, output_file, top_n=10):
     """
     Converts a SARIF file to a Markdown file with tabular formatting for results.
 
     Args:
         input_file (str): Path to the input SARIF file.
         output_file (str): Path to the output Markdown file.
+        top_n (int): Number of hotspot directories and files to list (0 disables the rollup).
     """
     with open(input_file, 'r') as f:
         sarif_data = json.load(f)
@@ -18,11 +28,19 @@ def convert_sarif_to_markdown(input_file, output_file):
     markdown_lines.append(f"**Generated on**: {datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S UTC')}")
     markdown_lines.append("\n---\n")
 
+    # Hotspots are counted while the results are listed and inserted here once every run is read
+    hotspots = PathTrie()
+    hotspot_position = len(markdown_lines)
+
     # Process runs
     for run in sarif_data.get('runs', []):
         tool_name = run.get('tool', {}).get('driver', {}).get('name', 'Unknown Tool')
         tool_version = run.get('tool', {}).get('driver', {}).get('semanticVersion', 'Unknown Version')
         markdown_lines.append(f"## Tool: {tool_name} (Version: {tool_version})")
+        rule_levels = {
+            rule.get('id'): rule.get('defaultConfiguration', {}).get('level', 'warning')
+            for rule in run.get('tool', {}).get('driver', {}).get('rules', [])
+        }
 
         # Add results in tabular format
         markdown_lines.append("\n| Rule ID | Message |")
@@ -31,17 +49,23 @@ def convert_sarif_to_markdown(input_file, output_file):
             rule_id = result.get('ruleId', 'Unknown Rule')
             message = result.get('message', {}).get('text', 'No message provided').replace("\n", "<br>")
             markdown_lines.append(f"| {rule_id} | {message} |")
+            if top_n > 0:
+                uri = result_uri(result)
+                if uri:
+                    hotspots.add(uri, result_level(result, rule_levels))
+
+    markdown_lines[hotspot_position:hotspot_position] = hotspots.format_markdown(top_n)
 
     # Write to Markdown file
     with open(output_file, 'w') as f:
         f.write('\n'.join(markdown_lines))
 
 if __name__ == "__main__":
-    import sys
-    if len(sys.argv) != 3:
-        print("Usage: python sarif_to_markdown.py <input_sarif_file> <output_markdown_file>")
-        sys.exit(1)
-
-    input_sarif = sys.argv[1]
-    output_md = sys.argv[2]
-    convert_sarif_to_markdown(input_sarif, output_md)
+    parser = argparse.ArgumentParser(description="Convert a SARIF file to Markdown.")
+    parser.add_argument('input_sarif_file', help="SARIF file to convert")
+    parser.add_argument('output_markdown_file', help="Markdown file to write")
+    parser.add_argument('--top', type=int, default=10,
+                        help="Hotspot directories and files to list (default: 10, 0 disables the rollup)")
+    args = parser.parse_args()
+
+    convert_sarif_to_markdown(args.input_sarif_file, args.output_markdown_file, args.top)
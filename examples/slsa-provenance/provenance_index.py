@@ -0,0 +1,242 @@
+import argparse
+import json
+import os
+import sqlite3
+import sys
+import time
+
+from provenance_to_md import SLSA_V02, SLSA_V1, iter_predicate_files, resolve, split_statement
+
+DEFAULT_DB = 'provenance-index.db'
+# Predicates loaded per transaction during ingestion
+DEFAULT_BATCH_SIZE = 1000
+
+# Where each predicate version keeps the invocation id and the consumed artifacts
+INVOCATION_ID_PATHS = {
+    SLSA_V02: ('metadata', 'buildInvocationId'),
+    SLSA_V1: ('runDetails', 'metadata', 'invocationID'),
+}
+MATERIAL_PATHS = {
+    SLSA_V02: ('materials',),
+    SLSA_V1: ('buildDefinition', 'resolvedDependencies'),
+}
+# v0.2 materials use 'digest' per the spec, the Jenkins report reads 'digests'
+DIGEST_KEYS = ('digest', 'digests')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS builds (
+    id INTEGER PRIMARY KEY,
+    invocation_id TEXT NOT NULL UNIQUE,
+    predicate_type TEXT NOT NULL,
+    source TEXT
+);
+CREATE TABLE IF NOT EXISTS uris (
+    id INTEGER PRIMARY KEY,
+    uri TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS materials (
+    build_id INTEGER NOT NULL,
+    uri_id INTEGER NOT NULL,
+    algorithm TEXT NOT NULL,
+    digest TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS materials_by_build ON materials (build_id);
+"""
+# Lookup indexes; dropped during bulk ingestion and rebuilt in one sort afterwards
+LOOKUP_INDEXES = """
+CREATE INDEX IF NOT EXISTS materials_by_digest ON materials (digest);
+CREATE INDEX IF NOT EXISTS materials_by_uri ON materials (uri_id);
+"""
+
+
+def extract_materials(document, source=''):
+    """Return (invocation_id, version, [(uri, algorithm, digest), ...]) for one statement or predicate."""
+    version, predicate, _ = split_statement(document)
+    invocation_id = resolve(predicate, INVOCATION_ID_PATHS[version]) or source
+
+    materials = []
+    entries = resolve(predicate, MATERIAL_PATHS[version]) or []
+    if not isinstance(entries, list):
+        print(f"Skipping materials of {source or invocation_id}: expected a list, got {type(entries).__name__}")
+        entries = []
+    for position, material in enumerate(entries):
+        if not isinstance(material, dict):
+            print(f"Skipping material {position} of {source or invocation_id}: expected an object, "
+                  f"got {type(material).__name__}")
+            continue
+        uri = material.get('uri', '')
+        for key in DIGEST_KEYS:
+            digests = material.get(key)
+            if isinstance(digests, dict) and digests:
+                materials.extend((uri, algorithm, value) for algorithm, value in digests.items() if value)
+                break
+        else:
+            materials.append((uri, '', ''))
+    return str(invocation_id), version, materials
+
+
+class ProvenanceIndex:
+    """SQLite store of (build invocation, material URI, digest) rows with reverse lookup indexes."""
+
+    def __init__(self, db_path=DEFAULT_DB):
+        self.conn = sqlite3.connect(db_path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA + LOOKUP_INDEXES)
+        self.uri_ids = {}
+
+    def close(self):
+        self.conn.close()
+
+    def _intern_uris(self, uris):
+        missing = [uri for uri in uris if uri not in self.uri_ids]
+        if not missing:
+            return
+        self.conn.executemany("INSERT OR IGNORE INTO uris (uri) VALUES (?)", ((uri,) for uri in missing))
+        # Stay below SQLite's bound-parameter limit
+        for start in range(0, len(missing), 500):
+            chunk = missing[start:start + 500]
+            placeholders = ','.join('?' * len(chunk))
+            self.uri_ids.update(
+                (uri, uri_id) for uri_id, uri in
+                self.conn.execute(f"SELECT id, uri FROM uris WHERE uri IN ({placeholders})", chunk)
+            )
+
+    def add_batch(self, builds):
+        """Insert a batch of (invocation_id, version, source, materials) in one transaction.
+
+        Re-ingesting a build replaces its materials, so loading the same predicates twice is safe.
+        """
+        # Within a batch the last predicate of a build wins, as it would across batches
+        latest = {}
+        for build in builds:
+            latest.pop(build[0], None)
+            latest[build[0]] = build
+        builds = list(latest.values())
+        with self.conn:
+            self._intern_uris({uri for _, _, _, materials in builds for uri, _, _ in materials})
+            rows = []
+            for invocation_id, version, source, materials in builds:
+                self.conn.execute(
+                    "INSERT INTO builds (invocation_id, predicate_type, source) VALUES (?, ?, ?) "
+                    "ON CONFLICT (invocation_id) DO UPDATE SET predicate_type = excluded.predicate_type, "
+                    "source = excluded.source",
+                    (invocation_id, version, source))
+                build_id = self.conn.execute("SELECT id FROM builds WHERE invocation_id = ?",
+                                             (invocation_id,)).fetchone()[0]
+                self.conn.execute("DELETE FROM materials WHERE build_id = ?", (build_id,))
+                rows.extend((build_id, self.uri_ids[uri], algorithm, digest) for uri, algorithm, digest in materials)
+            self.conn.executemany("INSERT INTO materials (build_id, uri_id, algorithm, digest) VALUES (?, ?, ?, ?)", rows)
+
+    def ingest(self, paths, batch_size=DEFAULT_BATCH_SIZE, bulk=False):
+        """Load every predicate file under paths in batches; returns (builds, materials, skipped).
+
+        Maintaining the digest and URI indexes row by row dominates bulk loads, so for a bulk
+        load, or the first load into an empty index, they are dropped for the duration of the
+        load and rebuilt once at the end. Incremental loads keep them, so lookups stay indexed
+        and the existing history is not re-sorted.
+        """
+        empty = self.conn.execute("SELECT NOT EXISTS (SELECT 1 FROM materials)").fetchone()[0]
+        if not (bulk or empty):
+            return self._ingest_files(paths, batch_size)
+        self.conn.executescript("DROP INDEX IF EXISTS materials_by_digest; DROP INDEX IF EXISTS materials_by_uri;")
+        try:
+            return self._ingest_files(paths, batch_size)
+        finally:
+            self.conn.executescript(LOOKUP_INDEXES)
+
+    def _ingest_files(self, paths, batch_size):
+        build_count = material_count = skipped = 0
+        batch = []
+        for path in paths:
+            for predicate_file in iter_predicate_files(path):
+                try:
+                    with open(predicate_file, 'r') as f:
+                        document = json.load(f)
+                    invocation_id, version, materials = extract_materials(document, predicate_file)
+                except ValueError as e:
+                    print(f"Skipping {predicate_file}: {e}")
+                    skipped += 1
+                    continue
+                batch.append((invocation_id, version, predicate_file, materials))
+                build_count += 1
+                material_count += len(materials)
+                if len(batch) >= batch_size:
+                    self.add_batch(batch)
+                    batch = []
+        if batch:
+            self.add_batch(batch)
+        return build_count, material_count, skipped
+
+    def builds_by_digest(self, digest):
+        """Builds that consumed an artifact with this digest; accepts 'sha256:<hex>' or a bare hex digest."""
+        algorithm, _, value = digest.rpartition(':')
+        query = ("SELECT b.invocation_id, u.uri, m.algorithm, m.digest, b.source FROM materials m "
+                 "JOIN builds b ON b.id = m.build_id JOIN uris u ON u.id = m.uri_id WHERE m.digest = ?")
+        if algorithm:
+            return self.conn.execute(query + " AND m.algorithm = ?", (value, algorithm)).fetchall()
+        return self.conn.execute(query, (value,)).fetchall()
+
+    def builds_by_uri(self, uri):
+        """Builds that consumed the material with exactly this URI."""
+        return self.conn.execute(
+            "SELECT b.invocation_id, u.uri, m.algorithm, m.digest, b.source FROM uris u "
+            "JOIN materials m ON m.uri_id = u.id JOIN builds b ON b.id = m.build_id WHERE u.uri = ?",
+            (uri,)).fetchall()
+
+    def stats(self):
+        return {table: self.conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+                for table in ('builds', 'uris', 'materials')}
+
+
+def print_lookup(rows, elapsed):
+    print(f"Found {len(rows)} material record(s) in {elapsed * 1000:.3f} ms\n")
+    if rows:
+        print("| Build Invocation ID | Material URI | Digest | Predicate File |")
+        print("| :------------------ | :----------- | :----- | :------------- |")
+        for invocation_id, uri, algorithm, digest, source in rows:
+            print(f"| {invocation_id} | {uri} | {algorithm}: {digest} | {source} |")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Index SLSA provenance materials to find which builds consumed an artifact.")
+    parser.add_argument('--db', default=DEFAULT_DB, help=f"SQLite index file (default: {DEFAULT_DB})")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    ingest_parser = subparsers.add_parser('ingest', help="Load predicates or statements into the index")
+    ingest_parser.add_argument('inputs', nargs='+', help="Predicate JSON files or directories of them")
+    ingest_parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE, help="Predicates per transaction")
+    ingest_parser.add_argument('--bulk', action='store_true',
+                               help="Drop the lookup indexes during the load and rebuild them once at the end "
+                                    "(always done for an empty index)")
+
+    digest_parser = subparsers.add_parser('digest', help="Builds that consumed a digest (e.g. sha256:<hex>)")
+    digest_parser.add_argument('digest')
+
+    uri_parser = subparsers.add_parser('uri', help="Builds that consumed a material URI")
+    uri_parser.add_argument('uri')
+
+    subparsers.add_parser('stats', help="Row counts of the index")
+    args = parser.parse_args()
+
+    index = ProvenanceIndex(args.db)
+    try:
+        if args.command == 'ingest':
+            missing = [path for path in args.inputs if not os.path.exists(path)]
+            if missing:
+                print(f"Error: File not found at {missing[0]}")
+                sys.exit(1)
+            start = time.perf_counter()
+            builds, materials, skipped = index.ingest(args.inputs, args.batch_size, args.bulk)
+            elapsed = time.perf_counter() - start
+            print(f"Indexed {builds} build(s) with {materials} material record(s) in {elapsed:.2f}s"
+                  + (f", skipped {skipped}" if skipped else ""))
+        elif args.command == 'stats':
+            for table, count in index.stats().items():
+                print(f"{table}: {count}")
+        else:
+            start = time.perf_counter()
+            rows = index.builds_by_digest(args.digest) if args.command == 'digest' else index.builds_by_uri(args.uri)
+            print_lookup(rows, time.perf_counter() - start)
+    finally:
+        index.close()
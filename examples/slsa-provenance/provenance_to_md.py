@@ -0,0 +1,258 @@
+import argparse
+import json
+import os
+import sys
+import time
+
+SLSA_V02 = 'https://slsa.dev/provenance/v0.2'
+SLSA_V1 = 'https://slsa.dev/provenance/v1'
+
+# Field-path tables, one per predicate version. Paths are tuples resolved once per
+# predicate, so rendering a build is a flat walk over the table. Entry kinds:
+#   ('text', line)                   static line
+#   ('field', template, path)        template formatted with the value at path ('' if missing, 'None' if null)
+#   ('digest', template, paths)      digest line from the first path present, omitted when empty
+#   ('items', path)                  one '- **key**: `value`' line per entry of the mapping at path
+#   ('each', path, entries)          entries rendered for every element of the list at path
+#
+# The layouts match the Jenkins (v0.2) and GitLab (v1) json-to-md.py reports. v0.2 digests
+# are read from the spec's 'digest' key and the 'digests' key used by the Jenkins report.
+V02_LAYOUT = (
+    ('text', "## Predicate\n"),
+    ('text', "### Build Type"),
+    ('field', "- `{}`\n", ('buildType',)),
+    ('text', "### Builder"),
+    ('field', "- **ID**: `{}`\n", ('builder', 'id')),
+    ('text', "### Invocation\n"),
+    ('text', "#### Config Source"),
+    ('field', "- **URI**: `{}`", ('invocation', 'configSource', 'uri')),
+    ('field', "- **Entry Point**: `{}`", ('invocation', 'configSource', 'entryPoint')),
+    ('digest', "- **Digests**: `{}`", (('invocation', 'configSource', 'digest'), ('invocation', 'configSource', 'digests'))),
+    ('text', ""),
+    ('text', "#### Environment"),
+    ('field', "- **Build URL**: `{}`", ('invocation', 'environment', 'build_url')),
+    ('field', "- **Job URL**: `{}`", ('invocation', 'environment', 'job_url')),
+    ('field', "- **Node Name**: `{}`\n", ('invocation', 'environment', 'node_name')),
+    ('text', "### Metadata"),
+    ('field', "- **Build Invocation ID**: `{}`", ('metadata', 'buildInvocationId')),
+    ('field', "- **Build Started On**: `{}`", ('metadata', 'buildStartedOn')),
+    ('field', "- **Build Finished On**: `{}`", ('metadata', 'buildFinishedOn')),
+    ('field', "- **Reproducible**: `{}`\n", ('metadata', 'reproducible')),
+    ('text', "#### Completeness"),
+    ('field', "- **Parameters Complete**: `{}`", ('metadata', 'completeness', 'parametersComplete')),
+    ('field', "- **Environment Complete**: `{}`", ('metadata', 'completeness', 'environmentComplete')),
+    ('field', "- **Materials Complete**: `{}`\n", ('metadata', 'completeness', 'materialsComplete')),
+    ('text', "### Materials"),
+    ('each', ('materials',), (
+        ('field', "- **URI**: `{}`", ('uri',)),
+        ('digest', "- **Digests**: `{}`", (('digest',), ('digests',))),
+    )),
+)
+
+V1_LAYOUT = (
+    ('text', "## Predicate\n"),
+    ('text', "### Build Definition"),
+    ('field', "- **Build Type**: `{}`\n", ('buildDefinition', 'buildType')),
+    ('text', "#### External Parameters"),
+    ('field', "- **Entry Point**: `{}`", ('buildDefinition', 'externalParameters', 'entryPoint')),
+    ('field', "- **Source**: `{}`", ('buildDefinition', 'externalParameters', 'source')),
+    ('text', ""),
+    ('text', "#### Internal Parameters"),
+    ('items', ('buildDefinition', 'internalParameters')),
+    ('text', ""),
+    ('text', "#### Resolved Dependencies"),
+    ('each', ('buildDefinition', 'resolvedDependencies'), (
+        ('field', "- **URI**: `{}`", ('uri',)),
+        ('digest', "- **Digest**: `{}`", (('digest',),)),
+    )),
+    ('text', ""),
+    ('text', "### Run Details"),
+    ('field', "- **Builder ID**: `{}`", ('runDetails', 'builder', 'id')),
+    ('items', ('runDetails', 'builder', 'version')),
+    ('text', ""),
+    ('text', "#### Metadata"),
+    ('field', "- **Invocation ID**: `{}`", ('runDetails', 'metadata', 'invocationID')),
+    ('field', "- **Started On**: `{}`", ('runDetails', 'metadata', 'startedOn')),
+    ('field', "- **Finished On**: `{}`", ('runDetails', 'metadata', 'finishedOn')),
+    ('text', ""),
+)
+
+LAYOUTS = {SLSA_V02: V02_LAYOUT, SLSA_V1: V1_LAYOUT}
+
+
+def format_digests(digests):
+    if not isinstance(digests, dict):
+        return ""
+    sha1 = digests.get("sha1")
+    sha256 = digests.get("sha256")
+    if sha1 and sha256:
+        return f"sha1: {sha1}, sha256: {sha256}"
+    elif sha1:
+        return f"sha1: {sha1}"
+    elif sha256:
+        return f"sha256: {sha256}"
+    return ""
+
+
+def resolve(obj, path, default=None):
+    """Follow a tuple of keys through nested dicts, returning default when any step is missing."""
+    for key in path:
+        if not isinstance(obj, dict) or key not in obj:
+            return default
+        obj = obj[key]
+    return obj
+
+
+def split_statement(document):
+    """Return (version, predicate, subjects) for an in-toto statement or a bare predicate."""
+    if isinstance(document, dict) and isinstance(document.get('predicate'), dict):
+        predicate_type = document.get('predicateType', '')
+        predicate = document['predicate']
+        subjects = document.get('subject') or []
+    else:
+        predicate_type = ''
+        predicate = document if isinstance(document, dict) else {}
+        subjects = []
+    return detect_version(predicate_type, predicate), predicate, subjects
+
+
+def detect_version(predicate_type, predicate):
+    """Map a predicate type (or, for bare predicates, the predicate's shape) to a layout key."""
+    if predicate_type.startswith(SLSA_V1):
+        return SLSA_V1
+    if predicate_type.startswith(SLSA_V02):
+        return SLSA_V02
+    if 'buildDefinition' in predicate or 'runDetails' in predicate:
+        return SLSA_V1
+    if 'invocation' in predicate or 'materials' in predicate or 'builder' in predicate:
+        return SLSA_V02
+    raise ValueError(f"Unrecognized SLSA provenance predicate (predicateType: '{predicate_type}')")
+
+
+def render_entries(entries, obj, lines):
+    for entry in entries:
+        kind = entry[0]
+        if kind == 'text':
+            lines.append(entry[1])
+        elif kind == 'field':
+            # Like the per-pipeline scripts' .get(key, ''): a key present with null prints None
+            lines.append(entry[1].format(resolve(obj, entry[2], '')))
+        elif kind == 'digest':
+            digests = ""
+            for path in entry[2]:
+                digests = format_digests(resolve(obj, path))
+                if digests:
+                    break
+            if digests:
+                lines.append(entry[1].format(digests))
+        elif kind == 'items':
+            mapping = resolve(obj, entry[1])
+            if isinstance(mapping, dict):
+                lines.extend(f"- **{k}**: `{v}`" for k, v in mapping.items())
+        elif kind == 'each':
+            for item in resolve(obj, entry[1]) or []:
+                render_entries(entry[2], item, lines)
+
+
+def render_provenance(document):
+    """Render an in-toto statement or bare SLSA v0.2/v1 predicate as markdown."""
+    version, predicate, subjects = split_statement(document)
+
+    lines = ["# SLSA Provenance Predicate", ""]
+    if subjects:
+        lines.append("## Subjects\n")
+        for subject in subjects:
+            lines.append(f"- **{subject.get('name', '')}**: `{format_digests(subject.get('digest', {}))}`")
+        lines.append("")
+    render_entries(LAYOUTS[version], predicate, lines)
+    return '\n'.join(lines)
+
+
+def iter_predicate_files(input_path):
+    if os.path.isdir(input_path):
+        for name in sorted(os.listdir(input_path)):
+            if name.endswith('.json'):
+                yield os.path.join(input_path, name)
+    else:
+        yield input_path
+
+
+def convert(input_path, output_path):
+    """Render one file to output_path, or every .json in a directory into output_path as a directory."""
+    if not os.path.isdir(input_path):
+        with open(input_path, 'r') as f:
+            markdown = render_provenance(json.load(f))
+        with open(output_path, 'w') as f:
+            f.write(markdown)
+        return 1
+
+    os.makedirs(output_path, exist_ok=True)
+    count = 0
+    for predicate_file in iter_predicate_files(input_path):
+        try:
+            with open(predicate_file, 'r') as f:
+                markdown = render_provenance(json.load(f))
+        except ValueError as e:
+            # One malformed predicate should not stop a whole batch
+            print(f"Skipping {predicate_file}: {e}")
+            continue
+        name = os.path.splitext(os.path.basename(predicate_file))[0]
+        with open(os.path.join(output_path, f"{name}.md"), 'w') as f:
+            f.write(markdown)
+        count += 1
+    return count
+
+
+def benchmark(input_path, rounds=3):
+    """Time parsing and rendering every predicate under input_path without writing any output."""
+    documents = []
+    total_bytes = 0
+    for predicate_file in iter_predicate_files(input_path):
+        with open(predicate_file, 'r') as f:
+            text = f.read()
+        total_bytes += len(text)
+        documents.append(text)
+
+    best_parse = best_render = float('inf')
+    for _ in range(rounds):
+        start = time.perf_counter()
+        parsed = [json.loads(text) for text in documents]
+        parsed_at = time.perf_counter()
+        for document in parsed:
+            render_provenance(document)
+        finished = time.perf_counter()
+        best_parse = min(best_parse, parsed_at - start)
+        best_render = min(best_render, finished - parsed_at)
+
+    count = len(documents)
+    total = best_parse + best_render
+    print(f"Predicates: {count} ({total_bytes / 1e6:.1f} MB)")
+    print(f"Parse:  {best_parse:.3f}s")
+    print(f"Render: {best_render:.3f}s")
+    print(f"Throughput: {count / total:.0f} predicates/s, {total_bytes / 1e6 / total:.1f} MB/s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Render SLSA v0.2 or v1 provenance as markdown.")
+    parser.add_argument('input', nargs='?', default='./predicate.json',
+                        help="Predicate or in-toto statement JSON, or a directory of them (default: ./predicate.json)")
+    parser.add_argument('-o', '--output', default=None,
+                        help="Markdown file, or output directory for a directory input "
+                             "(default: provenance.md, or provenance-md/ for a directory)")
+    parser.add_argument('--benchmark', action='store_true', help="Report parse/render throughput instead of writing files")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.input):
+        print(f"Error: File not found at {args.input}")
+        sys.exit(1)
+
+    try:
+        if args.benchmark:
+            benchmark(args.input)
+        else:
+            output = args.output or ('provenance-md' if os.path.isdir(args.input) else 'provenance.md')
+            count = convert(args.input, output)
+            print(f"Rendered {count} provenance predicate(s) to {output}")
+    except (ValueError, json.JSONDecodeError) as e:
+        print(f"Error: {e}")
+        sys.exit(1)
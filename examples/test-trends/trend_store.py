@@ -0,0 +1,413 @@
+#!/usr/bin/env python3
+"""
+Test Trend Store
+
+Append-only columnar store of per-testcase results collected from many test
+runs. It ingests the JSON produced by the Katalon (`xml_to_json.py`) and JUnit
+(`xml-to-json.sh`) examples and computes flakiness, p50/p95 durations and
+duration regressions against a rolling baseline, rendered as a markdown
+section that can be appended to the single-run reports.
+
+Usage:
+    python trend_store.py ingest <store_dir> <report.json> --run-id <id>
+    python trend_store.py report <store_dir> [-o test-trends.md] [--append-to junit-results.md]
+    python trend_store.py compact <store_dir>
+    python trend_store.py benchmark [--rows 10000000]
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from datetime import datetime
+
+import numpy as np
+
+
+STORE_VERSION = 1
+MANIFEST_FILE = 'manifest.json'
+
+STATUS_CODES = {'passed': 0, 'failed': 1, 'error': 2, 'skipped': 3}
+STATUS_UNKNOWN = 4
+FAILED_STATUSES = (STATUS_CODES['failed'], STATUS_CODES['error'])
+
+# Durations are packed into the low 32 bits of the sort keys as microseconds
+MAX_DURATION_US = (1 << 32) - 1
+
+COLUMNS = {
+    'test_id': np.int32,
+    'run_id': np.int32,
+    'status': np.int8,
+    'time': np.float32,
+}
+
+
+def parse_time(value):
+    """Convert a JUnit time attribute (number or string) to seconds."""
+    try:
+        return float(str(value).replace(',', ''))
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def iter_testcases(report):
+    """Yield (classname, name, status, time) from a Katalon or JUnit JSON report."""
+    if 'testReport' in report:
+        # JUnit example layout: testReport.testSuites[] holds individual tests
+        for test in report['testReport'].get('testSuites', []):
+            yield (test.get('class', 'Unknown'), test.get('name', 'Unknown'),
+                   test.get('status', 'unknown'), parse_time(test.get('time', 0)))
+    else:
+        # Katalon example layout: testsuites.testsuite[].testcase[]
+        for suite in report.get('testsuites', {}).get('testsuite', []):
+            for testcase in suite.get('testcase', []):
+                yield (testcase.get('classname', 'Unknown'), testcase.get('name', 'Unknown'),
+                       testcase.get('status', 'unknown'), parse_time(testcase.get('time', 0)))
+
+
+class TrendStore:
+    """Append-only store of test results kept as one set of column arrays per run."""
+
+    def __init__(self, path):
+        self.path = path
+        self.manifest = self._load_manifest()
+        self.test_index = {(classname, name): i for i, (classname, name) in enumerate(self.manifest['tests'])}
+
+    def _load_manifest(self):
+        manifest_path = os.path.join(self.path, MANIFEST_FILE)
+        if not os.path.exists(manifest_path):
+            return {'version': STORE_VERSION, 'tests': [], 'runs': [], 'segments': [], 'next_segment': 0}
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+        if manifest.get('version') != STORE_VERSION:
+            raise ValueError(f"Unsupported trend store version in {manifest_path}: {manifest.get('version')}")
+        if 'next_segment' not in manifest:
+            # Stores written before the counter existed continue after their highest segment number
+            numbers = [int(segment[len('segment-'):-len('.npz')]) for segment in manifest['segments']]
+            manifest['next_segment'] = max(numbers, default=-1) + 1
+        return manifest
+
+    def _save_manifest(self):
+        manifest_path = os.path.join(self.path, MANIFEST_FILE)
+        tmp_path = manifest_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.manifest, f)
+        # Replace atomically so a crashed ingest never leaves a half-written manifest
+        os.replace(tmp_path, manifest_path)
+
+    def _write_segment(self, columns):
+        # Segment numbers only ever grow, so a new segment never overwrites one that is still listed
+        name = f"segment-{self.manifest['next_segment']:06d}.npz"
+        self.manifest['next_segment'] += 1
+        np.savez(os.path.join(self.path, name), **columns)
+        return name
+
+    def append_run(self, run_label, testcases):
+        """Append the results of one run; returns the number of rows written."""
+        if run_label in self.manifest['runs']:
+            raise ValueError(f"Run '{run_label}' is already in the trend store")
+        os.makedirs(self.path, exist_ok=True)
+
+        run_id = len(self.manifest['runs'])
+        test_ids, statuses, times = [], [], []
+        for classname, name, status, duration in testcases:
+            key = (classname, name)
+            test_id = self.test_index.get(key)
+            if test_id is None:
+                test_id = len(self.manifest['tests'])
+                self.test_index[key] = test_id
+                self.manifest['tests'].append([classname, name])
+            test_ids.append(test_id)
+            statuses.append(STATUS_CODES.get(str(status).lower(), STATUS_UNKNOWN))
+            times.append(duration)
+
+        columns = {
+            'test_id': np.array(test_ids, dtype=COLUMNS['test_id']),
+            'run_id': np.full(len(test_ids), run_id, dtype=COLUMNS['run_id']),
+            'status': np.array(statuses, dtype=COLUMNS['status']),
+            'time': np.array(times, dtype=COLUMNS['time']),
+        }
+        self.manifest['segments'].append(self._write_segment(columns))
+        self.manifest['runs'].append(run_label)
+        self._save_manifest()
+        return len(test_ids)
+
+    def load_columns(self):
+        """Load every segment and return the concatenated column arrays."""
+        parts = {column: [] for column in COLUMNS}
+        for segment in self.manifest['segments']:
+            with np.load(os.path.join(self.path, segment)) as data:
+                for column in COLUMNS:
+                    parts[column].append(data[column])
+        return {
+            column: np.concatenate(arrays) if arrays else np.empty(0, dtype=COLUMNS[column])
+            for column, arrays in parts.items()
+        }
+
+    def compact(self):
+        """Merge all segments into one so later loads open a single file."""
+        if len(self.manifest['segments']) < 2:
+            return
+        old_segments = self.manifest['segments']
+        columns = self.load_columns()
+        name = self._write_segment(columns)
+        self.manifest['segments'] = [name]
+        self._save_manifest()
+        for segment in old_segments:
+            os.remove(os.path.join(self.path, segment))
+
+
+def grouped_percentiles(test_ids, times, n_tests, quantiles):
+    """Per-test duration percentiles using one packed int64 key sort.
+
+    Returns an array of shape (len(quantiles), n_tests); tests without rows get NaN.
+    """
+    result = np.full((len(quantiles), n_tests), np.nan)
+    if len(test_ids) == 0:
+        return result
+    # float32 keeps microsecond resolution for durations up to a few minutes
+    micros = np.clip(times * np.float32(1e6), 0, MAX_DURATION_US).astype(np.int64)
+    keys = test_ids.astype(np.int64)
+    keys <<= 32
+    keys |= micros
+    keys.sort()
+
+    counts = np.bincount(test_ids, minlength=n_tests)
+    starts = np.cumsum(counts) - counts
+    present = counts > 0
+    for i, q in enumerate(quantiles):
+        idx = starts[present] + np.floor(q * (counts[present] - 1)).astype(np.int64)
+        result[i, present] = (keys[idx] & MAX_DURATION_US) / 1e6
+    return result
+
+
+def compute_trends(columns, n_tests, window=20, threshold=0.2):
+    """Compute per-test flakiness, duration percentiles and regressions."""
+    test_id = columns['test_id']
+    run_id = columns['run_id']
+    status = columns['status']
+    times = columns['time']
+
+    executed = status != STATUS_CODES['skipped']
+    test_id, run_id, status, times = test_id[executed], run_id[executed], status[executed], times[executed]
+    failed = (status == FAILED_STATUSES[0]) | (status == FAILED_STATUSES[1])
+
+    runs = np.bincount(test_id, minlength=n_tests)
+    failures = np.bincount(test_id[failed], minlength=n_tests)
+
+    # Flakiness is the rate of pass/fail flips between consecutive runs of a test.
+    # Packing (test, run, outcome) into one int64 lets a single sort order rows by test then run.
+    keys = test_id.astype(np.int64)
+    keys <<= 31
+    keys |= run_id
+    keys <<= 1
+    keys |= failed
+    keys.sort()
+    # Neighbouring keys belong to the same test when their high bits agree and
+    # flip when the outcome bit differs, so only flipped rows need decoding.
+    changed = keys[1:] ^ keys[:-1]
+    flip_positions = np.flatnonzero(((changed >> 32) == 0) & ((changed & 1) == 1))
+    flips = np.bincount(keys[flip_positions + 1] >> 32, minlength=n_tests)
+    transitions = np.maximum(runs - 1, 0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        flip_rate = np.where(transitions > 0, flips / transitions, 0.0)
+        fail_rate = np.where(runs > 0, failures / runs, 0.0)
+
+    p50, p95 = grouped_percentiles(test_id, times, n_tests, (0.5, 0.95))
+
+    # Duration regressions: latest run versus the median of the preceding window
+    latest_run = int(run_id.max()) if len(run_id) else -1
+    in_latest = run_id == latest_run
+    latest_counts = np.bincount(test_id[in_latest], minlength=n_tests)
+    latest_totals = np.bincount(test_id[in_latest], weights=times[in_latest], minlength=n_tests)
+    in_baseline = (run_id < latest_run) & (run_id >= latest_run - window)
+    baseline = grouped_percentiles(test_id[in_baseline], times[in_baseline], n_tests, (0.5,))[0]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        current = np.where(latest_counts > 0, latest_totals / latest_counts, np.nan)
+        ratio = current / baseline
+    regressed = (latest_counts > 0) & (baseline > 0) & (ratio > 1 + threshold)
+
+    return {
+        'rows': int(len(columns['test_id'])),
+        'executed': int(len(test_id)),
+        'runs': runs,
+        'failures': failures,
+        'fail_rate': fail_rate,
+        'flip_rate': flip_rate,
+        'p50': p50,
+        'p95': p95,
+        'current': current,
+        'baseline': baseline,
+        'ratio': ratio,
+        'regressed': regressed,
+    }
+
+
+def top_indices(values, mask, top):
+    """Indices of the `top` largest values within mask, largest first."""
+    candidates = np.flatnonzero(mask)
+    if len(candidates) > top:
+        candidates = candidates[np.argpartition(values[candidates], -top)[-top:]]
+    return candidates[np.argsort(values[candidates])[::-1]]
+
+
+def generate_trend_section(trends, tests, run_count, window, threshold, top=20):
+    """Render the trend analysis as a markdown section."""
+    def label(test_id):
+        classname, name = tests[test_id]
+        return f"{name} | `{classname}`"
+
+    flaky = top_indices(trends['flip_rate'], trends['flip_rate'] > 0, top)
+    slowest = top_indices(np.nan_to_num(trends['p95']), trends['runs'] > 0, top)
+    regressions = top_indices(np.nan_to_num(trends['ratio']), trends['regressed'], top)
+
+    lines = [
+        "## Test Trends",
+        "",
+        f"**Runs Analyzed:** {run_count}  ",
+        f"**Tests Tracked:** {len(tests)}  ",
+        f"**Results Stored:** {trends['rows']}  ",
+        f"**Flaky Tests:** {int(np.count_nonzero(trends['flip_rate'] > 0))}  ",
+        f"**Duration Regressions:** {int(np.count_nonzero(trends['regressed']))} "
+        f"(latest run vs. median of previous {window} runs, threshold +{threshold * 100:.0f}%)",
+        "",
+        "### Most Flaky Tests",
+        "",
+    ]
+    if len(flaky):
+        lines.append("| Test Case | Class | Runs | Failure Rate | Flip Rate |")
+        lines.append("|-----------|-------|------|--------------|-----------|")
+        for i in flaky:
+            lines.append(f"| {label(i)} | {trends['runs'][i]} | {trends['fail_rate'][i] * 100:.1f}% "
+                         f"| {trends['flip_rate'][i] * 100:.1f}% |")
+    else:
+        lines.append("No flaky tests detected.")
+
+    lines.extend(["", "### Slowest Tests (p95)", ""])
+    if len(slowest):
+        lines.append("| Test Case | Class | Runs | p50 | p95 |")
+        lines.append("|-----------|-------|------|-----|-----|")
+        for i in slowest:
+            lines.append(f"| {label(i)} | {trends['runs'][i]} | {trends['p50'][i]:.3f}s | {trends['p95'][i]:.3f}s |")
+    else:
+        lines.append("No executed tests recorded.")
+
+    lines.extend(["", "### Duration Regressions", ""])
+    if len(regressions):
+        lines.append("| Test Case | Class | Baseline (p50) | Latest | Change |")
+        lines.append("|-----------|-------|----------------|--------|--------|")
+        for i in regressions:
+            lines.append(f"| {label(i)} | {trends['baseline'][i]:.3f}s | {trends['current'][i]:.3f}s "
+                         f"| +{(trends['ratio'][i] - 1) * 100:.1f}% |")
+    else:
+        lines.append("No duration regressions detected.")
+
+    lines.append("")
+    return '\n'.join(lines)
+
+
+def ingest(args):
+    try:
+        with open(args.report, 'r', encoding='utf-8') as f:
+            report = json.load(f)
+    except FileNotFoundError:
+        print(f"Error: Input file '{args.report}' not found.")
+        sys.exit(1)
+    except json.JSONDecodeError as e:
+        print(f"Error: Invalid JSON format in '{args.report}': {e}")
+        sys.exit(1)
+
+    store = TrendStore(args.store)
+    run_label = args.run_id or datetime.now().strftime('%Y%m%d%H%M%S')
+    try:
+        rows = store.append_run(run_label, iter_testcases(report))
+    except ValueError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    print(f"Ingested {rows} test results for run '{run_label}' into {args.store}")
+
+
+def report(args):
+    store = TrendStore(args.store)
+    if not store.manifest['runs']:
+        print(f"Error: Trend store '{args.store}' has no runs.")
+        sys.exit(1)
+
+    started = time.perf_counter()
+    columns = store.load_columns()
+    loaded = time.perf_counter()
+    trends = compute_trends(columns, len(store.manifest['tests']), args.window, args.threshold)
+    section = generate_trend_section(trends, store.manifest['tests'], len(store.manifest['runs']),
+                                     args.window, args.threshold, args.top)
+    finished = time.perf_counter()
+
+    if args.append_to:
+        with open(args.append_to, 'a', encoding='utf-8') as f:
+            f.write('\n' + section)
+        print(f"Test trend section appended to {args.append_to}")
+    else:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(section)
+        print(f"Test trend section saved to {args.output}")
+    print(f"Loaded {trends['rows']} rows in {loaded - started:.3f}s, analyzed and rendered in {finished - loaded:.3f}s")
+
+
+def benchmark(args):
+    """Time analysis and rendering on synthetic in-memory data."""
+    rng = np.random.default_rng(42)
+    n_runs = max(2, args.rows // args.tests)
+    rows = n_runs * args.tests
+    columns = {
+        'test_id': np.tile(np.arange(args.tests, dtype=np.int32), n_runs),
+        'run_id': np.repeat(np.arange(n_runs, dtype=np.int32), args.tests),
+        'status': rng.choice(np.array([0, 0, 0, 0, 0, 0, 0, 0, 1, 3], dtype=np.int8), rows),
+        'time': rng.gamma(2.0, 0.5, rows).astype(np.float32),
+    }
+    tests = [[f"com.example.Class{i % 500}", f"test{i}"] for i in range(args.tests)]
+
+    started = time.perf_counter()
+    trends = compute_trends(columns, args.tests, args.window, args.threshold)
+    analyzed = time.perf_counter()
+    generate_trend_section(trends, tests, n_runs, args.window, args.threshold, args.top)
+    rendered = time.perf_counter()
+    print(f"{rows} rows ({args.tests} tests x {n_runs} runs): "
+          f"analysis {analyzed - started:.3f}s, render {rendered - analyzed:.3f}s, "
+          f"total {rendered - started:.3f}s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Track test results across runs and report trends.")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    ingest_parser = subparsers.add_parser('ingest', help="Append one run's Katalon or JUnit JSON report")
+    ingest_parser.add_argument('store', help="Trend store directory")
+    ingest_parser.add_argument('report', help="Katalon or JUnit JSON report")
+    ingest_parser.add_argument('--run-id', help="Unique run identifier (default: current timestamp)")
+    ingest_parser.set_defaults(func=ingest)
+
+    for name, func, helptext in (('report', report, "Render the trend markdown section"),
+                                 ('benchmark', benchmark, "Benchmark analysis on synthetic data")):
+        sub = subparsers.add_parser(name, help=helptext)
+        if name == 'report':
+            sub.add_argument('store', help="Trend store directory")
+            sub.add_argument('-o', '--output', default='test-trends.md', help="Output markdown file")
+            sub.add_argument('--append-to', help="Append the section to an existing markdown report instead")
+        else:
+            sub.add_argument('--rows', type=int, default=10_000_000, help="Number of synthetic results")
+            sub.add_argument('--tests', type=int, default=20_000, help="Number of distinct synthetic tests")
+        sub.add_argument('--window', type=int, default=20, help="Runs in the rolling duration baseline")
+        sub.add_argument('--threshold', type=float, default=0.2, help="Relative slowdown flagged as a regression")
+        sub.add_argument('--top', type=int, default=20, help="Rows per table")
+        sub.set_defaults(func=func)
+
+    compact_parser = subparsers.add_parser('compact', help="Merge all run segments into one file")
+    compact_parser.add_argument('store', help="Trend store directory")
+    compact_parser.set_defaults(func=lambda args: TrendStore(args.store).compact())
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == '__main__':
+    main()
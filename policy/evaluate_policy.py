@@ -0,0 +1,155 @@
+"""Evaluate policy.rego in-process for release-bundle GraphQL responses.
+
+Mirrors `opa eval --input <response> --data policy.rego "data.policy.output"`
+(optionally with `--data blazemeter-slo-verdict.json`) without spawning OPA,
+so thousands of bundles can be checked in one process.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+# Must match expected_predicate_slugs in policy.rego
+EXPECTED_PREDICATE_SLUGS = frozenset({"cyclonedx-vex", "testing-results", "promotion"})
+
+# Rego orders values of different types null < boolean < number < string < array < object
+TYPE_ORDER = {type(None): 0, bool: 1, int: 2, float: 2, str: 3, list: 4, dict: 5}
+
+
+def rego_sort_key(value):
+    """Sort key reproducing the order in which OPA iterates a set.
+
+    Arrays compare element by element and objects by their sorted (key, value)
+    pairs, a shorter prefix sorting first in both.
+    """
+    rank = TYPE_ORDER.get(type(value), 6)
+    if rank == 4:
+        return rank, tuple(rego_sort_key(item) for item in value)
+    if rank == 5:
+        return rank, tuple((rego_sort_key(key), rego_sort_key(value[key])) for key in sorted(value))
+    return rank, value
+
+
+def rego_key(value):
+    """Hashable stand-in for a JSON value that is equal exactly when the values are equal in Rego.
+
+    Composite values are valid set members in Rego but not hashable in Python,
+    and Python treats true and 1 as the same set member where Rego does not.
+    """
+    if isinstance(value, bool):
+        return 'boolean', value
+    if isinstance(value, list):
+        return 'array', tuple(rego_key(item) for item in value)
+    if isinstance(value, dict):
+        return 'object', frozenset((key, rego_key(item)) for key, item in value.items())
+    return value
+
+
+def members(collection):
+    """Values of `collection[_]`: list elements or object values; nothing for scalars."""
+    if isinstance(collection, list):
+        return collection
+    if isinstance(collection, dict):
+        return collection.values()
+    return ()
+
+
+def get(obj, key):
+    return obj.get(key) if isinstance(obj, dict) else None
+
+
+def slugs_from_edges(evidence_connection, slugs):
+    """Add every `edges[_].node.predicateSlug` of an evidence connection to slugs, keyed by rego_key."""
+    for edge in members(get(evidence_connection, "edges")):
+        node = get(edge, "node")
+        if isinstance(node, dict) and "predicateSlug" in node:
+            slug = node["predicateSlug"]
+            slugs.setdefault(rego_key(slug), slug)
+
+
+def collect_predicate_slugs(response):
+    """Union of the slugs found on artifacts, source builds and the bundle itself, as {rego_key: slug}."""
+    version = get(get(get(response, "data"), "releaseBundleVersion"), "getVersion")
+    slugs = {}
+    for artifact_edge in members(get(get(version, "artifactsConnection"), "edges")):
+        slugs_from_edges(get(get(artifact_edge, "node"), "evidenceConnection"), slugs)
+    for build in members(get(version, "fromBuilds")):
+        slugs_from_edges(get(build, "evidenceConnection"), slugs)
+    slugs_from_edges(get(version, "evidenceConnection"), slugs)
+    return slugs
+
+
+def performance_slo_passed(slo_verdict):
+    """Mirrors policy.rego: passes when no verdict is loaded or the verdict passed."""
+    if not isinstance(slo_verdict, dict) or "performance_slo" not in slo_verdict:
+        return True
+    performance_slo = slo_verdict["performance_slo"]
+    # `not data.performance_slo` also holds when the value is false, but not when it is null
+    if performance_slo is False:
+        return True
+    return get(performance_slo, "passed") is True
+
+
+def evaluate(response, slo_verdict=None, expected=EXPECTED_PREDICATE_SLUGS):
+    """Return the same object as data.policy.output for one GraphQL response."""
+    found_slugs = collect_predicate_slugs(response)
+    slo_passed = performance_slo_passed(slo_verdict)
+    expected_non_empty = {slug for slug in expected if slug != ""}
+    approved = len(expected_non_empty) == len(found_slugs.keys() & expected) and slo_passed
+
+    return {
+        "found": sorted(found_slugs.values(), key=rego_sort_key),
+        "approved": approved,
+        "not_found": sorted(slug for slug in expected if slug not in found_slugs),
+        "performance_slo_passed": slo_passed,
+    }
+
+
+def iter_response_files(paths):
+    for path in paths:
+        if os.path.isdir(path):
+            for name in sorted(os.listdir(path)):
+                if name.endswith('.json'):
+                    yield os.path.join(path, name)
+        else:
+            yield path
+
+
+def evaluate_files(paths, slo_verdict=None):
+    """Evaluate every response file; yields (path, output)."""
+    for path in iter_response_files(paths):
+        with open(path, 'rb') as f:
+            yield path, evaluate(json.loads(f.read()), slo_verdict)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Evaluate policy.rego in-process for release-bundle GraphQL responses.")
+    parser.add_argument('inputs', nargs='+', help="GraphQL response JSON files or directories of them")
+    parser.add_argument('--slo-verdict', help="BlazeMeter SLO verdict JSON, as passed to opa with --data")
+    parser.add_argument('--benchmark', action='store_true', help="Print bundles/s instead of the policy outputs")
+    args = parser.parse_args()
+
+    try:
+        slo_verdict = None
+        if args.slo_verdict:
+            with open(args.slo_verdict, 'r') as f:
+                slo_verdict = json.load(f)
+
+        start = time.perf_counter()
+        results = list(evaluate_files(args.inputs, slo_verdict))
+        elapsed = time.perf_counter() - start
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+    if args.benchmark:
+        print(f"Evaluated {len(results)} bundle(s) in {elapsed:.3f}s ({len(results) / max(elapsed, 1e-9):.0f} bundles/s)")
+    elif len(results) == 1:
+        # Same shape as `opa eval ... | jq '.result[0].expressions[0].value'`
+        print(json.dumps(results[0][1], indent=2))
+    else:
+        for path, output in results:
+            print(json.dumps(dict(output, bundle=path)))
+
+    sys.exit(0 if all(output["approved"] for _, output in results) else 2)
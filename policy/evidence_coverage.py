@@ -0,0 +1,292 @@
+"""Evidence coverage matrix across many release-bundle GraphQL responses.
+
+Every artifact, source build and bundle found in the responses becomes a node
+whose evidence is stored as a bitset over interned predicate slugs. Aggregations
+(per-bundle coverage, missing-evidence rollups for builds and artifacts that have
+expected slugs of their own, per-node-type coverage) run as vectorized bit
+operations over 64-bit words, so they stay fast with millions of nodes and any
+number of predicate slugs.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from collections import Counter
+
+import numpy as np
+
+from evaluate_policy import EXPECTED_PREDICATE_SLUGS, get, iter_response_files, members
+
+NODE_KINDS = ('bundle', 'build', 'artifact')
+BUNDLE, BUILD, ARTIFACT = range(3)
+# Bundles or nodes listed per slug in the missing-evidence rollups
+MISSING_EXAMPLES = 5
+TOP_PATTERNS = 10
+
+
+class SlugTable:
+    """Interns predicate slugs to bit positions."""
+
+    def __init__(self, slugs=()):
+        self.bits = {}
+        self.slugs = []
+        for slug in slugs:
+            self.bit(slug)
+
+    def bit(self, slug):
+        bit = self.bits.get(slug)
+        if bit is None:
+            bit = self.bits[slug] = len(self.slugs)
+            self.slugs.append(slug)
+        return bit
+
+    def mask(self, slugs):
+        mask = 0
+        for slug in slugs:
+            mask |= 1 << self.bit(slug)
+        return mask
+
+    def names(self, mask):
+        return [slug for bit, slug in enumerate(self.slugs) if mask >> bit & 1]
+
+
+def split_words(masks, words):
+    """Integer bitsets as a (len(masks) x words) matrix of 64-bit words, lowest word first."""
+    bitsets = np.zeros((len(masks), words), dtype=np.uint64)
+    low_bits = (1 << 64) - 1
+    for word in range(words):
+        shift = word * 64
+        bitsets[:, word] = np.fromiter(((mask >> shift) & low_bits for mask in masks),
+                                       dtype=np.uint64, count=len(masks))
+    return bitsets
+
+
+def bit_set(bitsets, bit):
+    """Boolean row mask of the rows of a word matrix that have the bit set."""
+    word, offset = divmod(bit, 64)
+    return ((bitsets[:, word] >> np.uint64(offset)) & np.uint64(1)).astype(bool)
+
+
+def build_label(build):
+    name, number = get(build, 'name'), get(build, 'number')
+    return f"{name}#{number}" if number is not None else str(name)
+
+
+def artifact_label(artifact):
+    # Several files of one image share a path, so the file name completes it
+    path, name = get(artifact, 'path'), get(artifact, 'name')
+    return f"{path}/{name}" if path and name else str(path or name)
+
+
+class CoverageIndex:
+    """Per-node evidence bitsets, grouped by bundle."""
+
+    def __init__(self, expected=EXPECTED_PREDICATE_SLUGS, expected_builds=(), expected_artifacts=()):
+        """expected is checked per bundle across all of its nodes, as policy.rego does.
+
+        Builds and artifacts are only checked for their own expected slugs; the
+        policy's slugs are attached to the bundle, so no build or artifact is
+        expected to carry them.
+        """
+        # Expected slugs take the lowest bits, so the report lists them first
+        self.slug_table = SlugTable(sorted(set(expected) | set(expected_builds) | set(expected_artifacts)))
+        self.expected_mask = self.slug_table.mask(expected)
+        self.node_expected_masks = {BUILD: self.slug_table.mask(expected_builds),
+                                    ARTIFACT: self.slug_table.mask(expected_artifacts)}
+        self.bundles = []
+        self.bundle_starts = []
+        self.kinds = []
+        self.masks = []
+        # Build 'name#number', artifact path or bundle name of every node, for the missing-evidence examples
+        self.labels = []
+
+    @property
+    def word_count(self):
+        return max(1, (len(self.slug_table.slugs) + 63) // 64)
+
+    def _edge_mask(self, evidence_connection):
+        slugs = (get(get(edge, 'node'), 'predicateSlug') for edge in members(get(evidence_connection, 'edges')))
+        return self.slug_table.mask(slug for slug in slugs if isinstance(slug, str))
+
+    def add_response(self, bundle, response):
+        """Record the bundle, its source builds and its artifacts as nodes."""
+        version = get(get(get(response, 'data'), 'releaseBundleVersion'), 'getVersion')
+        self.bundles.append(bundle)
+        self.bundle_starts.append(len(self.masks))
+
+        self.kinds.append(BUNDLE)
+        self.masks.append(self._edge_mask(get(version, 'evidenceConnection')))
+        self.labels.append(bundle)
+        for build in members(get(version, 'fromBuilds')):
+            self.kinds.append(BUILD)
+            self.masks.append(self._edge_mask(get(build, 'evidenceConnection')))
+            self.labels.append(build_label(build))
+        for artifact_edge in members(get(get(version, 'artifactsConnection'), 'edges')):
+            artifact = get(artifact_edge, 'node')
+            self.kinds.append(ARTIFACT)
+            self.masks.append(self._edge_mask(get(artifact, 'evidenceConnection')))
+            self.labels.append(artifact_label(artifact))
+
+    def to_arrays(self):
+        """Node kinds and bitsets as arrays; bitsets are split into 64-bit words (nodes x words)."""
+        return np.array(self.kinds, dtype=np.int8), split_words(self.masks, self.word_count)
+
+    def expected_words(self, mask):
+        """An expected-slug mask as one row of 64-bit words, matching the node bitsets."""
+        return split_words([mask], self.word_count)[0]
+
+
+def bit_counts(bitsets, bit_count):
+    """Number of rows with each bit set, for bits 0..bit_count-1."""
+    counts = np.empty(bit_count, dtype=np.int64)
+    for bit in range(bit_count):
+        counts[bit] = np.count_nonzero(bit_set(bitsets, bit))
+    return counts
+
+
+def analyze_coverage(index):
+    """Aggregate node bitsets into per-bundle coverage and per-kind rollups.
+
+    Missing evidence is the expected mask AND NOT the node's bitset, word by
+    word, so expected slugs beyond the first 64 are compared as well.
+    """
+    kinds, bitsets = index.to_arrays()
+    slug_count = len(index.slug_table.slugs)
+    expected = index.expected_words(index.expected_mask)
+
+    # Nodes are stored bundle by bundle, so a bundle's coverage is one OR-reduction per segment
+    starts = np.array(index.bundle_starts, dtype=np.int64)
+    bundle_bitsets = np.bitwise_or.reduceat(bitsets, starts, axis=0) if len(starts) else bitsets[:0]
+    bundle_missing = expected & ~bundle_bitsets
+    # Bundle of every node, for naming nodes in the build and artifact rollups
+    node_bundles = np.repeat(np.arange(len(starts)), np.diff(np.append(starts, len(kinds))))
+
+    per_kind = {}
+    node_missing = {}
+    for kind, name in enumerate(NODE_KINDS):
+        rows = np.flatnonzero(kinds == kind)
+        selected = bitsets[rows]
+        per_kind[name] = (len(selected), bit_counts(selected, slug_count))
+        # Levels without expected slugs of their own are not checked
+        node_expected = index.node_expected_masks.get(kind, 0)
+        if node_expected:
+            node_missing[name] = (rows, index.expected_words(node_expected) & ~selected)
+
+    return {
+        'node_count': len(kinds),
+        'bundle_missing': bundle_missing,
+        'node_missing': node_missing,
+        'node_bundles': node_bundles,
+        'per_kind': per_kind,
+        # Hashing the integer bitsets is cheaper than a row-wise unique over the word matrix
+        'top_patterns': Counter(index.masks).most_common(TOP_PATTERNS),
+    }
+
+
+def generate_coverage_markdown(index, analysis):
+    slugs = index.slug_table.slugs
+    expected_bits = [bit for bit in range(len(slugs)) if index.expected_mask >> bit & 1]
+    bundle_missing = analysis['bundle_missing']
+    complete = int(np.count_nonzero(~bundle_missing.any(axis=1)))
+    missing_by_bit = {bit: bit_set(bundle_missing, bit) for bit in expected_bits}
+
+    parts = ["# Evidence Coverage Report\n\n"]
+    parts.append(f"**Bundles:** `{len(index.bundles)}`\n\n")
+    parts.append("**Nodes:** " + ", ".join(f"`{analysis['per_kind'][name][0]}` {name}s" for name in NODE_KINDS) + "\n\n")
+    parts.append(f"**Predicate Types Seen:** `{len(slugs)}`\n\n")
+    parts.append(f"**Bundles With All Expected Evidence:** `{complete}` of `{len(index.bundles)}`\n\n")
+
+    parts.append("---\n\n## Missing Evidence by Predicate Type\n\n")
+    parts.append("| Predicate Type | Bundles Missing | Examples |\n")
+    parts.append("| :------------- | --------------: | :------- |\n")
+    for bit in expected_bits:
+        missing = np.flatnonzero(missing_by_bit[bit])
+        examples = ", ".join(index.bundles[i] for i in missing[:MISSING_EXAMPLES])
+        more = f" (+{len(missing) - MISSING_EXAMPLES} more)" if len(missing) > MISSING_EXAMPLES else ""
+        parts.append(f"| {slugs[bit]} | {len(missing)} | {examples}{more} |\n")
+
+    for kind, name in enumerate(NODE_KINDS):
+        if name not in analysis['node_missing']:
+            continue
+        rows, node_missing = analysis['node_missing'][name]
+        node_expected_bits = [bit for bit in range(len(slugs)) if index.node_expected_masks[kind] >> bit & 1]
+        title = f"{name.capitalize()}s"
+        node_complete = int(np.count_nonzero(~node_missing.any(axis=1)))
+        parts.append(f"\n---\n\n## Missing Evidence by Predicate Type: {title}\n\n")
+        parts.append(f"**{title} With All Expected Evidence:** `{node_complete}` of `{len(rows)}`\n\n")
+        if not len(rows):
+            continue
+        parts.append(f"| Predicate Type | {title} Missing | Examples |\n")
+        parts.append("| :------------- | ------: | :------- |\n")
+        for bit in node_expected_bits:
+            missing = rows[bit_set(node_missing, bit)]
+            examples = ", ".join(f"{index.bundles[analysis['node_bundles'][i]]}: {index.labels[i]}"
+                                 for i in missing[:MISSING_EXAMPLES])
+            more = f" (+{len(missing) - MISSING_EXAMPLES} more)" if len(missing) > MISSING_EXAMPLES else ""
+            parts.append(f"| {slugs[bit]} | {len(missing)} | {examples}{more} |\n")
+
+    parts.append("\n---\n\n## Coverage Matrix\n\n")
+    parts.append("| Bundle | " + " | ".join(slugs[bit] for bit in expected_bits) + " |\n")
+    parts.append("| :----- | " + " | ".join(":---:" for _ in expected_bits) + " |\n")
+    for i, bundle in enumerate(index.bundles):
+        cells = ("**missing**" if missing_by_bit[bit][i] else "yes" for bit in expected_bits)
+        parts.append(f"| {bundle} | " + " | ".join(cells) + " |\n")
+
+    parts.append("\n---\n\n## Coverage by Node Type\n\n")
+    parts.append("Share of nodes of each type carrying each predicate type.\n\n")
+    parts.append("| Predicate Type | " + " | ".join(f"{name.capitalize()}s" for name in NODE_KINDS) + " |\n")
+    parts.append("| :------------- | " + " | ".join("---:" for _ in NODE_KINDS) + " |\n")
+    for bit, slug in enumerate(slugs):
+        cells = []
+        for name in NODE_KINDS:
+            total, counts = analysis['per_kind'][name]
+            cells.append(f"{counts[bit] * 100 / total:.1f}%" if total else "N/A")
+        parts.append(f"| {slug} | " + " | ".join(cells) + " |\n")
+
+    parts.append("\n---\n\n## Most Common Evidence Combinations\n\n")
+    parts.append("| Predicate Types | Nodes |\n")
+    parts.append("| :-------------- | ----: |\n")
+    for mask, count in analysis['top_patterns']:
+        parts.append(f"| {', '.join(index.slug_table.names(mask)) or '(none)'} | {count} |\n")
+
+    return "".join(parts)
+
+
+def load_index(paths, expected, expected_builds=(), expected_artifacts=()):
+    index = CoverageIndex(expected, expected_builds, expected_artifacts)
+    for path in iter_response_files(paths):
+        with open(path, 'rb') as f:
+            response = json.loads(f.read())
+        index.add_response(os.path.splitext(os.path.basename(path))[0], response)
+    return index
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Render an evidence coverage matrix for release-bundle GraphQL responses.")
+    parser.add_argument('inputs', nargs='+', help="GraphQL response JSON files or directories of them (one per bundle)")
+    parser.add_argument('--expect', action='append', default=[],
+                        help="Additional expected predicate slug, e.g. trivy or junit (repeatable)")
+    parser.add_argument('--expect-build', action='append', default=[],
+                        help="Predicate slug every source build must carry, e.g. build-signature (repeatable)")
+    parser.add_argument('--expect-artifact', action='append', default=[],
+                        help="Predicate slug every artifact must carry, e.g. signature (repeatable)")
+    parser.add_argument('-o', '--output', default='evidence-coverage.md', help="Markdown report to write")
+    args = parser.parse_args()
+
+    try:
+        index = load_index(args.inputs, EXPECTED_PREDICATE_SLUGS | set(args.expect), args.expect_build,
+                           args.expect_artifact)
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+    start = time.perf_counter()
+    analysis = analyze_coverage(index)
+    elapsed = time.perf_counter() - start
+
+    with open(args.output, 'w') as f:
+        f.write(generate_coverage_markdown(index, analysis))
+
+    print(f"Coverage for {len(index.bundles)} bundle(s) and {analysis['node_count']} node(s) "
+          f"aggregated in {elapsed:.3f}s and saved to {args.output}")
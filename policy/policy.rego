@@ -18,15 +18,29 @@ found_predicate_slugs := {slug |
 found := [slug | slug := found_predicate_slugs[_]]
 not_found := [slug | slug := expected_predicate_slugs[_]; not found_predicate_slugs[slug]]
 
+# Optional performance SLO verdict written by examples/blazemeter, loaded with
+# `opa eval --data blazemeter-slo-verdict.json`. Without it the gate is not applied.
+default performance_slo_passed := false
+
+performance_slo_passed if {
+    not data.performance_slo
+}
+
+performance_slo_passed if {
+    data.performance_slo.passed == true
+}
+
 # Check if all expected predicateSlugs are present
 approved := true if{
     count({slug | slug := expected_predicate_slugs[_]; slug != ""}) == count(found_predicate_slugs & expected_predicate_slugs)
+    performance_slo_passed
 }
 
 output := {
     "found": found,
     "approved": approved,
-    "not_found": not_found
+    "not_found": not_found,
+    "performance_slo_passed": performance_slo_passed
 }
 
 # Provide a default output to ensure the rule always produces something
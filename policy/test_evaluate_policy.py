@@ -0,0 +1,160 @@
+import copy
+import json
+import os
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+
+POLICY_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, POLICY_DIR)
+
+from evaluate_policy import EXPECTED_PREDICATE_SLUGS, evaluate  # noqa: E402
+
+POLICY_FILE = os.path.join(POLICY_DIR, 'policy.rego')
+EXAMPLE_FILE = os.path.join(POLICY_DIR, '..', 'example.json')
+# Set in CI so a missing opa binary fails the differential test instead of skipping it
+REQUIRE_OPA = os.environ.get('POLICY_REQUIRE_OPA') == '1'
+
+
+def load_example():
+    with open(EXAMPLE_FILE, 'r') as f:
+        return json.load(f)
+
+
+def get_version(response):
+    return response['data']['releaseBundleVersion']['getVersion']
+
+
+def evidence_edge(slug):
+    return {'node': {'path': 'bundle/1/evidence.json', 'name': f'{slug}.json', 'predicateSlug': slug}}
+
+
+def build_fixtures():
+    """(name, response, slo_verdict) cases covering each slug location and the SLO gate."""
+    example = load_example()
+    fixtures = [('example', example, None)]
+
+    bundle_only = copy.deepcopy(example)
+    version = get_version(bundle_only)
+    version['fromBuilds'] = []
+    for edge in version['artifactsConnection']['edges']:
+        edge['node']['evidenceConnection']['edges'] = []
+    fixtures.append(('bundle-level only', bundle_only, None))
+
+    missing_promotion = copy.deepcopy(example)
+    version = get_version(missing_promotion)
+    version['evidenceConnection']['edges'] = [
+        edge for edge in version['evidenceConnection']['edges'] if edge['node']['predicateSlug'] != 'promotion']
+    fixtures.append(('missing promotion', missing_promotion, None))
+
+    spread = copy.deepcopy(example)
+    version = get_version(spread)
+    version['evidenceConnection']['edges'] = [evidence_edge('promotion')]
+    version['fromBuilds'][0]['evidenceConnection']['edges'].append(evidence_edge('testing-results'))
+    version['artifactsConnection']['edges'][0]['node']['evidenceConnection']['edges'] = [evidence_edge('cyclonedx-vex')]
+    fixtures.append(('slugs spread over artifacts, builds and bundle', spread, None))
+
+    odd_nodes = copy.deepcopy(example)
+    version = get_version(odd_nodes)
+    version['evidenceConnection']['edges'] += [{'node': {'path': 'no-slug'}}, {'node': {'predicateSlug': None}},
+                                              {'cursor': 'no-node'}]
+    fixtures.append(('nodes without slugs and null slugs', odd_nodes, None))
+
+    composite = copy.deepcopy(example)
+    version = get_version(composite)
+    version['evidenceConnection']['edges'] += [evidence_edge(slug) for slug in (
+        {'type': 'sbom', 'format': 'spdx'}, ['promotion', 1], [1], [], {'type': 'sbom'}, True, 1, 1.0, False,
+        {'format': 'spdx', 'type': 'sbom'}, ['promotion', 1])]
+    fixtures.append(('array, object, boolean and number slugs', composite, None))
+
+    fixtures.append(('empty response', {}, None))
+    fixtures.append(('no data', {'data': {'releaseBundleVersion': None}}, None))
+    fixtures.append(('SLO verdict passed', example, {'performance_slo': {'passed': True}}))
+    fixtures.append(('SLO verdict failed', example, {'performance_slo': {'passed': False}}))
+    fixtures.append(('verdict without performance_slo', example, {'other': 1}))
+    fixtures.append(('verdict without passed', example, {'performance_slo': {}}))
+    fixtures.append(('null performance_slo', example, {'performance_slo': None}))
+    return fixtures
+
+
+def opa_output(response, verdict, tmp):
+    """data.policy.output as evaluated by the opa binary."""
+    input_file = os.path.join(tmp, 'input.json')
+    with open(input_file, 'w') as f:
+        json.dump(response, f)
+    command = ['opa', 'eval', '--format', 'json', '--input', input_file, '--data', POLICY_FILE]
+    if verdict is not None:
+        verdict_file = os.path.join(tmp, 'verdict.json')
+        with open(verdict_file, 'w') as f:
+            json.dump(verdict, f)
+        command += ['--data', verdict_file]
+    result = json.loads(subprocess.check_output(command + ['data.policy.output']))
+    return result['result'][0]['expressions'][0]['value']
+
+
+class EvaluatePolicyTest(unittest.TestCase):
+
+    def test_expected_slugs_match_policy(self):
+        with open(POLICY_FILE, 'r') as f:
+            match = re.search(r'expected_predicate_slugs := \{([^}]*)\}', f.read())
+        self.assertEqual(EXPECTED_PREDICATE_SLUGS, set(re.findall(r'"([^"]*)"', match.group(1))))
+
+    def test_example_is_approved(self):
+        output = evaluate(load_example())
+        self.assertTrue(output['approved'])
+        self.assertEqual([], output['not_found'])
+        self.assertEqual(sorted(output['found']), output['found'])
+        self.assertIn('build-signature', output['found'])
+
+    def test_missing_slug_is_reported(self):
+        fixtures = {name: (response, verdict) for name, response, verdict in build_fixtures()}
+        output = evaluate(*fixtures['missing promotion'])
+        self.assertFalse(output['approved'])
+        self.assertEqual(['promotion'], output['not_found'])
+
+    def test_slugs_are_gathered_from_every_edge_path(self):
+        fixtures = {name: (response, verdict) for name, response, verdict in build_fixtures()}
+        self.assertTrue(evaluate(*fixtures['slugs spread over artifacts, builds and bundle'])['approved'])
+
+    def test_null_slug_sorts_first(self):
+        fixtures = {name: (response, verdict) for name, response, verdict in build_fixtures()}
+        self.assertIsNone(evaluate(*fixtures['nodes without slugs and null slugs'])['found'][0])
+
+    def test_empty_response(self):
+        self.assertEqual({'found': [], 'approved': False, 'not_found': sorted(EXPECTED_PREDICATE_SLUGS),
+                          'performance_slo_passed': True}, evaluate({}))
+
+    def test_slo_verdict_gates_approval(self):
+        example = load_example()
+        self.assertTrue(evaluate(example, {'performance_slo': {'passed': True}})['approved'])
+        output = evaluate(example, {'performance_slo': {'passed': False}})
+        self.assertFalse(output['approved'])
+        self.assertFalse(output['performance_slo_passed'])
+
+    def test_composite_slugs_keep_their_json_type(self):
+        fixtures = {name: (response, verdict) for name, response, verdict in build_fixtures()}
+        found = evaluate(*fixtures['array, object, boolean and number slugs'])['found']
+        self.assertEqual([False, True, 1], found[:3])
+        self.assertIn({'type': 'sbom', 'format': 'spdx'}, found)
+        self.assertEqual(1, found.count(['promotion', 1]))
+
+    def test_null_performance_slo_is_denied(self):
+        # A defined null is not `false`, so `not data.performance_slo` does not hold
+        output = evaluate(load_example(), {'performance_slo': None})
+        self.assertFalse(output['performance_slo_passed'])
+        self.assertFalse(output['approved'])
+
+    @unittest.skipUnless(shutil.which('opa') or REQUIRE_OPA, "opa binary not installed")
+    def test_matches_opa(self):
+        # Differential check: every fixture must produce exactly what OPA produces for policy.rego
+        with tempfile.TemporaryDirectory() as tmp:
+            for name, response, verdict in build_fixtures():
+                with self.subTest(fixture=name):
+                    self.assertEqual(opa_output(response, verdict, tmp), evaluate(response, verdict))
+
+
+if __name__ == '__main__':
+    unittest.main()